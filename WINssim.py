@@ -1,15 +1,21 @@
 # Application Imports
-from skimage.metrics import structural_similarity as compare_ssim
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from collections import OrderedDict
 from tqdm import tqdm
 import matplotlib.pyplot as plt
 import PySimpleGUI as sg
 import datetime as dt
 import pandas as pd
 import numpy as np
+import camera_service
+import pattern_cache
+import scoring_worker
+import run_statistics
+import ssim_engine
 import threading
 import logging
 import sqlite3
+import ast
 import copy
 import time
 import csv
@@ -182,6 +188,36 @@ else:
     # DB Successfully Created
     logger.info("Database Successfully created")
 
+# ------- SQLITE DataBase Migrations -------- #
+
+# Columns Added After The First Release (Table, Column Definition)
+DB_Migrations = [
+    ("nmsctrl", "Metric_Mode string DEFAULT 'bgr'"),
+    ("nmsctrl", "Registration string DEFAULT 'Disabled'"),
+    ("othsetctrl", "Pass_Threshold real DEFAULT 0"),
+    ("othsetctrl", "Coarse_Bands string DEFAULT 'None'"),
+    ("othsetctrl", f"Preview_FPS real DEFAULT {camera_service.Preview_Fps}"),
+    ("camctrl", "Denoise_Frames integer DEFAULT 1"),
+    ("camctrl", "Denoise_Method string DEFAULT 'median'"),
+    ("camctrl", "Camera_Backend string DEFAULT 'dshow'"),
+    ("camctrl", "Camera_Source string DEFAULT ''"),
+    ("camctrl", "Discovered_Cameras string DEFAULT 'None'"),
+    ("camctrl", "Discovery_Time real DEFAULT 0"),
+    ("camctrl", "Camera_Crops string DEFAULT 'None'"),
+    ("camctrl", "Camera_Profiles string DEFAULT 'None'"),
+]
+
+# Add Missing Columns To Existing Databases
+for Table, Column in DB_Migrations:
+    try:
+        c.execute(f"ALTER TABLE {Table} ADD COLUMN {Column}")
+        conn.commit()
+        logger.info(f"Added Column {Column} To {Table}")
+
+    except sqlite3.OperationalError:
+        # Pass if column already exist
+        pass
+
 
 """
 Connects to database and pulls data from specified table
@@ -298,6 +334,17 @@ Origin_Folder = f"{othset_data[9]}"
 os.makedirs(Origin_Folder, exist_ok=True)
 
 
+"""
+Pattern Folder Listing
+-> Lists only the image files of a pattern folder
+-> Skips sub folders such as the hidden SSIM statistics cache
+
+Folder: Path to the pattern folder
+"""
+def List_Pattern_Files(Folder):
+    return [x for x in os.listdir(Folder) if os.path.isfile(f"{Folder}/{x}")]
+
+
 ##############################
 # ACTIVE SESSION VARIABLES
 ##############################
@@ -309,10 +356,10 @@ thread is running at any giving time
 All_Threads = list()
 
 # Number of Patterns To Loop Over
-Pattern_Count = len(os.listdir(NMS_Master_Pattern_Folder))
+Pattern_Count = len(List_Pattern_Files(NMS_Master_Pattern_Folder))
 
 # List Of Properly Named Pattern Files
-List_Of_Proper_Pattern_Names = [x for x in os.listdir(NMS_Master_Pattern_Folder) if x.endswith("Pattern.png")]
+List_Of_Proper_Pattern_Names = [x for x in List_Pattern_Files(NMS_Master_Pattern_Folder) if x.endswith("Pattern.png")]
 
 # Default Display Pattern
 Default_Pattern = f"{NMS_Master_Pattern_Folder}/{os.listdir(NMS_Master_Thumbnails_Folder)[0]}"
@@ -347,7 +394,7 @@ Master_Pattern_Folder: Path To Folder Containing Patterns
 def Rename_Patterns(Master_Pattern_Folder = NMS_Master_Pattern_Folder):
 
     # Identify Improperly Named Patterns
-    To_Rename = [x for x in os.listdir(Master_Pattern_Folder) if x not in List_Of_Proper_Pattern_Names]
+    To_Rename = [x for x in List_Pattern_Files(Master_Pattern_Folder) if x not in List_Of_Proper_Pattern_Names]
 
     # Creating Thumbnails
     if To_Rename != []:
@@ -394,7 +441,7 @@ def Thumbnails(Master_Image_Folder=NMS_Master_Pattern_Folder, Thumbnails_Image_F
     logger.debug("Checking For Thumbnails Update") 
 
     # Identify Files Without Thumbnails
-    Img_Files = [x for x in os.listdir(Master_Image_Folder) if x not in os.listdir(Thumbnails_Image_Folder)]
+    Img_Files = [x for x in List_Pattern_Files(Master_Image_Folder) if x not in os.listdir(Thumbnails_Image_Folder)]
 
     # Creating Thumbnails
     if Img_Files != []:
@@ -502,6 +549,97 @@ def countdown(window, ct_time, manual=False, auto=True):
                     logger.exception(str(e))
 
 
+"""
+Pattern Render Acknowledgement
+-> Flushes the pending drawing of the pattern window so the new pattern is on screen
+-> The window and the capture trigger share the GUI thread, so no event is waited on: the
+refresh only returns once Tk has drawn the pending updates, and the time taken after it is
+the render barrier the capture starts from
+
+-:> Returns the render time (time.monotonic()), passed to Capture_Start at the capture trigger
+
+window: The pattern window that was just updated
+"""
+def Pattern_Render_Ack(window):
+    window.refresh()
+    return time.monotonic()
+
+
+"""
+Capture Start
+-> Called at the capture trigger: flushes the pattern window again, right before the cameras
+grab, in case anything was drawn over the pattern since its render time
+-> Every camera is asked to decode its next grabs now, so all of them capture frames grabbed
+after the same time, one extra frame covers the grab already in flight
+
+-:> Returns max(render time, trigger time), the capture takes the first frames grabbed after it
+
+window: The pattern window
+Rendered_At: The render time returned by Pattern_Render_Ack
+Cameras: The camera_service.Camera_Service of every camera captured
+Frame_Count: Number of frames each camera captures
+"""
+def Capture_Start(window, Rendered_At, Cameras, Frame_Count = 1):
+    window.refresh()
+
+    Capture_From = max(Rendered_At, time.monotonic())
+    for Camera in Cameras:
+        Camera.Request(Frame_Count + 1)
+    return Capture_From
+
+
+"""
+Capture After Render
+-> Takes the first camera frame grabbed after the capture start
+-> With more than one frame, the first Frame_Count frames after it are combined with a
+temporal median or mean over the boxes only
+
+-:> Returns (frame, display to capture latency in ms), frame is None when no frame arrived,
+the latency runs from the capture start (the render acknowledgement or the trigger, whichever
+is later) to the grab of the first frame
+
+camera: The shared camera_service.Camera_Service
+Capture_From: The time returned by Capture_Start
+Frame_Count: Number of frames combined (camctrl Denoise_Frames)
+Boxes: Camera boxes combined by the denoising, None combines the whole frame
+Method: "median" or "mean" (camctrl Denoise_Method)
+Margin: Pixels added around the boxes
+"""
+def Capture_After_Render(camera, Capture_From, Frame_Count = 1, Boxes = None, Method = "median", Margin = 0):
+    Entries = camera.Capture_Frames(Frame_Count, After = Capture_From)
+    if Entries is None:
+        return None, None
+
+    # The Entries Hold Copies, The Ring Keeps Decoding For The Previews Meanwhile
+    if len(Entries) == 1:
+        Frame = Entries[0][2]
+    else:
+        Frame = camera_service.Temporal_Denoise([Entry[2] for Entry in Entries], Boxes, Method, Margin)
+    return Frame, (Entries[0][1] - Capture_From) * 1000
+
+
+"""
+Prefetch Run Patterns
+-> Queues the patterns of the next samples of a run on the background prefetcher, so the
+next pattern switch finds them decoded, scaled, cropped and encoded
+-> For every upcoming sample: the full size master pattern (scoring) with its bbox crop and
+the origin image at display size with its display bytes, the origin list wraps like the run does
+
+Pattern_Names: The naturally sorted pattern file names of the run
+Sample_Count: The number of samples taken so far
+Pattern_Folder: Folder of the master patterns
+Origin_Folder: Folder of the origin images shown on the pattern window
+Display_Size: (Width, Height) of the pattern window display
+Box: The pattern bbox (Xmin, Ymin, Xmax, Ymax) cropped for every sample
+"""
+def Prefetch_Run_Patterns(Pattern_Names, Sample_Count, Pattern_Folder, Origin_Folder, Display_Size, Box):
+    Requests = list()
+    for Ahead in range(pattern_cache.Prefetch_Depth):
+        Requests.append((f"{Pattern_Folder}/{Pattern_Names[(Sample_Count + Ahead) % len(Pattern_Names)]}", None, Box))
+        Requests.append((f"{Origin_Folder}/{Pattern_Names[(Sample_Count + Ahead + 1) % len(Pattern_Names)]}", Display_Size))
+    pattern_cache.Prefetch_Patterns(Requests)
+
+
 """ 
 Home Window Section
 """
@@ -590,6 +728,13 @@ def NMS_Cam_View():
 
     NMS_Test_SSIM_Button = [sg.Button("SSIM TEST", button_color=("white","brown"), enable_events=True, font=("Courier 10",10), size=(16,1), key=("-Ssim Test-"))]
 
+    # SSIM Metric Used For Tests And Active Sessions
+    Metric_Mode_Header = [sg.Text("SSIM METRIC", font=("Courier 12", 12))]
+    Metric_Mode_Select = [sg.DropDown(list(ssim_engine.Metric_Modes), default_value=nms_data[15], readonly=True, font=("Courier 10",10), size=(17,1), key="-Metric_Mode-")]
+
+    # Align Camera Boxes To The Pattern Before Scoring
+    Registration_Select = [sg.Checkbox("AUTO ALIGN", default=(nms_data[16] == "Enabled"), font=("Courier 10",10), key="-Registration-")]
+
     Sample_SSIM, Sample_SSIM_Result = [sg.Text("SAMPLE RESULT", size=(16, 1), text_color="black", background_color="white", font=("Courier 10", 10), justification="center")],[sg.Text("0000", size=(10, 1), text_color="black", background_color="white", font=("Courier 10", 17), justification="center", key="S_ssim")]
 
     NMS_Save_Button = [sg.Button("SAVE", button_color=('white', 'green'), enable_events=True,  font=('Courier 10',10), size=(16,1))]
@@ -637,6 +782,9 @@ def NMS_Cam_View():
                 [sg.Text('_'*20, key="-Pattern_Coord_Seperator-")],
                 
                 # Image SSIM Test Utility
+                Metric_Mode_Header,
+                Metric_Mode_Select,
+                Registration_Select,
                 NMS_Test_SSIM_Button,
                 Sample_SSIM,
                 Sample_SSIM_Result,
@@ -800,9 +948,8 @@ def NMS_Pattern_View(NMS_Master_Thumbnails_Folder_Path = NMS_Master_Thumbnails_F
     NMS_Master_Thumbnails_List = [[sg.ReadFormButton(f"{image}", image_filename=f"{NMS_Master_Thumbnails_Folder_Path}/{image}", image_size=(150, 150), border_width=0)] for image in Thumbnail_Folder_Content]
 
     # Pattern Display Section
-    Display_Image = cv2.imread(f"{Default_Pattern}")
-    Resized_Display_Image = cv2.resize(Display_Image, (NMS_Pattern_Display_Width, NMS_Pattern_Display_Height),interpolation=cv2.INTER_AREA)
-    Pattern_imgbytes = cv2.imencode('.png', Resized_Display_Image)[1].tobytes()
+    Resized_Display_Image = pattern_cache.Load_Pattern(f"{Default_Pattern}", (NMS_Pattern_Display_Width, NMS_Pattern_Display_Height))
+    Pattern_imgbytes = camera_service.Display_Bytes(Resized_Display_Image)
 
     # Display Loaded Image
     Image_Widget = sg.Image(data = Pattern_imgbytes, key="Pattern_Display")
@@ -822,6 +969,10 @@ def NMS_Pattern_View(NMS_Master_Thumbnails_Folder_Path = NMS_Master_Thumbnails_F
 
     # Create Window
     MS_Win = sg.Window('Camera View Window', NMS_Pattern_View_Layout, location=(NMS_Pattern_View_Screen_Position_Width, NMS_Pattern_View_Screen_Position_Height), size=(NMS_Pattern_View_Width,NMS_Pattern_View_Height), keep_on_top=True, finalize=True)
+
+    # Thumbnail Files As Shown By The Layout, Thumbnails_Refresh Only Redraws Tiles That Change
+    MS_Win.Thumbnail_Versions = {image: Thumbnail_Version(f"{NMS_Master_Thumbnails_Folder_Path}/{image}", Thumbnail_Width, Thumbnail_Height) for image in Thumbnail_Folder_Content}
+    MS_Win.Highlighted_Thumbnail = None
     return MS_Win, NMS_Pattern_Display_Width, NMS_Pattern_Display_Height
 
 
@@ -835,6 +986,12 @@ rcv_data = database("camctrl")
 # Camera Focus Value
 Current_Focus_Val = rcv_data[3]
 
+# Capture Backend, A Camera Device Or A Replayed Video File / Frame Folder
+camera_service.Set_Backend(rcv_data[6], rcv_data[7])
+
+# Capture Mode Of Each Camera, Blank Profiles Keep The Driver Default
+camera_service.Set_Profiles(dict() if rcv_data[11] in (None, "", "None") else ast.literal_eval(rcv_data[11]))
+
 # Identify Camera In Use
 """
 Camera Selector From Value Set In The Database
@@ -856,6 +1013,57 @@ def Camera_In_Use(Cam1 = rcv_data[0], Cam2 = rcv_data[1], Cam3 = rcv_data[2]):
 Selected_Camera = Camera_In_Use()
 
 
+"""
+Cameras In Use
+-> Every camera enabled in camctrl, the first one is the main camera (Camera_In_Use)
+
+-:> Returns the list of enabled camera indices
+"""
+def Cameras_In_Use():
+    cam_data = database("camctrl")
+    return [Index for Index in range(3) if cam_data[Index] == 1]
+
+
+"""
+Camera Crop Offsets
+-> Additional cameras use the crop boxes of the main camera moved to their own crop position
+
+-:> Returns a dict of camera index -> (Offset_X, Offset_Y) from the main camera crop
+
+nms_data: A row fetched with database("nmsctrl")
+"""
+def Camera_Crop_Offsets(nms_data):
+    cam_data = database("camctrl")
+    Camera_Crops = dict() if cam_data[10] in (None, "", "None") else ast.literal_eval(cam_data[10])
+    return {Index: (int(X) - int(nms_data[2]), int(Y) - int(nms_data[4])) for Index, (X, Y) in Camera_Crops.items()}
+
+
+"""
+Additional Camera Runs
+-> Starts every enabled camera other than the main one and gives each its own run state
+in run_N/CAMERA_k, so their samples are saved and averaged per camera
+
+-:> Returns a dict of camera index -> scoring_worker.Run_State
+
+Destination_Folder: The run_N folder of the main camera
+Pattern_Statistics: The run_statistics.Pattern_Statistics of the session
+"""
+def Additional_Camera_Runs(Destination_Folder, Pattern_Statistics):
+    Camera_Runs = dict()
+    for Index in Cameras_In_Use():
+        if Index == Selected_Camera:
+            continue
+
+        if Cam_Test(Camera_Index = Index) != True:
+            logger.warning(f"Camera {Index + 1} Is Enabled But Not Available, Skipping It")
+            continue
+
+        Camera_Folder = f"{Destination_Folder}/CAMERA_{Index + 1}"
+        os.makedirs(Camera_Folder, exist_ok=True)
+        Camera_Runs[Index] = scoring_worker.Run_State(Camera_Folder, Pattern_Statistics, Camera = Index)
+    return Camera_Runs
+
+
 """
 Camera Test
 -> Checks If The Selected Camera Is Available
@@ -869,20 +1077,120 @@ Test_Popup: Enable/Disables Popup To Show If The Selected Camera Is Available
 """
 # Camera Available Test
 def Cam_Test(Camera_Index = Selected_Camera, Camera_Focus = Current_Focus_Val, Test_Popup = False):
-    cap_Test = cv2.VideoCapture(Camera_Index, cv2.CAP_DSHOW)
-    cap_Test.set(cv2.CAP_PROP_FOCUS, Camera_Focus)
-    Test_ret,Test_frame = cap_Test.read()
-    if Test_ret == True:
-        cap_Test.release()
+    # Running Cameras Need No Test
+    if camera_service.Is_Running(Camera_Index):
+        return True
+
+    # Cameras Missing From The Cached Discovery Are Not Probed Again
+    Discovered = Discovered_Cameras()
+    if (Discovered is not None) and (Camera_Index not in Discovered):
+        if Test_Popup == True:
+            sg.Popup("Camera Check","Problem Detecting Camera.\nPlease SELECT and SAVE An Available Camera In The Camera Setting.", keep_on_top=True)
+        return False
+
+    # The Shared Camera Service Stays Running When The Test Passes
+    Test_Camera = camera_service.Get_Camera(Camera_Index, Camera_Focus)
+    if Test_Camera.Wait_For_Frame() is not None:
         return True
     else:
         if Test_Popup == True:
             sg.Popup("Camera Check","Problem Detecting Camera.\nPlease SELECT and SAVE An Available Camera In The Camera Setting.", keep_on_top=True)
-        cap_Test.release()
+        camera_service.Release_Camera(Camera_Index)
         return False
 
-# Run Cam Test Function
-Cam_Test(Test_Popup = True)
+"""
+Discovered Cameras
+-> Camera discovery cached in camctrl by the background discovery
+
+-:> Returns a dict of available camera index -> list of [Width, Height] resolutions, or None
+when nothing was discovered yet for the current backend and source
+"""
+def Discovered_Cameras():
+    cam_data = database("camctrl")
+    if cam_data[8] in (None, "", "None"):
+        return None
+
+    Discovery = ast.literal_eval(cam_data[8])
+    if (Discovery["Backend"], Discovery["Source"]) != (cam_data[6], cam_data[7]):
+        return None
+    return Discovery["Cameras"]
+
+
+"""
+Camera Discovery Thread
+-> Probes the cameras in the background so no window waits on the devices
+-> Posts a '-CAMERAS_DISCOVERED-' event with the discovered cameras, the window loop
+saves them with Save_Camera_Discovery
+
+window: The window the result event is posted to
+"""
+def Camera_Discovery_Thread(window):
+    Cameras = camera_service.Discover_Cameras()
+    try:
+        window.write_event_value('-CAMERAS_DISCOVERED-', Cameras)
+    except Exception as e:
+        logger.debug(f"Camera Discovery Not Posted: {e}")
+
+
+"""
+Save Camera Discovery
+-> Caches discovered cameras in camctrl with the backend, source and discovery time
+
+Cameras: Dict of camera index -> resolutions from camera_service.Discover_Cameras
+"""
+def Save_Camera_Discovery(Cameras):
+    cam_data = database("camctrl")
+    Discovery = {"Backend": cam_data[6], "Source": cam_data[7], "Cameras": Cameras}
+    c.execute(f"""UPDATE camctrl
+                SET Discovered_Cameras = "{str(Discovery)}", Discovery_Time = {time.time()}
+                WHERE rowid = 1""")
+    conn.commit()
+    logger.info(f"Discovered Cameras {Cameras}")
+
+
+# Readable Summary Of The Cached Discovery For The Camera Control Window
+def Discovery_Text():
+    cam_data = database("camctrl")
+    Discovered = Discovered_Cameras()
+    if Discovered is None:
+        return "Cameras: Not Discovered Yet"
+
+    Cameras = list()
+    for Index in camera_service.Discovery_Indices:
+        if Index in Discovered:
+            Cameras.append(f"Camera {Index + 1}: " + (", ".join(f"{Width}x{Height}" for Width, Height in Discovered[Index]) or "Found"))
+        else:
+            Cameras.append(f"Camera {Index + 1}: Not Found")
+    return f"{' | '.join(Cameras)}  (Checked {dt.datetime.fromtimestamp(cam_data[9]).strftime('%Y-%m-%d %H:%M')})"
+
+
+"""
+Read Camera Profiles
+-> Capture profiles entered in the Camera Control window, blank fields keep the driver default
+
+-:> Returns a dict of camera index -> profile (see camera_service.Apply_Profile), cameras
+with an all blank profile are left out, raises ValueError on an invalid size or fps
+
+Values: The Camera Control window values
+"""
+def Read_Camera_Profiles(Values):
+    Profiles = dict()
+    for Index in range(3):
+        Profile = {
+            "Size": camera_service.Parse_Size(Values[f"-Profile_Size_{Index}-"]),
+            "Format": Values[f"-Profile_Format_{Index}-"] or None,
+            "Fps": float(Values[f"-Profile_Fps_{Index}-"]) if str(Values[f"-Profile_Fps_{Index}-"]).strip() else None,
+            "Preview": camera_service.Parse_Size(Values[f"-Profile_Preview_{Index}-"])
+            }
+        Profile = {Key: Value for Key, Value in Profile.items() if Value}
+        if Profile:
+            Profiles[Index] = Profile
+    return Profiles
+
+
+# Size Tuple As Shown In The Profile Inputs
+def Size_Text(Size):
+    return "" if not Size else f"{Size[0]}x{Size[1]}"
 
 
 """
@@ -905,9 +1213,50 @@ def Camera_Control_View():
     Header = [sg.Text("Select A Camera", auto_size_text=True, text_color="white", font="Courier 20", justification="left"), sg.Button("SAVE", button_color=('white', 'green'), enable_events=True,  font=('Courier 10',10), size=(16,1)), sg.Button("CLOSE", button_color=('white', 'red'), enable_events=True,  font=('Courier 10',10), size=(16,1))]
 
     # Comera Selector
-    All_Cams_Selector = [sg.Radio('Camera 1', "CAMERA_SELECTOR", default = rcv_data[0]), sg.Radio('Camera 2', "CAMERA_SELECTOR", default = rcv_data[1]), sg.Radio('Camera 3', "CAMERA_SELECTOR", default = rcv_data[2])]
+    All_Cams_Selector = [sg.Checkbox('Camera 1', default = rcv_data[0]), sg.Checkbox('Camera 2', default = rcv_data[1]), sg.Checkbox('Camera 3', default = rcv_data[2])]
+
+    # Crop Position Of Each Additional Camera, Blank Uses The Main Camera Crop
+    Camera_Crops = dict() if rcv_data[10] in (None, "", "None") else ast.literal_eval(rcv_data[10])
+    Camera_Crop_Selector = [sg.Text("ADDITIONAL CAMERA CROP X/Y:", font=("Courier 10",12))]
+    for Index in range(3):
+        Crop_X, Crop_Y = Camera_Crops.get(Index, ("", ""))
+        Camera_Crop_Selector += [sg.Text(f"Camera {Index + 1}", font=("Courier 10",10)), sg.Input(Crop_X, size=(6,1), key=f"-Crop_X_{Index}-"), sg.Input(Crop_Y, size=(6,1), key=f"-Crop_Y_{Index}-")]
+    # Capture Profile Of Each Camera, The Preview Size Is The Size Live Frames Are Reduced To
+    Camera_Profiles = dict() if rcv_data[11] in (None, "", "None") else ast.literal_eval(rcv_data[11])
+    Profile_Selector = [[sg.Text("CAPTURE PROFILE (SIZE WxH, FORMAT, FPS, PREVIEW WxH):", font=("Courier 10",12))]]
+    for Index in range(3):
+        Profile = Camera_Profiles.get(Index, dict())
+        Profile_Selector.append([
+            sg.Text(f"Camera {Index + 1}", font=("Courier 10",10)),
+            sg.Input(Size_Text(Profile.get("Size")), size=(10,1), key=f"-Profile_Size_{Index}-"),
+            sg.DropDown([""] + list(camera_service.Pixel_Formats), default_value=Profile.get("Format", ""), readonly=True, key=f"-Profile_Format_{Index}-"),
+            sg.Input(Profile.get("Fps", ""), size=(6,1), key=f"-Profile_Fps_{Index}-"),
+            sg.Input(Size_Text(Profile.get("Preview")), size=(10,1), key=f"-Profile_Preview_{Index}-")
+            ])
+
     Camera_View = [sg.Image(filename="", key="Camera_Control_Display"),sg.VSeperator(), sg.Text('', size=(5,1)),sg.Slider(range=(0, 255), orientation='v', size=(25, 15), default_value=Current_Focus_Val, tick_interval=5, key="-Focus Control-")]
 
+    # Cached Camera Discovery
+    Discovery_View = [sg.Text(Discovery_Text(), font=("Courier 10",10), key="-Discovered_Cameras-"), sg.Button("REFRESH CAMERAS", enable_events=True, font=('Courier 10',10), key="-Refresh_Cameras-")]
+
+    # Capture Backend, The Replay Backends Read The Source Instead Of A Camera
+    Backend_Selector = [
+        sg.Text("BACKEND:", font=("Courier 10",12)),
+        sg.DropDown(list(camera_service.Camera_Backends), default_value=rcv_data[6], readonly=True, key="-Camera_Backend-"),
+        sg.Text("SOURCE:", font=("Courier 10",12)),
+        sg.InputText(rcv_data[7], size=(40,1), key="-Camera_Source-"),
+        sg.FileBrowse(target="-Camera_Source-"),
+        sg.FolderBrowse(target="-Camera_Source-")
+        ]
+
+    # Multi Frame Capture, Frames Are Combined Over The Bbox Region Only
+    Denoise_Selector = [
+        sg.Text("DENOISE FRAMES:", font=("Courier 10",12)),
+        sg.Spin([i for i in range(1, camera_service.Ring_Size + 1)], initial_value=rcv_data[4], size=(5,1), key="-Denoise_Frames-"),
+        sg.Text("METHOD:", font=("Courier 10",12)),
+        sg.DropDown(list(camera_service.Denoise_Methods), default_value=rcv_data[5], readonly=True, key="-Denoise_Method-")
+        ]
+
     # List Of Connectable Cameras
     CC_View = [
         # Page Header
@@ -916,6 +1265,21 @@ def Camera_Control_View():
         # Camera List
         All_Cams_Selector, 
 
+        # Additional Camera Crops
+        Camera_Crop_Selector,
+
+        # Discovered Cameras
+        Discovery_View,
+
+        # Capture Backend
+        Backend_Selector,
+
+        # Temporal Denoising
+        Denoise_Selector,
+
+        # Capture Profiles
+        [sg.Column(Profile_Selector)],
+
         # Camera View And Slider
         Camera_View
         ]
@@ -928,6 +1292,35 @@ def Camera_Control_View():
     return CC_Win, CC_Display_Width, CC_Display_Height
 
 
+"""
+Coarse Band Calibration Thread
+-> Loads the saved crop pairs of a results folder and calibrates the coarse bands in the
+background, so the settings window keeps responding while a large folder is read
+-> Posts a '-BANDS_CALIBRATED-' event with a dict holding "Bands" and "Count", or "Error"
+
+window: The window the result event is posted to
+Calibration_Folder: The results folder searched for saved samples
+Metric: The metric mode the bands are used with
+"""
+def Coarse_Calibration_Thread(window, Calibration_Folder, Metric):
+    try:
+        Calibration_Pairs = list()
+        for Folder_Path, Sub_Folders, Files in os.walk(Calibration_Folder):
+            Calibration_Pairs.extend((Image, Pattern) for _, Image, Pattern in ssim_engine.Load_Crop_Pairs(Folder_Path))
+
+        Calibrated_Bands = ssim_engine.Calibrate_Coarse_Bands(Calibration_Pairs, Metric=Metric) if Calibration_Pairs != [] else None
+        Event_Value = {"Bands": Calibrated_Bands, "Count": len(Calibration_Pairs)}
+
+    except Exception as e:
+        logger.exception(f"Coarse Band Calibration Error {str(e)}")
+        Event_Value = {"Error": str(e)}
+
+    try:
+        window.write_event_value('-BANDS_CALIBRATED-', Event_Value)
+    except Exception as e:
+        logger.debug(f"Coarse Band Calibration Not Posted: {e}")
+
+
 """
 Other Setting Section
 -> Sets Logging Level
@@ -974,6 +1367,15 @@ def Other_Setting_View():
     
     Master_Pattern_Folder_Widget = [sg.Text('SELECT PATTERN FOLDER:', auto_size_text=False, size=(23, 1), font=("Courier", 20), justification='left'),sg.InputText(f"{NMS_Master_Pattern_Folder}", enable_events=True, key="-Set_Master_Folder-"), sg.FolderBrowse()]
 
+    # Pass/Fail Decision, 0 Disables Decisions
+    Pass_Threshold_Widget = [sg.Text("PASS THRESHOLD:", auto_size_text=False, size=(23, 1), text_color="white", font=("Courier", 20), justification="left"), sg.InputText(size=(50, 1), default_text=f"{othset_data[10]}", key="-Pass_Threshold-")]
+
+    # Calibrated Coarse Level Uncertainty Bands
+    Coarse_Bands_Widget = [sg.Text("COARSE BANDS:", auto_size_text=False, size=(23, 1), text_color="white", font=("Courier", 20), justification="left"), sg.InputText(size=(50, 1), default_text=f"{othset_data[11]}", key="-Coarse_Bands-"), sg.Button("CALIBRATE", key="-Calibrate_Bands-")]
+
+    # Live Camera Preview Rate Cap
+    Preview_Fps_Widget = [sg.Text("PREVIEW FPS:", auto_size_text=False, size=(23, 1), text_color="white", font=("Courier", 20), justification="left"), sg.InputText(size=(50, 1), default_text=f"{othset_data[12]}", key="-Preview_FPS-")]
+
     OS_Buttons = [sg.Button("SAVE", button_color=('white', 'green'),  font=('Courier 10',15), size=(15,1)),  sg.Button("CLOSE", button_color=('white', 'red'), font=('Courier 10',15), size=(15,1))]
 
     # Other Setting View  
@@ -1002,6 +1404,13 @@ def Other_Setting_View():
         # Set New Pattern Folder
         Master_Pattern_Folder_Widget,
 
+        # Pass/Fail Decision Settings
+        Pass_Threshold_Widget,
+        Coarse_Bands_Widget,
+
+        # Live Preview Rate
+        Preview_Fps_Widget,
+
         # Os Control Buttons
         OS_Buttons
         ]
@@ -1036,7 +1445,7 @@ def Analysis_View(Results_Folder_Path = Analysis_Results_Folder):
     # ANALYSIS WINDOW WIDGETS
 
     # Date Widget
-    Dates = os.listdir(Results_Folder_Path)
+    Dates = [x for x in os.listdir(Results_Folder_Path) if os.path.isdir(f"{Results_Folder_Path}/{x}")]
 
     # If No Analysis Is Available
     if Dates == []:
@@ -1060,7 +1469,7 @@ def Analysis_View(Results_Folder_Path = Analysis_Results_Folder):
         for Date in Dates:
             Analysis_Collection_Button_List = [[sg.Button(f"{Collection_Name}", size=(60,1), key=(f"Collection_{Collection_Name}"))] for Collection_Name in os.listdir(f"{Results_Folder_Path}/{Date}")]
             
-            if Date == os.listdir(f"{Results_Folder_Path}")[0]:
+            if Date == Dates[0]:
                 Col = sg.Column(Analysis_Collection_Button_List, scrollable = True, vertical_scroll_only=True, expand_x=True, size=(600,200), key=f"Collection_{Date}", visible=True)
             else:
                 Col = sg.Column(Analysis_Collection_Button_List, scrollable = True, vertical_scroll_only=True, expand_x=True, size=(600,200), key=f"Collection_{Date}", visible=False)
@@ -1107,8 +1516,8 @@ def Analysis_View(Results_Folder_Path = Analysis_Results_Folder):
                     except Exception as e:
                         Runs_Annotation = None
 
-                    # No of Pattern and Images Folder
-                    Item_List = [x for x in os.listdir(Runs_Folder_Path) if x != "ANNOTATION"]
+                    # No of Pattern and Images Folder, Sample Files Only (Not ANNOTATION, Heatmaps Or CAMERA_k Runs)
+                    Item_List = [x for x in os.listdir(Runs_Folder_Path) if os.path.isfile(f"{Runs_Folder_Path}/{x}")]
                     Item_List.sort(key=natural_keys)
                     Item_Ids = [x.split("_")[0] for x in Item_List]
                     Ids = sorted(set(Item_Ids))
@@ -1130,20 +1539,26 @@ def Analysis_View(Results_Folder_Path = Analysis_Results_Folder):
                         
                         if Id == "01":
                             try:
-                                Avg_df = df.loc[df["SN"] == len(df)]
-                                Avg_df.reset_index(drop=True, inplace=True)
-                                FINAL_SSIM = Avg_df.iat[0, 2]
-                                Data_View.append(sg.Text(f"{Date}\n{Collection}\n{Test_Run}\nSSIM: {round(FINAL_SSIM,4)}", auto_size_text=True, font=('Courier 16',16), size=(18,4), key=f"Run_Header_{Results_Folder_Path}_{Date}_{Collection}_{Test_Run}", justification="center"))
-                                Data_View.append(sg.Column([Data_View_Sublist, [sg.Text(f"SSIM VALUE: {SSIM_VALUE}", justification="center"), sg.Button('FULL VIEW', key=f"{Results_Folder_Path}/{Date}/{Collection}/{Test_Run}/{Id}_FullScale_Image.png,{Results_Folder_Path}/{Date}/{Collection}/{Test_Run}/{Id}_FullScale_Pattern.png")]]))
+                                # Saved Run Summary, Older Runs Fall Back To The Last Annotation Row
+                                Run_Summary = run_statistics.Load_Run_Summary(f"{Runs_Folder_Path}/ANNOTATION")
+                                if Run_Summary is not None:
+                                    Run_Header = f"{Date}\n{Collection}\n{Test_Run}\nSSIM: {round(Run_Summary['Mean'],4)} +/- {round(Run_Summary['Std'],4)}\nMIN {round(Run_Summary['Min'],4)} MAX {round(Run_Summary['Max'],4)}"
+                                else:
+                                    Avg_df = df.tail(1)
+                                    Avg_df.reset_index(drop=True, inplace=True)
+                                    FINAL_SSIM = Avg_df.iat[0, 2]
+                                    Run_Header = f"{Date}\n{Collection}\n{Test_Run}\nSSIM: {round(FINAL_SSIM,4)}"
+                                Data_View.append(sg.Text(Run_Header, auto_size_text=True, font=('Courier 16',16), size=(24,5), key=f"Run_Header_{Results_Folder_Path}_{Date}_{Collection}_{Test_Run}", justification="center"))
+                                Data_View.append(sg.Column([Data_View_Sublist, [sg.Text(f"SSIM VALUE: {SSIM_VALUE}", justification="center"), sg.Button('FULL VIEW', key=f"{Results_Folder_Path}/{Date}/{Collection}/{Test_Run}/{Id}_FullScale_Image.png,{Results_Folder_Path}/{Date}/{Collection}/{Test_Run}/{Id}_FullScale_Pattern.png"), sg.Button('HEATMAP', key=f"HEATMAP,{Runs_Folder_Path},{Id}")]]))
                             except Exception as e:
                                 Data_View.append(sg.Text(f"{Date}\n{Collection}\n{Test_Run}", auto_size_text=True, font=('Courier 16',16), size=(18,3), key=f"Run_Header_{Results_Folder_Path}_{Date}_{Collection}_{Test_Run}", justification="center"))
-                                Data_View.append(sg.Column([Data_View_Sublist, [sg.Text("NO SSIM AVAILABLE", justification="center"), sg.Button('FULL VIEW', key=f"{Results_Folder_Path}/{Date}/{Collection}/{Test_Run}/{Id}_FullScale_Image.png,{Results_Folder_Path}/{Date}/{Collection}/{Test_Run}/{Id}_FullScale_Pattern.png")]]))
+                                Data_View.append(sg.Column([Data_View_Sublist, [sg.Text("NO SSIM AVAILABLE", justification="center"), sg.Button('FULL VIEW', key=f"{Results_Folder_Path}/{Date}/{Collection}/{Test_Run}/{Id}_FullScale_Image.png,{Results_Folder_Path}/{Date}/{Collection}/{Test_Run}/{Id}_FullScale_Pattern.png"), sg.Button('HEATMAP', key=f"HEATMAP,{Runs_Folder_Path},{Id}")]]))
                             Data_View_Sublist.clear()
                         else:
                             try:
-                                Data_View.append(sg.Column([Data_View_Sublist, [sg.Text(f"SSIM VALUE: {SSIM_VALUE}", justification="center"), sg.Button('FULL VIEW', key=f"{Results_Folder_Path}/{Date}/{Collection}/{Test_Run}/{Id}_FullScale_Image.png,{Results_Folder_Path}/{Date}/{Collection}/{Test_Run}/{Id}_FullScale_Pattern.png")]]))
+                                Data_View.append(sg.Column([Data_View_Sublist, [sg.Text(f"SSIM VALUE: {SSIM_VALUE}", justification="center"), sg.Button('FULL VIEW', key=f"{Results_Folder_Path}/{Date}/{Collection}/{Test_Run}/{Id}_FullScale_Image.png,{Results_Folder_Path}/{Date}/{Collection}/{Test_Run}/{Id}_FullScale_Pattern.png"), sg.Button('HEATMAP', key=f"HEATMAP,{Runs_Folder_Path},{Id}")]]))
                             except:
-                                Data_View.append(sg.Column([Data_View_Sublist, [sg.Text("NO SSIM AVAILABLE", justification="center"), sg.Button('FULL VIEW', key=f"{Results_Folder_Path}/{Date}/{Collection}/{Test_Run}/{Id}_FullScale_Image.png,{Results_Folder_Path}/{Date}/{Collection}/{Test_Run}/{Id}_FullScale_Pattern.png" )]]))
+                                Data_View.append(sg.Column([Data_View_Sublist, [sg.Text("NO SSIM AVAILABLE", justification="center"), sg.Button('FULL VIEW', key=f"{Results_Folder_Path}/{Date}/{Collection}/{Test_Run}/{Id}_FullScale_Image.png,{Results_Folder_Path}/{Date}/{Collection}/{Test_Run}/{Id}_FullScale_Pattern.png" ), sg.Button('HEATMAP', key=f"HEATMAP,{Runs_Folder_Path},{Id}")]]))
                             Data_View_Sublist.clear()
                 
                     All_Runs_List.append(Data_View)
@@ -1218,7 +1633,7 @@ def Image_View_Win(Image_Path = "", Dual = False, **kwargs):
 
         # Resize Image 
         Resized_Image1 = cv2.resize(Image_1, (Img1_Width,Img1_Height), interpolation = cv2.INTER_AREA)
-        Resized_img1_bytes = cv2.imencode('.png', Resized_Image1)[1].tobytes()
+        Resized_img1_bytes = camera_service.Display_Bytes(Resized_Image1)
 
         # Create New Pattern Dimensions
         Img2_Height = int(round((Image_2_Dimension[0]/Max_Img_Height) * Image_View_Height))
@@ -1226,7 +1641,7 @@ def Image_View_Win(Image_Path = "", Dual = False, **kwargs):
 
         # Resize Pattern
         Resized_Image2 = cv2.resize(Image_2, (Img2_Width, Img2_Height), interpolation = cv2.INTER_AREA) 
-        Resized_img2_bytes = cv2.imencode('.png', Resized_Image2)[1].tobytes()
+        Resized_img2_bytes = camera_service.Display_Bytes(Resized_Image2)
 
         # Image Display Widget
         Image_1_Widget = [
@@ -1340,6 +1755,13 @@ def Main_App_Section():
 
     MAS_Individual_SSIM_Widget = [sg.Column([MAS_Single_SSIM_Text, MAS_Single_SSIM_Result], background_color="white")]
 
+    # Pass/Fail Decision Of The Current Sample
+    MAS_Decision_Text = [sg.Text("Decision", size=(15, 1), text_color='black', background_color='white', font=('Courier 10', 15), justification='center')]
+
+    MAS_Decision_Result = [sg.Text("-", size=(15, 1), text_color='black', background_color='white', font=('Courier 10', 15), justification='center', key="-MAS_Decision-")]
+
+    MAS_Decision_Widget = [sg.Column([MAS_Decision_Text, MAS_Decision_Result], background_color="white")]
+
     # Current Overall SSIM Result
     MAS_Current_Overall_SSIM_Text = [sg.Text("Collective SSIM", size=(15, 1), text_color='black', background_color='white', font=('Courier 10', 15), justification='center')]
 
@@ -1347,6 +1769,13 @@ def Main_App_Section():
 
     MAS_Current_Overall_SSIM_Widget = [sg.Column([MAS_Current_Overall_SSIM_Text,MAS_Current_Overall_SSIM_Result], background_color="white")]
 
+    # Latest Results Of The Additional Cameras
+    MAS_Camera_Results_Text = [sg.Text("Other Cameras", size=(15, 1), text_color='black', background_color='white', font=('Courier 10', 15), justification='center')]
+
+    MAS_Camera_Results = [sg.Text("-", size=(20, 3), text_color='black', background_color='white', font=('Courier 10', 12), justification='center', key="-MAS_Camera_Results-")]
+
+    MAS_Camera_Results_Widget = [sg.Column([MAS_Camera_Results_Text, MAS_Camera_Results], background_color="white")]
+
     # Pattern Count
     MAS_Pattern_Text = [sg.Text("Pattern Count", size=(15, 1), text_color='black', background_color='white', font=('Courier 10', 15), justification='center')]
 
@@ -1374,9 +1803,13 @@ def Main_App_Section():
         MAS_Timer_Widget,
 
         MAS_Individual_SSIM_Widget,
+
+        MAS_Decision_Widget,
         
         MAS_Current_Overall_SSIM_Widget,
 
+        MAS_Camera_Results_Widget,
+
         MAS_Pattern_Widget,
 
         MAS_Collection_Widget
@@ -1432,14 +1865,71 @@ def Create_Collection(Storage_Path, Collection_Name = "Default_WinSSIM", Count=0
     return Collection_Name,Storage_Path
 
 
+############################
+# Thumbnail Tiles
+############################
+
+# Encoded Thumbnail Tiles Kept, A Normal And A Highlighted Tile Per Thumbnail
+Thumbnail_Tile_Limit = 1024
+Thumbnail_Tiles = OrderedDict()
+
+
+"""
+Thumbnail Version
+-> Identifies the thumbnail file a tile was drawn from and the size it was drawn at, a
+replaced thumbnail or a new thumbnail size gives a new version
+
+-:> Returns (modified time, file size, Width, Height), or None when the file is missing
+"""
+def Thumbnail_Version(Thumbnail_File_Path, Thumbnail_Width=Thumbnail_Width, Thumbnail_Height=Thumbnail_Height):
+    try:
+        File_Stat = os.stat(Thumbnail_File_Path)
+    except OSError:
+        return None
+    return (File_Stat.st_mtime_ns, File_Stat.st_size, Thumbnail_Width, Thumbnail_Height)
+
+
+"""
+Thumbnail Tile
+-> Display data of a thumbnail, with the highlight bbox drawn around it when Highlighted
+-> Tiles are encoded once per thumbnail version and kept, the oldest are dropped past Thumbnail_Tile_Limit
+-:> Returns the PPM data of the tile, or None when the thumbnail can not be read
+
+Thumbnail_File_Path: Path to the thumbnail image
+Highlighted: True for the tile of the active thumbnail
+"""
+def Thumbnail_Tile(Thumbnail_File_Path, Highlighted, Thumbnail_Width=Thumbnail_Width, Thumbnail_Height=Thumbnail_Height):
+    Key = (Thumbnail_File_Path, Thumbnail_Version(Thumbnail_File_Path, Thumbnail_Width, Thumbnail_Height), Highlighted, Bbox_Line_Color, Bbox_Line_Width)
+    Tile = Thumbnail_Tiles.get(Key)
+    if Tile is not None:
+        Thumbnail_Tiles.move_to_end(Key)
+        return Tile
+
+    Thumbnail_Resize = pattern_cache.Load_Pattern(Thumbnail_File_Path, (Thumbnail_Width,Thumbnail_Height))
+    if Thumbnail_Resize is None:
+        return None
+
+    # Highlight Image With Bbox, Drawn On A Copy Since The Cached Thumbnail Is Shared
+    if Highlighted == True:
+        Thumbnail_Resize = cv2.rectangle(Thumbnail_Resize.copy(), (0,0), (Thumbnail_Width,Thumbnail_Height), Bbox_Line_Color, Bbox_Line_Width)
+
+    Tile = camera_service.Display_Bytes(Thumbnail_Resize)
+    Thumbnail_Tiles[Key] = Tile
+    while len(Thumbnail_Tiles) > Thumbnail_Tile_Limit:
+        Thumbnail_Tiles.popitem(last=False)
+    return Tile
+
+
 """
 Refresh Thumbnails List
 -> Auto Updates List of Thumbnails
--> Auto Update Display of Thumbnails
+-> Auto Update Display of Thumbnails, only the previously and newly highlighted thumbnails
+and thumbnails replaced on disk are redrawn
 -> Auto Update Pattern Image on Display
 -> Draw Bounding Box Around Items In Focus
 
--:> Returns A list of containing Bboxed_Pattern_Image, Cropped_Section, PXmin, PYmin, PXmax, PYmax
+-:> Returns A list of containing Pattern_Image, Cropped_Section, PXmin, PYmin, PXmax, PYmax, the
+Pattern_Image is the shared cached pattern without the bbox, it is drawn when the sample is saved
 
 window: Represents the name of the pysimplegui window where this function is called
 window_Width: The width of the window
@@ -1456,7 +1946,7 @@ Image_List: This is the list of all the thumbnail image names, default value is
 Thumbnail_Width: This the width that the thumbnail image will be reshaped to
 Thumbnail_Height: This is the height that the thumbnail image will be reshaped to
 Bbox: Control display of bbox on the image (relevant to the MAIN APP SECTION), the available options are "Active" or "Inactive"
-Refresh: Controls if the thumbnail images should be refreshed or not
+Refresh: Controls if the thumbnail images are checked for files replaced on disk
 """
 # Refresh Thumbnails
 def Thumbnails_Refresh(window, window_Width, window_Height, Trigger_event, Pattern_File_Path, Thumbnail_File_Path, Origin_File_Path = None, Bbox = "Inactive", Refresh=True, Image_List = None, Thumbnail_Width=Thumbnail_Width, Thumbnail_Height=Thumbnail_Height):
@@ -1465,46 +1955,36 @@ def Thumbnails_Refresh(window, window_Width, window_Height, Trigger_event, Patte
     othset_data = database("othsetctrl")
     NMS_Master_Thumbnails_Folder = f"{othset_data[7]}"
 
-    if Refresh == True:
-        # Update All Thumbnails
-        Thumbnails_Images_Path_List = [f"{NMS_Master_Thumbnails_Folder}/{image}" for image in Image_List]
-        for Thumbnail_Image_Path in Thumbnails_Images_Path_List:
-            Path_Split = Thumbnail_Image_Path.split("/")
-            Updated_Thumbnail = cv2.imread(Thumbnail_Image_Path)
-            Thumbnail_Resize = cv2.resize(Updated_Thumbnail,(Thumbnail_Width,Thumbnail_Height), interpolation=cv2.INTER_AREA)
-            Updated_Thumbnail_imgbytes = cv2.imencode('.png', Thumbnail_Resize)[1].tobytes()
-            window[Path_Split[-1]].update(image_data=Updated_Thumbnail_imgbytes)
-        logger.debug("Thumbnail Refresh Complete")
-
-    if Trigger_event != None:
-        # Image Thumbnail In View
-        Thumbnail_Image = cv2.imread(Thumbnail_File_Path)
-
-        # Thumbnail Bbox Parameters
-        Thumbnail_Bbox_Start_Point = (0,0)
-        Thumbnail_Bbox_End_Point = (Thumbnail_Width,Thumbnail_Height)
-        color = Bbox_Line_Color
-        line_width = Bbox_Line_Width
-
-        # Highlight Image with Bbox
-        Thumbnail_Image_Copy = copy.deepcopy(Thumbnail_Image)
-        Thumbnail_Copy_Resize = cv2.resize(Thumbnail_Image_Copy,(Thumbnail_Width,Thumbnail_Height), interpolation=cv2.INTER_AREA)
-        Bbox_Thumbnail_Image_Copy = cv2.rectangle(Thumbnail_Copy_Resize, Thumbnail_Bbox_Start_Point, Thumbnail_Bbox_End_Point, color, line_width)
-        Bbox_Current_Thumbnail_imgbytes_Copy = cv2.imencode('.png', Bbox_Thumbnail_Image_Copy)[1].tobytes()
-        logger.debug("="*30)
-        logger.debug(Trigger_event)
-        logger.debug("="*30)
-        window[Trigger_event].update(image_data=Bbox_Current_Thumbnail_imgbytes_Copy)
-        logger.debug("Image Thumbnail Highlighted")
-        
+    # Only The Tiles Whose Highlight Or File Changed Are Redrawn
+    if (Refresh == True) or (Trigger_event != None):
+        Thumbnail_Versions = getattr(window, "Thumbnail_Versions", dict())
+        Previous_Highlight = getattr(window, "Highlighted_Thumbnail", None)
+        Changed_Tiles = [image for image in (Previous_Highlight, Trigger_event) if image != None]
+
+        # Thumbnails Replaced On Disk Since They Were Drawn
+        if Refresh == True:
+            for image in Image_List:
+                if Thumbnail_Versions.get(image) != Thumbnail_Version(f"{NMS_Master_Thumbnails_Folder}/{image}", Thumbnail_Width, Thumbnail_Height):
+                    Changed_Tiles.append(image)
+
+        for image in dict.fromkeys(Changed_Tiles):
+            if image not in window.AllKeysDict:
+                continue
+            Thumbnail_Image_Path = f"{NMS_Master_Thumbnails_Folder}/{image}"
+            Tile = Thumbnail_Tile(Thumbnail_Image_Path, image == Trigger_event, Thumbnail_Width, Thumbnail_Height)
+            if Tile is not None:
+                window[image].update(image_data=Tile)
+            Thumbnail_Versions[image] = Thumbnail_Version(Thumbnail_Image_Path, Thumbnail_Width, Thumbnail_Height)
+
+        window.Thumbnail_Versions = Thumbnail_Versions
+        window.Highlighted_Thumbnail = Trigger_event
+        logger.debug(f"Thumbnail Tiles Redrawn {len(dict.fromkeys(Changed_Tiles))}, Highlighted {Trigger_event}")
+
     # Bbox Display Control
     if Bbox == "Inactive":
 
         # Update displayed Image
-        Pattern_Image = cv2.imread(Pattern_File_Path)
-        Resized_Pattern_Image = cv2.resize(Pattern_Image, (window_Width, window_Height), interpolation=cv2.INTER_AREA)
-        Current_Pattern_imgbytes = cv2.imencode('.png', Resized_Pattern_Image)[1].tobytes()
-        window['Pattern_Display'].update(data=Current_Pattern_imgbytes)
+        pattern_cache.Show_Pattern(window['Pattern_Display'], Pattern_File_Path, (window_Width, window_Height))
         logger.debug("Image Displayed")
 
     elif Bbox == "Active":
@@ -1516,41 +1996,29 @@ def Thumbnails_Refresh(window, window_Width, window_Height, Trigger_event, Patte
         PXmax = int(MAS_Data[7])
         PYmax = int(MAS_Data[9])
 
-        # Bbox Parameters
-        Start_point = (PXmin,PYmin)
-        End_point = (PXmax,PYmax)
-        color = Bbox_Line_Color
-        line_width = Bbox_Line_Width
-
-        # Update displayed Image
-        Pattern_Image = cv2.imread(Pattern_File_Path)
+        # Pattern Image, Cached And Shared, Its Bbox Is Drawn When The Sample Is Saved
+        Pattern_Image = pattern_cache.Load_Pattern(Pattern_File_Path)
 
         print(f"{Origin_File_Path}\n{Pattern_File_Path}\n{Thumbnail_File_Path}")
 
-        # Get Cropped Section
-        Pattern_Image_Copy = copy.deepcopy(Pattern_Image)
-        Cropped_Section = Pattern_Image_Copy[PYmin:PYmax, PXmin:PXmax]
+        # Get Cropped Section, Cached With The Pattern And Usually Prefetched
+        Cropped_Section = pattern_cache.Load_Pattern_Crop(Pattern_File_Path, (PXmin, PYmin, PXmax, PYmax))
 
         # Update Image To Window
         if Origin_File_Path == None:
-            Bboxed_Pattern_Image = cv2.rectangle(Pattern_Image, Start_point, End_point, color, line_width)
-            Bboxed_Pattern_Image = cv2.imread(Origin_File_Path)
-            Resized_Pattern_Image = cv2.resize(Bboxed_Pattern_Image, (window_Width, window_Height), interpolation=cv2.INTER_AREA)
-            Current_Pattern_imgbytes = cv2.imencode('.png', Resized_Pattern_Image)[1].tobytes()
-            window['Pattern_Display'].update(data=Current_Pattern_imgbytes)
+            # Bbox Drawn On The Display Sized Pattern
+            Resized_Pattern_Image = pattern_cache.Load_Pattern(Pattern_File_Path, (window_Width, window_Height)).copy()
+            Display_Scale = (window_Width/Pattern_Image.shape[1], window_Height/Pattern_Image.shape[0])
+            camera_service.Draw_Boxes(Resized_Pattern_Image, [(PXmin, PYmin, PXmax, PYmax)], Display_Scale, Bbox_Line_Color, Bbox_Line_Width)
+            camera_service.Show_Image(window['Pattern_Display'], Resized_Pattern_Image)
             logger.debug("Bboxed Image Displayed")
-            return [Bboxed_Pattern_Image, Cropped_Section, PXmin, PYmin, PXmax, PYmax]
+            return [Pattern_Image, Cropped_Section, PXmin, PYmin, PXmax, PYmax]
         
         else:
             # Update Display With Origin Image
-            Next_Origin_Image = cv2.imread(Origin_File_Path)
-            Resized_Origin_Image = cv2.resize(Next_Origin_Image, (window_Width, window_Height), interpolation=cv2.INTER_AREA)
-            Next_Origin_imgbytes = cv2.imencode('.png', Resized_Origin_Image)[1].tobytes()
-            window['Pattern_Display'].update(data=Next_Origin_imgbytes)
+            pattern_cache.Show_Pattern(window['Pattern_Display'], Origin_File_Path, (window_Width, window_Height))
             logger.debug(f"Bboxed Image Displayed updated display Image to {Origin_File_Path}")
-
-            Bboxed_Pattern_Image = cv2.rectangle(Pattern_Image, Start_point, End_point, color, line_width)
-            return [Bboxed_Pattern_Image, Cropped_Section, PXmin, PYmin, PXmax, PYmax]
+            return [Pattern_Image, Cropped_Section, PXmin, PYmin, PXmax, PYmax]
 
 
 """
@@ -1670,9 +2138,8 @@ def Batch_Capture_Pattern(Pattern_Source = "", Default_Pattern = "", Monitor_Cou
 
             # Pattern Display Section
             try:
-                Display_Image = cv2.imread(f"{Default_Pattern}")
-                Resized_Display_Image = cv2.resize(Display_Image, (BCP_Pattern_Display_Width, BCP_Pattern_Display_Height),interpolation=cv2.INTER_AREA)
-                Pattern_imgbytes = cv2.imencode('.png', Resized_Display_Image)[1].tobytes()
+                Resized_Display_Image = pattern_cache.Load_Pattern(f"{Default_Pattern}", (BCP_Pattern_Display_Width, BCP_Pattern_Display_Height))
+                Pattern_imgbytes = camera_service.Display_Bytes(Resized_Display_Image)
             except:
                 sg.popup("Invalid Folder Contents",title="Folder Content Error", keep_on_top=True)
                 return None
@@ -1708,6 +2175,9 @@ if __name__ == '__main__':
     try:
         HOME_WIN = Home_Win()
 
+        # Discover Cameras Without Holding Up The Home Window
+        threading.Thread(target=Camera_Discovery_Thread, args=(HOME_WIN,), daemon=True).start()
+
         # Home Window Variables
         Activate = True
         Thread_Control = False
@@ -1718,14 +2188,19 @@ if __name__ == '__main__':
         while True:
             home_event, home_values = HOME_WIN.read()
 
+            # Cache Camera Discovery And Warn When The Selected Camera Is Missing
+            if home_event == "-CAMERAS_DISCOVERED-":
+                Save_Camera_Discovery(home_values["-CAMERAS_DISCOVERED-"])
+                if Selected_Camera not in home_values["-CAMERAS_DISCOVERED-"]:
+                    sg.Popup("Camera Check","Problem Detecting Camera.\nPlease SELECT and SAVE An Available Camera In The Camera Setting.", keep_on_top=True)
+
             # New Mirror Standard
             if home_event == "Mirror Standard Settings":
 
                 # Check Camera Availability
                 if Cam_Test(Camera_Index = Selected_Camera) == True:
-                    # Start Camera
-                    cap = cv2.VideoCapture(Selected_Camera, cv2.CAP_DSHOW)
-                    cap.set(cv2.CAP_PROP_FOCUS, Current_Focus_Val)
+                    # Shared Camera Service
+                    cap = camera_service.Get_Camera(Selected_Camera, Current_Focus_Val)
                     
                     # Hiding Home Window
                     HOME_WIN.Hide()
@@ -1766,7 +2241,13 @@ if __name__ == '__main__':
                     Window_Read = False
 
                     # Initial Pattern In View
-                    Pattern_Image = cv2.imread(f"{Pattern_File_Path}")
+                    Pattern_Image = pattern_cache.Load_Pattern(f"{Pattern_File_Path}")
+
+                    # Reused Camera And Pattern Display Buffers
+                    NMS_Preview = camera_service.Preview_Buffers(nms_cam_Width, nms_cam_Height, database("othsetctrl")[12])
+                    NMS_Pattern_Preview = camera_service.Preview_Buffers(nms_pattern_Width, nms_pattern_Height)
+                    # Held For Crop Drawing And Tests, So It Is A Copy
+                    ret, frame = cap.Capture()
 
                     logger.debug("Auto Start Camera Stream")
 
@@ -1777,11 +2258,14 @@ if __name__ == '__main__':
                         if (nms_cam_view_event == "TAKE PICTURE") and (cam_view == True):
                             Active_Stream = False
                             logger.debug("Stopping Camera Stream")
-                            ret, frame = cap.read()
-                            resized_capture = cv2.resize(frame, (nms_cam_Width, nms_cam_Height), interpolation=cv2.INTER_AREA)
-                            camera_capturebytes = cv2.imencode('.png',resized_capture)[1].tobytes()
-                            NMS_CAM_VIEW_WIN['camera'].update(data=camera_capturebytes)
-                            logger.debug("Taking A Picture")
+                            ret, Captured_Frame = cap.Capture()
+                            if ret:
+                                frame = Captured_Frame
+                                NMS_Preview.Show(NMS_CAM_VIEW_WIN['camera'], frame)
+                                logger.debug("Taking A Picture")
+                            else:
+                                logger.warning(f"No Frame From Camera {Selected_Camera}, Health {cap.Health()}")
+                                sg.Popup("Camera Check", "No Frame From The Camera, Please Try Again", keep_on_top=True)
 
                         # Start Stream
                         if (nms_cam_view_event == "START STREAM"):
@@ -1790,18 +2274,15 @@ if __name__ == '__main__':
 
                         # On Start Stream Video From Camera
                         if (Active_Stream == True) and (cam_view == True):
-                            ret, frame = cap.read()
-                            live_feed_resized = cv2.resize(frame, (nms_cam_Width, nms_cam_Height), interpolation=cv2.INTER_AREA)
-                            imgbytes = cv2.imencode('.png', live_feed_resized)[1].tobytes()
-                            NMS_CAM_VIEW_WIN['camera'].update(data=imgbytes)
+                            # Only New Frames Are Shown, The Last One Is Held For Crop Drawing And Tests
+                            Shown_Frame = NMS_Preview.Show_Latest(NMS_CAM_VIEW_WIN, 'camera', cap, Hold=True)
+                            if Shown_Frame is not None:
+                                frame = Shown_Frame
 
                         # Closing NMS CAM View Window
                         if (nms_cam_view_event == sg.WIN_CLOSED) or (nms_cam_view_event == "CLOSE"):
                             logger.debug("Closing New Mirror Standard Camera View")
                             
-                            # Unset Camera Stream
-                            cap.release()
-                            
                             # Close Camera View
                             NMS_CAM_VIEW_WIN.close()
                             cam_view = False
@@ -1926,6 +2407,9 @@ if __name__ == '__main__':
                                         # Set Crop Boundary Values
                                         value_range = int(nms_cam_view_values["-Bbox_Count-"])
 
+                                        # Boxes Of Both Windows, Drawn Once At Display Size After The Loop
+                                        Camera_Boxes, Pattern_Boxes, Box_Labels = list(), list(), list()
+
                                         # Loop Over The Bbox Count 
                                         for i in range(1,(value_range+1)):
                                             
@@ -1972,39 +2456,21 @@ if __name__ == '__main__':
                                                     except ValueError:
                                                         sg.Popup("INVALID INPUT","All Bbox Input Should Be Integers", keep_on_top=True)
                                                 
-                                                # Image Bbox Parameters
-                                                Bbox_start_point = (CB_X,CB_Y)
-                                                Bbox_end_point = (CE_X,CE_Y)
-                                                color = Bbox_Line_Color
-                                                line_width = Bbox_Line_Width
-
-                                                # Pattern Bbox Parameters
-                                                Sync_start_point = (SB_X,SB_Y)
-                                                Sync_end_point = (SE_X,SE_Y)
-                                                color = Bbox_Line_Color
-                                                line_width = Bbox_Line_Width
-
-                                                # Draw Bbox On Image
-                                                if i == 1:
-                                                    frame_copy = copy.deepcopy(frame)
-                                                new_Image = cv2.rectangle(frame_copy, Bbox_start_point, Bbox_end_point, color, line_width)
-                                                cv2.putText(new_Image, f'{i}', (CB_X+5,CB_Y+25), cv2.FONT_HERSHEY_SIMPLEX, 0.9, color, line_width)
-                                                Image_resized = cv2.resize(new_Image, (nms_cam_Width, nms_cam_Height), interpolation=cv2.INTER_AREA)
-                                                cropbytes = cv2.imencode('.png', Image_resized)[1].tobytes()
-                                                NMS_CAM_VIEW_WIN['camera'].update(data=cropbytes)
-
-                                                # Bbox Image To Section
-                                                Pattern_Image = cv2.imread(Pattern_File_Path)
-                                                if i == 1:
-                                                    Pattern_Image_Copy = copy.deepcopy(Pattern_Image)
-                                                Bbox_Pattern_Image_Copy = cv2.rectangle(Pattern_Image_Copy, Sync_start_point, Sync_end_point, color, line_width)
-                                                cv2.putText(Bbox_Pattern_Image_Copy, f'{i}', (SB_X+5,SB_Y+25), cv2.FONT_HERSHEY_SIMPLEX, 0.9, color, line_width)
-                                                Resized_Bbox_Pattern_Image_Copy = cv2.resize(Bbox_Pattern_Image_Copy, (nms_pattern_Width, nms_pattern_Height), interpolation=cv2.INTER_AREA)
-                                                Bbox_Current_Pattern_Copy_imgbytes = cv2.imencode('.png', Resized_Bbox_Pattern_Image_Copy)[1].tobytes()
-                                                NMS_PATTERN_VIEW_WIN['Pattern_Display'].update(data=Bbox_Current_Pattern_Copy_imgbytes)
+                                                # Image And Pattern Bbox Parameters
+                                                Camera_Boxes.append((CB_X, CB_Y, CE_X, CE_Y))
+                                                Pattern_Boxes.append((SB_X, SB_Y, SE_X, SE_Y))
+                                                Box_Labels.append(i)
                                             
                                             except ValueError:
                                                 sg.Popup("INVALID INPUT","All Bbox Input Should Be Integers", keep_on_top=True)           
+
+                                        # Draw Bboxes On The Display Sized Image And Pattern
+                                        if Camera_Boxes != []:
+                                            NMS_Preview.Show_Boxes(NMS_CAM_VIEW_WIN['camera'], frame, Camera_Boxes, Bbox_Line_Color, Bbox_Line_Width, Box_Labels)
+
+                                            # Pattern Cached So Ticks Cost No Disk Read
+                                            Pattern_Image = pattern_cache.Load_Pattern(Pattern_File_Path)
+                                            NMS_Pattern_Preview.Show_Boxes(NMS_PATTERN_VIEW_WIN['Pattern_Display'], Pattern_Image, Pattern_Boxes, Bbox_Line_Color, Bbox_Line_Width, Box_Labels)
                                     
                                     except Exception as e:
                                         logger.exception(str(e))
@@ -2015,33 +2481,51 @@ if __name__ == '__main__':
                                 Button_Key = Button_Key.split("-")[1]
                                 Key_Split = Button_Key.split("_")
                                 Section_Id = Key_Split[-1]
-                                
-                                # FETCH FRAME IMAGE
-                                CB_X = int(nms_bbox_ctrl_values[f"-CROP_BEGIN_X_{Section_Id}-"])
-                                CB_Y = int(nms_bbox_ctrl_values[f"-CROP_BEGIN_Y_{Section_Id}-"])
-                                CE_X = int(nms_bbox_ctrl_values[f"-CROP_END_X_{Section_Id}-"])
-                                CE_Y = int(nms_bbox_ctrl_values[f"-CROP_END_Y_{Section_Id}-"])
-
-                                # FETCH PATTERN BBOX
-                                SB_X = int(nms_bbox_ctrl_values[f"-SYNC_BEGIN_X_{Section_Id}-"])
-                                SB_Y = int(nms_bbox_ctrl_values[f"-SYNC_BEGIN_Y_{Section_Id}-"])
-                                SE_X = int(nms_bbox_ctrl_values[f"-SYNC_END_X_{Section_Id}-"])
-                                SE_Y = int(nms_bbox_ctrl_values[f"-SYNC_END_Y_{Section_Id}-"])
-
-                                Camera_Cropped_Section = frame[CB_Y:CE_Y, CB_X:CE_X]
+
+                                # FETCH EVERY BBOX SO ALL SECTIONS ARE SCORED IN ONE PASS
+                                value_range = int(nms_cam_view_values["-Bbox_Count-"])
+                                Test_Regions = list()
+
                                 try:
-                                    Pattern_Cropped_Section = Pattern_Image_Copy[SB_Y:SE_Y, SB_X:SE_X]
+                                    for i in range(1,(value_range+1)):
+                                        Test_Regions.append((
+                                            int(nms_bbox_ctrl_values[f"-CROP_BEGIN_X_{i}-"]), int(nms_bbox_ctrl_values[f"-CROP_BEGIN_Y_{i}-"]),
+                                            int(nms_bbox_ctrl_values[f"-CROP_END_X_{i}-"]), int(nms_bbox_ctrl_values[f"-CROP_END_Y_{i}-"]),
+                                            int(nms_bbox_ctrl_values[f"-SYNC_BEGIN_X_{i}-"]), int(nms_bbox_ctrl_values[f"-SYNC_BEGIN_Y_{i}-"]),
+                                            int(nms_bbox_ctrl_values[f"-SYNC_END_X_{i}-"]), int(nms_bbox_ctrl_values[f"-SYNC_END_Y_{i}-"])
+                                            ))
+
+                                except ValueError:
+                                    sg.Popup("INVALID INPUT","All Bbox Input Should Be Integers", keep_on_top=True)
+
+                                else:
+                                    try:
+                                        # Clean Pattern Without The Drawn Bbox
+                                        Test_Stats = ssim_engine.Region_Stats(Pattern_Image, [Region[4:] for Region in Test_Regions], nms_cam_view_values["-Metric_Mode-"])
+
+                                        # Optional Alignment Of The Camera Boxes
+                                        Test_Shifts = None
+                                        if nms_cam_view_values["-Registration-"]:
+                                            Test_Shifts = ssim_engine.Register_Regions(frame, Test_Regions, Test_Stats)
+                                            logger.debug(f"Registration Shifts Are {Test_Shifts}")
+
+                                        Region_Results = ssim_engine.Score_Regions(frame, None, Test_Regions, Pattern_Stats=Test_Stats, Metric=nms_cam_view_values["-Metric_Mode-"], Shifts=Test_Shifts)
+
+                                    except Exception as e:
+                                        logger.exception(str(e))
+                                        sg.popup("NO Pattern Image Selected, Please Selecte A Pattern Image", title = "SSIM TEST", keep_on_top=True)
 
-                                    if (Camera_Cropped_Section.shape != Pattern_Cropped_Section.shape):
-                                        sg.Popup('Please Ensure Camera Image and Pattern Image Are The Same Size', keep_on_top=True)
-                                    
                                     else:
-                                        (Result, diff) = compare_ssim(Camera_Cropped_Section, Pattern_Cropped_Section, full=True, multichannel=True)
                                         logger.debug("Carried out Sample SSIM Test")
-                                        logger.debug(f"Test Result for Bbox_{Section_Id} is {Result}")
-                                        NMS_BBOX_CONTROL_WIN[f"S_ssim_{Section_Id}"].Update(round(Result,6))
-                                except:
-                                    sg.popup("NO Pattern Image Selected, Please Selecte A Pattern Image", title = "SSIM TEST", keep_on_top=True)
+
+                                        # Update Every Bbox Result
+                                        for i, Result in enumerate(Region_Results, start=1):
+                                            if Result is not None:
+                                                logger.debug(f"Test Result for Bbox_{i} is {Result}")
+                                                NMS_BBOX_CONTROL_WIN[f"S_ssim_{i}"].Update(round(Result,6))
+
+                                        if Region_Results[int(Section_Id)-1] is None:
+                                            sg.Popup('Please Ensure Camera Image and Pattern Image Are The Same Size', keep_on_top=True)
 
                             # Save Data
                             if (nms_bbox_ctrl_event == "-SAVE_Multi_Crop-"):
@@ -2130,18 +2614,8 @@ if __name__ == '__main__':
                                 except ValueError:
                                     sg.Popup("INVALID INPUT","All Bbox Input Should Be Integers", keep_on_top=True)
 
-                                # Bbox Parameters
-                                Bbox_start_point = (CB_X,CB_Y)
-                                Bbox_end_point = (CE_X,CE_Y)
-                                color = Bbox_Line_Color
-                                line_width = Bbox_Line_Width
-                                
-                                # Crop To Section
-                                frame_copy = copy.deepcopy(frame)
-                                new_Image = cv2.rectangle(frame_copy, Bbox_start_point, Bbox_end_point, color, line_width)
-                                Image_resized = cv2.resize(new_Image, (nms_cam_Width, nms_cam_Height), interpolation=cv2.INTER_AREA)
-                                cropbytes = cv2.imencode('.png', Image_resized)[1].tobytes()
-                                NMS_CAM_VIEW_WIN['camera'].update(data=cropbytes)
+                                # Crop To Section, Drawn On The Display Sized Frame
+                                NMS_Preview.Show_Boxes(NMS_CAM_VIEW_WIN['camera'], frame, [(CB_X, CB_Y, CE_X, CE_Y)], Bbox_Line_Color, Bbox_Line_Width)
 
                         if (nms_cam_view_event == "-Disable Crop-") and (cam_view == True):
                             NMS_CAM_VIEW_WIN["-Enable Crop-"].Update(disabled=False)
@@ -2153,9 +2627,7 @@ if __name__ == '__main__':
                             Crop = "Disabled"
 
                             # Clean Up Bbox Display
-                            Clean_Frame = cv2.resize(frame, (nms_cam_Width, nms_cam_Height), interpolation=cv2.INTER_AREA)
-                            cleanbytes = cv2.imencode('.png', Clean_Frame)[1].tobytes()
-                            NMS_CAM_VIEW_WIN["camera"].Update(data=cleanbytes)
+                            NMS_Preview.Show(NMS_CAM_VIEW_WIN["camera"], frame)
                             logger.debug("Cleaned Image Restored")
 
                         # Switches To Turn On and Off Bbox Sync
@@ -2256,24 +2728,12 @@ if __name__ == '__main__':
                                     except ValueError:
                                         sg.Popup("INVALID INPUT","All Bbox Input Should Be Integers", keep_on_top=True)
 
-                                # Bbox Parameters
-                                Sync_start_point = (SB_X,SB_Y)
-                                Sync_end_point = (SE_X,SE_Y)
-                                color = Bbox_Line_Color
-                                line_width = Bbox_Line_Width
-
-                                # Bbox Image To Section
-                                Pattern_Image = cv2.imread(Pattern_File_Path)
-                                Pattern_Image_Copy = copy.deepcopy(Pattern_Image)
-                                Bbox_Pattern_Image_Copy = cv2.rectangle(Pattern_Image_Copy, Sync_start_point, Sync_end_point, color, line_width)
-                                Resized_Bbox_Pattern_Image_Copy = cv2.resize(Bbox_Pattern_Image_Copy, (nms_pattern_Width, nms_pattern_Height), interpolation=cv2.INTER_AREA)
-                                Bbox_Current_Pattern_Copy_imgbytes = cv2.imencode('.png', Resized_Bbox_Pattern_Image_Copy)[1].tobytes()
-                                NMS_PATTERN_VIEW_WIN['Pattern_Display'].update(data=Bbox_Current_Pattern_Copy_imgbytes)
+                                # Bbox Image To Section, Cached So Ticks Cost No Disk Read
+                                Pattern_Image = pattern_cache.Load_Pattern(Pattern_File_Path)
+                                NMS_Pattern_Preview.Show_Boxes(NMS_PATTERN_VIEW_WIN['Pattern_Display'], Pattern_Image, [(SB_X, SB_Y, SE_X, SE_Y)], Bbox_Line_Color, Bbox_Line_Width)
 
                             if (nms_cam_view_event == "-Disable Crop-"):
-                                Plain_Pattern_Image_resized = cv2.resize(Pattern_Image, (nms_pattern_Width, nms_pattern_Height), interpolation=cv2.INTER_AREA)
-                                Plain_Pattern_Image_imgbytes = cv2.imencode('.png', Plain_Pattern_Image_resized)[1].tobytes()
-                                NMS_PATTERN_VIEW_WIN['Pattern_Display'].update(data=Plain_Pattern_Image_imgbytes)
+                                NMS_Pattern_Preview.Show(NMS_PATTERN_VIEW_WIN['Pattern_Display'], Pattern_Image)
                                 Align_Crop_Dimensions = False
 
                         # Single Bbox SSIM Test
@@ -2285,21 +2745,27 @@ if __name__ == '__main__':
                                 sg.Popup('Please Used The Cropping Tools To Define Region Of Focus', keep_on_top=True)
                                 
                             if (Active_Stream == False) and (Crop == "Enabled"):
-                                Camera_Cropped_Section = frame[CB_Y:CE_Y, CB_X:CE_X]
                                 try:
-                                    Pattern_Cropped_Section = Pattern_Image_Copy[SB_Y:SE_Y, SB_X:SE_X]
+                                    # Score Only, The Diff Map Is Built On Demand From The Analysis View
+                                    Test_Regions = [(CB_X, CB_Y, CE_X, CE_Y, SB_X, SB_Y, SE_X, SE_Y)]
+                                    Test_Stats = ssim_engine.Region_Stats(Pattern_Image, [Test_Regions[0][4:]], nms_cam_view_values["-Metric_Mode-"])
+
+                                    # Optional Alignment Of The Camera Box
+                                    Test_Shifts = None
+                                    if nms_cam_view_values["-Registration-"]:
+                                        Test_Shifts = ssim_engine.Register_Regions(frame, Test_Regions, Test_Stats)
+                                        logger.debug(f"Registration Shift Is {Test_Shifts[0]}")
+
+                                    (Result,) = ssim_engine.Score_Regions(frame, None, Test_Regions, Pattern_Stats=Test_Stats, Metric=nms_cam_view_values["-Metric_Mode-"], Shifts=Test_Shifts)
 
-                                    if (Camera_Cropped_Section.shape != Pattern_Cropped_Section.shape):
+                                    if Result is None:
                                         sg.Popup('Please Ensure Camera Image and Pattern Image Are The Same Size', keep_on_top=True)
                                     
                                     else:
-                                        (Result, diff) = compare_ssim(Camera_Cropped_Section, Pattern_Cropped_Section, full=True, multichannel=True)
                                         logger.debug("Carried out Sample SSIM Test")
                                         logger.debug(f"Test Result is {Result}")
                                         NMS_CAM_VIEW_WIN["S_ssim"].Update(round(Result,6))
 
-                                        # Diffrence On Every Pixel
-                                        # diff = (diff * 255).astype("uint8")
                                 except:
                                     sg.popup("NO Pattern Image Selected, Please Selecte A Pattern Image", title = "SSIM TEST", keep_on_top=True)
                         
@@ -2307,11 +2773,12 @@ if __name__ == '__main__':
                         if nms_cam_view_event == "-Add-":
 
                             # Capture Image From Live Feed
-                            ret, frame = cap.read()
-                            Id_Count = len(os.listdir(NMS_Master_Pattern_Folder)) + 1
+                            ret, frame = cap.Capture()
+                            Id_Count = len(List_Pattern_Files(NMS_Master_Pattern_Folder)) + 1
                             
                             # Write New Sample To Sample Folder
                             cv2.imwrite(f"{NMS_Master_Pattern_Folder}/{Id_Count}_Pattern.png", frame)
+                            ssim_engine.Invalidate_Pattern_Stats(f"{NMS_Master_Pattern_Folder}/{Id_Count}_Pattern.png")
                             sg.Popup('Pattern Saved', f'New Pattern Saved As {Id_Count}_Pattern.png', keep_on_top=True)
                             Thumbnails()
                             
@@ -2339,8 +2806,9 @@ if __name__ == '__main__':
                             if Pattern_File_Path.lower().endswith(".png"):
                             
                                 # Write New Sample Image To Sample Directory
-                                ret, frame = cap.read()
+                                ret, frame = cap.Capture()
                                 NMS = cv2.imwrite(f"{Pattern_File_Path}", frame)
+                                ssim_engine.Invalidate_Pattern_Stats(Pattern_File_Path)
                                 
                                 # Create Thumbnail
                                 New_NMS_img = cv2.imread(f"{Pattern_File_Path}")
@@ -2364,6 +2832,7 @@ if __name__ == '__main__':
                                 # Remove Pattern Image and Thumbnails
                                 os.remove(f"{Pattern_File_Path}")
                                 os.remove(f"{Thumbnail_File_Path}")
+                                ssim_engine.Invalidate_Pattern_Stats(Pattern_File_Path)
                                 logger.debug("Delete Complete")
 
                             except Exception as e:
@@ -2404,7 +2873,8 @@ if __name__ == '__main__':
                             # NMS Control Parameters
                             c.execute(f"""UPDATE nmsctrl
                                         SET Sync_Status = "{Sync}", Crop_X1 = {nms_cam_view_values["-CROP_BEGIN_X-"]}, Crop_X2 = {nms_cam_view_values["-CROP_END_X-"]}, Crop_Y1 = {nms_cam_view_values["-CROP_BEGIN_Y-"]}, Crop_Y2 = {nms_cam_view_values["-CROP_END_Y-"]},
-                                        Sync_X1 = {nms_cam_view_values["-SYNC_BEGIN_X-"]}, Sync_X2 = {nms_cam_view_values["-SYNC_END_X-"]}, Sync_Y1 = {nms_cam_view_values["-SYNC_BEGIN_Y-"]}, Sync_Y2 = {nms_cam_view_values["-SYNC_END_Y-"]}
+                                        Sync_X1 = {nms_cam_view_values["-SYNC_BEGIN_X-"]}, Sync_X2 = {nms_cam_view_values["-SYNC_END_X-"]}, Sync_Y1 = {nms_cam_view_values["-SYNC_BEGIN_Y-"]}, Sync_Y2 = {nms_cam_view_values["-SYNC_END_Y-"]},
+                                        Metric_Mode = "{nms_cam_view_values["-Metric_Mode-"]}", Registration = "{"Enabled" if nms_cam_view_values["-Registration-"] else "Disabled"}"
                                         WHERE rowid = 1""")
 
                             # Commit Update Tranx
@@ -2447,11 +2917,12 @@ if __name__ == '__main__':
                     BATCH_CAPTURE_WIN, bc_Width, bc_Height = Batch_Capture()
                     logger.debug("Opening Batch Capture Window")
 
-                    # Start Camera
-                    BC_cap = cv2.VideoCapture(Selected_Camera, cv2.CAP_DSHOW)
+                    # Shared Camera Service
+                    BC_cap = camera_service.Get_Camera(Selected_Camera, Current_Focus_Val)
 
-                    # Camera Focus Control
-                    BC_cap.set(cv2.CAP_PROP_FOCUS, Current_Focus_Val)
+                    # Reused Live Feed And Capture Display Buffers
+                    BC_Preview = camera_service.Preview_Buffers(250, 200, othset_data[12])
+                    BC_Capture_Preview = camera_service.Preview_Buffers(bc_Width, bc_Height)
 
                     while Batch_Active:
                         bc_event,bc_values = BATCH_CAPTURE_WIN.read(timeout=10)
@@ -2473,10 +2944,7 @@ if __name__ == '__main__':
 
                         # On Start Stream Video From Camera
                         if (Batch_Stream == True):
-                            ret, frame = BC_cap.read()
-                            live_feed_resized = cv2.resize(frame, (250, 200), interpolation=cv2.INTER_AREA)
-                            imgbytes = cv2.imencode('.png', live_feed_resized)[1].tobytes()
-                            BATCH_CAPTURE_WIN['-BC_Camera_Display-'].update(data=imgbytes)
+                            BC_Preview.Show_Latest(BATCH_CAPTURE_WIN, '-BC_Camera_Display-', BC_cap)
 
 
                         # Taking Pictures
@@ -2576,6 +3044,10 @@ if __name__ == '__main__':
                                     try:
                                         BCP_WIN, BCP_Width, BCP_Height = Batch_Capture_Pattern(Default_Pattern = Default_Pattern)
                                         bcp_view = True
+                                        BCP_Rendered_At = Pattern_Render_Ack(BCP_WIN)
+
+                                        # Next Patterns Load In The Background
+                                        pattern_cache.Prefetch_Patterns([(f"{Pattern_Origin_Folder}/{Name}", (BCP_Width, BCP_Height)) for Name in Pattern_Files[1:1 + pattern_cache.Prefetch_Depth]])
 
                                         # Create New Pattern Folder Or Add To Existing Folder
                                         Response = sg.popup_yes_no("Would You Like To Create A New Patten Folder For These Patterns.\nIf you select 'NO', the collected patterns will be added to the current pattern folder in use", title = "Create Folder",keep_on_top=True)
@@ -2595,7 +3067,7 @@ if __name__ == '__main__':
                                                 bcp_view = False
 
                                         # Count Number of PatternS Currently In Pattern Folder
-                                        Batch_Pattern_Count = len(os.listdir(BATCH_Pattern_Folder))
+                                        Batch_Pattern_Count = len(List_Pattern_Files(BATCH_Pattern_Folder))
                                         BATCH_CAPTURE_WIN["-Counter-"].update(Batch_Pattern_Count)
 
                                         logger.debug("Starting Camera Stream")
@@ -2623,7 +3095,7 @@ if __name__ == '__main__':
                             # Create Countdown Threads
                             if len(All_Threads) == 0:
                                 Exit_Thread.clear()  
-                                All_Threads.append(threading.Thread(target=countdown, args=(BATCH_CAPTURE_WIN, Count_Down_Timer), daemon=True).start())
+                                All_Threads.append(threading.Thread(target=countdown, args=(BATCH_CAPTURE_WIN, Count_Down_Timer, False, True), daemon=True).start())
                                     
                         # Updating Count Down On Display
                         if bc_event == "-THREAD_TIMER-":
@@ -2638,16 +3110,19 @@ if __name__ == '__main__':
                             else:
                                 # Capture Image
                                 logger.debug('Capturing Pattern Image')
-                                ret, frame = BC_cap.read()
-                                resized_capture = cv2.resize(frame, (bc_Width, bc_Height), interpolation=cv2.INTER_AREA)
-                                camera_capturebytes = cv2.imencode('.png',resized_capture)[1].tobytes()
+                                Capture_From = Capture_Start(BCP_WIN, BCP_Rendered_At, [BC_cap])
+                                frame, Capture_Latency = Capture_After_Render(BC_cap, Capture_From)
+                                if frame is None:
+                                    ret, frame = BC_cap.read()
+                                    frame = frame.copy() if ret else None
+                                logger.debug(f"Display To Capture Latency {Capture_Latency} ms")
 
                                 # Update Pattern Count Widget
                                 Batch_Pattern_Count = Batch_Pattern_Count + 1
                                 BATCH_CAPTURE_WIN["-Counter-"].update(Batch_Pattern_Count)
                                 
                                 # Show Image
-                                BATCH_CAPTURE_WIN['-BC_Image_Capture-'].update(data=camera_capturebytes)
+                                BC_Capture_Preview.Show(BATCH_CAPTURE_WIN['-BC_Image_Capture-'], frame)
 
                                 # Clear Tracking Thread
                                 All_Threads.clear()
@@ -2658,16 +3133,16 @@ if __name__ == '__main__':
 
                                 # Save Pattern Image
                                 cv2.imwrite(f"{BATCH_Pattern_Folder}/{Batch_Pattern_Count}_Pattern.png", frame)
+                                ssim_engine.Invalidate_Pattern_Stats(f"{BATCH_Pattern_Folder}/{Batch_Pattern_Count}_Pattern.png")
 
                                 # Type Cast Back To Integer
                                 Batch_Pattern_Count = int(Batch_Pattern_Count)
 
                                 # Update Displayed Pattern)
                                 Current_Count += 1
-                                ReadImage = cv2.imread(f"{Pattern_Origin_Folder}/{Pattern_Files[Current_Count]}")
-                                Read_Resize = cv2.resize(ReadImage, (BCP_Width, BCP_Height), interpolation=cv2.INTER_AREA)
-                                ReadImage_Bytes = cv2.imencode('.png', Read_Resize)[1].tobytes()
-                                BCP_WIN["Pattern_Display"].update(data = ReadImage_Bytes)
+                                pattern_cache.Show_Pattern(BCP_WIN["Pattern_Display"], f"{Pattern_Origin_Folder}/{Pattern_Files[Current_Count]}", (BCP_Width, BCP_Height))
+                                BCP_Rendered_At = Pattern_Render_Ack(BCP_WIN)
+                                pattern_cache.Prefetch_Patterns([(f"{Pattern_Origin_Folder}/{Name}", (BCP_Width, BCP_Height)) for Name in Pattern_Files[Current_Count + 1:Current_Count + 1 + pattern_cache.Prefetch_Depth]])
 
                         # Start Stream
                         if (bc_event == "STOP") and (Source_Start == True):
@@ -2746,7 +3221,7 @@ if __name__ == '__main__':
                                         # Generating Thumbnails #
                                         #########################
 
-                                        New_NMS_Images = os.listdir(Relative_Path)
+                                        New_NMS_Images = List_Pattern_Files(Relative_Path)
                                         BAR_MAX = len(New_NMS_Images)
                                         Thumb_close = False
 
@@ -2829,9 +3304,8 @@ if __name__ == '__main__':
                         if (Batch_Collect == False):
                             
                             # Show Blank Cropped Image Section
-                            Blank_Stream = np.ones([bc_Height, bc_Width]) * 255
-                            Blank_Stream_bytes = cv2.imencode('.png', Blank_Stream)[1].tobytes()
-                            BATCH_CAPTURE_WIN['-BC_Image_Capture-'].update(data=Blank_Stream_bytes)
+                            Blank_Stream = np.full([bc_Height, bc_Width], 255, np.uint8)
+                            camera_service.Show_Image(BATCH_CAPTURE_WIN['-BC_Image_Capture-'], Blank_Stream)
 
                         # Closing Analysis Window
                         if (bc_event == sg.WIN_CLOSED) or (bc_event == "CLOSE"):
@@ -2839,7 +3313,6 @@ if __name__ == '__main__':
 
                             # Closing Camera Setting Window
                             Batch_Stream = False
-                            BC_cap.release()
                             Batch_Active = False
                             BATCH_CAPTURE_WIN.close()
                             try:
@@ -2864,6 +3337,7 @@ if __name__ == '__main__':
 
                 # NMS Camera Window
                 CC_VIEW_WIN, cc_view_Width, cc_view_Height = Camera_Control_View()
+                CC_Preview = camera_service.Preview_Buffers(cc_view_Width, cc_view_Height, database("othsetctrl")[12])
                 logger.debug("Opening New Camera Control Window")
 
                 # Camera Capture Variables
@@ -2874,6 +3348,16 @@ if __name__ == '__main__':
                 while Camera_Ctrl:
                     cc_view_event, cc_view_values = CC_VIEW_WIN.read(timeout=5)
 
+                    # Discover Cameras Again In The Background
+                    if cc_view_event == "-Refresh_Cameras-":
+                        CC_VIEW_WIN["-Discovered_Cameras-"].update("Cameras: Discovering...")
+                        threading.Thread(target=Camera_Discovery_Thread, args=(CC_VIEW_WIN,), daemon=True).start()
+
+                    # Cache And Show The Discovered Cameras
+                    if cc_view_event == "-CAMERAS_DISCOVERED-":
+                        Save_Camera_Discovery(cc_view_values["-CAMERAS_DISCOVERED-"])
+                        CC_VIEW_WIN["-Discovered_Cameras-"].update(Discovery_Text())
+
                     if Track_Selector != cc_view_values:
                         Track_Selector = copy.deepcopy(cc_view_values)
                         Camera_Start = True
@@ -2890,25 +3374,21 @@ if __name__ == '__main__':
                         elif cc_view_values[2] == True:
                             Selected_Camera = 2
 
+                        # Release The Previously Viewed Camera When Switching
+                        if (cap_on == True) and (CC_cap.Index != Selected_Camera):
+                            camera_service.Release_Camera(CC_cap.Index)
+                            cap_on = False
+
                         if Cam_Test(Camera_Index = Selected_Camera) != True:
 
                             # Show Blank Cropped Image Section
-                            Blank_Stream = np.ones([cc_view_Height, cc_view_Width]) * 255
-                            Blank_Stream_bytes = cv2.imencode('.png', Blank_Stream)[1].tobytes()
-                            CC_VIEW_WIN['Camera_Control_Display'].update(data=Blank_Stream_bytes)
+                            Blank_Stream = np.full([cc_view_Height, cc_view_Width], 255, np.uint8)
+                            camera_service.Show_Image(CC_VIEW_WIN['Camera_Control_Display'], Blank_Stream)
                             Camera_Start = True
                             cap_on = False
-                            
-                            try:
-                                CC_cap.release()
-                            except:
-                                pass
                         else:
-                            # Start Camera
-                            CC_cap = cv2.VideoCapture(Selected_Camera, cv2.CAP_DSHOW)
-
-                            # Camera Focus Control
-                            CC_cap.set(cv2.CAP_PROP_FOCUS, Current_Focus_Val)
+                            # Shared Camera Service
+                            CC_cap = camera_service.Get_Camera(Selected_Camera, Current_Focus_Val)
 
                             # Camera Capture Set To Active
                             cap_on = True
@@ -2922,25 +3402,14 @@ if __name__ == '__main__':
 
                         # Camera Focus Control
                         try: 
-                            # Disable Camera Display
-                            cap_on = False
-
-                            # Release Camera
-                            CC_cap.release()
-                            
                             # Update Data From Database
                             rcv_data = list(rcv_data)
                             rcv_data[3] = cc_view_values["-Focus Control-"]
                             rcv_data = tuple(rcv_data) 
 
-                            # Start Camera
-                            CC_cap = cv2.VideoCapture(Selected_Camera, cv2.CAP_DSHOW)
-
-                            # Camera Focus Control
-                            CC_cap.set(cv2.CAP_PROP_FOCUS, Current_Focus_Val)
-
-                            # Enable Camera Display
-                            cap_on = True
+                            # Focus Is Applied By The Camera Owner Thread, No Reopen Needed
+                            if cap_on == True:
+                                CC_cap.Set(cv2.CAP_PROP_FOCUS, Current_Focus_Val)
 
                         except Exception as e:
                             logger.exception(str(e))
@@ -2949,34 +3418,68 @@ if __name__ == '__main__':
                     # Display Video
                     if cap_on == True:
                         # Display Camera Video
-                        ret, frame = CC_cap.read()
-                        resize_cap = cv2.resize(frame, (cc_view_Width, cc_view_Height), interpolation=cv2.INTER_AREA)
-                        cam_capbytes = cv2.imencode('.png',resize_cap)[1].tobytes()
-                        CC_VIEW_WIN['Camera_Control_Display'].update(data=cam_capbytes)
+                        CC_Preview.Show_Latest(CC_VIEW_WIN, 'Camera_Control_Display', CC_cap)
                         Camera_Start = False
 
 
+                    # At Least One Camera Must Be Enabled
+                    if (cc_view_event == "SAVE") and (True not in [cc_view_values[0], cc_view_values[1], cc_view_values[2]]):
+                        sg.Popup("Camera Check", "Please Select At Least One Camera", keep_on_top=True)
+
                     # Save Camera Control Setting
-                    if (cc_view_event == "SAVE") and (Camera_Ctrl == True):
+                    elif (cc_view_event == "SAVE") and (Camera_Ctrl == True):
+
+                        # Number Of Frames Combined Per Capture, Limited By The Ring Buffer
+                        try:
+                            Denoise_Frames = min(max(int(cc_view_values["-Denoise_Frames-"]), 1), camera_service.Ring_Size)
+                        except ValueError:
+                            Denoise_Frames = rcv_data[4]
+
+                        # Crop Positions Of The Additional Cameras, Blank Or Invalid Entries Use The Main Camera Crop
+                        Camera_Crops = dict()
+                        for Index in range(3):
+                            try:
+                                Camera_Crops[Index] = (int(cc_view_values[f"-Crop_X_{Index}-"]), int(cc_view_values[f"-Crop_Y_{Index}-"]))
+                            except ValueError:
+                                pass
+
+                        # Capture Profiles
+                        try:
+                            Camera_Profiles = Read_Camera_Profiles(cc_view_values)
+                        except ValueError:
+                            sg.Popup("INVALID INPUT", "Profile Sizes Should Be WidthxHeight (e.g. 1920x1080) And FPS A Number", keep_on_top=True)
+                            continue
 
                         # Update Camera Control Parameters
                         c.execute(f"""UPDATE camctrl
-                                    SET Camera_1 = {cc_view_values[0]}, Camera_2 = {cc_view_values[1]}, Camera_3 = {cc_view_values[2]}, Focus_Val = {Current_Focus_Val}
+                                    SET Camera_1 = {cc_view_values[0]}, Camera_2 = {cc_view_values[1]}, Camera_3 = {cc_view_values[2]}, Focus_Val = {Current_Focus_Val},
+                                    Denoise_Frames = {Denoise_Frames}, Denoise_Method = '{cc_view_values["-Denoise_Method-"]}',
+                                    Camera_Backend = '{cc_view_values["-Camera_Backend-"]}', Camera_Source = '{cc_view_values["-Camera_Source-"]}',
+                                    Camera_Crops = "{str(Camera_Crops)}", Camera_Profiles = "{str(Camera_Profiles)}"
                                     WHERE rowid = 1""")
 
                         # Commit Update Tranx
                         conn.commit()
+                        rcv_data = database("camctrl")
+
+                        # Switch Backend, Running Cameras Restart On The New Source
+                        if camera_service.Current_Backend() != (rcv_data[6], rcv_data[7]):
+                            camera_service.Set_Backend(rcv_data[6], rcv_data[7])
+                            cap_on = False
+                            Camera_Start = True
+                            CC_VIEW_WIN["-Discovered_Cameras-"].update("Cameras: Discovering...")
+                            threading.Thread(target=Camera_Discovery_Thread, args=(CC_VIEW_WIN,), daemon=True).start()
+
+                        # Cameras Whose Profile Changed Reopen In The New Mode
+                        camera_service.Set_Profiles(Camera_Profiles)
+                        if (cap_on == True) and (camera_service.Is_Running(Selected_Camera) == False):
+                            cap_on = False
+                            Camera_Start = True
 
                     # Closing Camera Control Window
                     if (cc_view_event == sg.WIN_CLOSED) or (cc_view_event == "CLOSE"):
                         logger.debug("Closing Camera Control Window")
                         
-                        # Closing Camera Use
-                        try:
-                            CC_cap.release()
-                        except:
-                            pass
-
                         # Closing Camera Setting Window
                         Camera_Ctrl = False
                         CC_VIEW_WIN.close()
@@ -3001,8 +3504,46 @@ if __name__ == '__main__':
                 while os_view:
                     os_view_win_event, os_view_win_values = OS_VIEW_WIN.read()
 
+                    # Calibrate Coarse Bands From Saved Results
+                    if (os_view_win_event == "-Calibrate_Bands-"):
+                        Calibration_Folder = sg.popup_get_folder("Select A Results Folder To Calibrate From", default_path=Analysis_Results_Folder, keep_on_top=True)
+
+                        if Calibration_Folder:
+                            OS_VIEW_WIN["-Calibrate_Bands-"].update("CALIBRATING...", disabled=True)
+                            threading.Thread(target=Coarse_Calibration_Thread, args=(OS_VIEW_WIN, Calibration_Folder, database("nmsctrl")[15]), daemon=True).start()
+
+                    # Calibrated Bands From The Calibration Thread
+                    if (os_view_win_event == "-BANDS_CALIBRATED-"):
+                        Calibration = os_view_win_values["-BANDS_CALIBRATED-"]
+                        OS_VIEW_WIN["-Calibrate_Bands-"].update("CALIBRATE", disabled=False)
+
+                        if "Error" in Calibration:
+                            sg.Popup("CALIBRATION FAILED", Calibration["Error"], keep_on_top=True)
+                        elif Calibration["Bands"] is None:
+                            sg.Popup("NOTIFICATION", "No Saved Samples Found In The Selected Folder", keep_on_top=True)
+                        else:
+                            OS_VIEW_WIN["-Coarse_Bands-"].update(str(Calibration["Bands"]))
+                            logger.info(f"Calibrated Coarse Bands {Calibration['Bands']} From {Calibration['Count']} Samples")
+
                     # Save Other Settings
                     if (os_view_win_event == "SAVE"):
+
+                        # Pass/Fail Decision Settings
+                        try:
+                            Pass_Threshold = float(os_view_win_values["-Pass_Threshold-"])
+                            Coarse_Bands = ssim_engine.Parse_Coarse_Bands(os_view_win_values["-Coarse_Bands-"].strip())
+                        except (ValueError, SyntaxError, AttributeError):
+                            sg.Popup("INVALID INPUT", "Pass Threshold Should Be A Number And Coarse Bands A {Level: Band} Dict", keep_on_top=True)
+                            continue
+
+                        # Live Preview Rate, 0 Removes The Cap
+                        try:
+                            Preview_Fps = float(os_view_win_values["-Preview_FPS-"])
+                            if Preview_Fps < 0:
+                                raise ValueError
+                        except ValueError:
+                            sg.Popup("INVALID INPUT", "Preview FPS Should Be A Positive Number, Or 0 For No Cap", keep_on_top=True)
+                            continue
                         
                         # Integer Equivalent of Bbox_Line_Width Selection
                         Index_Value = (Bbox_Width_List.index(os_view_win_values["-Set_Bbox_Width-"]) + 1)
@@ -3035,7 +3576,9 @@ if __name__ == '__main__':
                                     SET Timer = "{os_view_win_values["-Time_Delay-"]}", Log_Level = "{os_view_win_values["-Set_Log_Level-"]}", 
                                     Bbox_Line_Width = {Index_Value}, Bbox_Line_Colour = "{os_view_win_values["-Set_Bbox_Color-"]}", Thumbnails_Width = {Thumbnail_Value},
                                     Thumbnails_Height = {Thumbnail_Value}, NMS_Master_Pattern_Folder_Path = "{Relative_Path}",
-                                    NMS_Master_Thumbnails_Folder_Path = "{Thumbnails_Path}", Result_Destination = "{Results_Path}"
+                                    NMS_Master_Thumbnails_Folder_Path = "{Thumbnails_Path}", Result_Destination = "{Results_Path}",
+                                    Pass_Threshold = {Pass_Threshold}, Coarse_Bands = "{str(Coarse_Bands) if Coarse_Bands else None}",
+                                    Preview_FPS = {Preview_Fps}
                                     WHERE rowid = 1""")
 
                         # Commit Update Tranx
@@ -3118,19 +3661,25 @@ if __name__ == '__main__':
                 MAIN_APP_WIN, MAS_Width, MAS_Height = Main_App_Section()
                 logger.debug("Starting Main App")
 
-                # Start Camera
-                MAS_cap = cv2.VideoCapture(Selected_Camera, cv2.CAP_DSHOW)
-
-                # Camera Focus Control
-                MAS_cap.set(cv2.CAP_PROP_FOCUS, Current_Focus_Val)
+                # Shared Camera Service
+                MAS_cap = camera_service.Get_Camera(Selected_Camera, Current_Focus_Val)
+                MAS_Preview = camera_service.Preview_Buffers(MAS_Width, MAS_Height, database("othsetctrl")[12])
                 Camera_State = "On"
 
                 # Database Connection
                 MAS_Data = database("nmsctrl")
                 Mode = MAS_Data[12]
 
+                # Multi Frame Capture Settings, Frames Are Combined Over The Camera Boxes Only
+                MAS_Camera_Data = database("camctrl")
+                Denoise_Frames = int(MAS_Camera_Data[4])
+                Denoise_Method = MAS_Camera_Data[5]
+                Denoise_Boxes = [ssim_engine.Single_Region(MAS_Data)[:4]]
+                if Mode == "multiple":
+                    Denoise_Boxes += [Region[:4] for Region in ssim_engine.Parse_Bbox_Data(MAS_Data[14], MAS_Data[13])]
+                Denoise_Margin = ssim_engine.Registration_Max_Shift if MAS_Data[16] == "Enabled" else 0
+
                 # SSIM Collector
-                SSIM_List = list()
                 SSIM_DATA_POINTS = list()
                 Average_SSIM = 0
 
@@ -3138,6 +3687,17 @@ if __name__ == '__main__':
                 Destination_Folder = f"{Returned_Values[1]}/{Returned_Values[0]}/run_{len(os.listdir(f'{Returned_Values[1]}/{Returned_Values[0]}')) + 1}"
                 os.makedirs(Destination_Folder)
 
+                # Score Statistics Of Every Pattern Across Runs
+                Pattern_Statistics = run_statistics.Shared_Pattern_Statistics(Parent_Folder)
+
+                # Scores And Average Of The Current Run, Updated By The Scoring Pool
+                Current_Run = scoring_worker.Run_State(Destination_Folder, Pattern_Statistics)
+
+                # Additional Enabled Cameras, Each Scored Against The Same Pattern Into run_N/CAMERA_k
+                Camera_Runs = Additional_Camera_Runs(Destination_Folder, Pattern_Statistics)
+                Camera_Offsets = Camera_Crop_Offsets(MAS_Data)
+                Camera_Results = dict()
+
                 ######################
                 ## PATTERN WINDOW
                 ######################
@@ -3157,6 +3717,10 @@ if __name__ == '__main__':
                 print(f"Currently Displaying {Default_Pattern}")
                 pattern_view = True
 
+                # First Pattern Is On Screen
+                Pattern_Rendered_At = Pattern_Render_Ack(PATTERN_VIEW_WIN)
+                Prefetch_Run_Patterns(Thumbnail_Files, 0, NMS_Master_Pattern_Folder, MAS_Source_Folder, (PV_Width, PV_Height), (int(MAS_Data[6]), int(MAS_Data[8]), int(MAS_Data[7]), int(MAS_Data[9])))
+
                 while Activate:
                     # Read Main App Event
                     mas_event,mas_values = MAIN_APP_WIN.read(timeout=5)
@@ -3164,10 +3728,8 @@ if __name__ == '__main__':
                     # Auto Start Main App Running
                     if Camera_State == "On" and Auto_Start == True:
                         # Display Camera Video
-                        ret, frame = MAS_cap.read()
-                        resize_cap = cv2.resize(frame, (MAS_Width, MAS_Height), interpolation=cv2.INTER_AREA)
-                        cam_capbytes = cv2.imencode('.png',resize_cap)[1].tobytes()
-                        MAIN_APP_WIN['-MAS_Camera_Display-'].update(data=cam_capbytes)
+                        # Slowed Down While Samples Are Being Scored
+                        MAS_Preview.Show_Latest(MAIN_APP_WIN, '-MAS_Camera_Display-', MAS_cap, Busy=scoring_worker.Pending_Samples() > 0)
 
                     # Activate Single Run Mode
                     if mas_event == "-MAS_SingleRun_Button-":
@@ -3245,25 +3807,39 @@ if __name__ == '__main__':
                             Ymax = int(MAS_Data[5])
 
                             # Bbox Parameters
-                            Start_point = (Xmin,Ymin)
-                            End_point = (Xmax,Ymax)
                             color = Bbox_Line_Color
                             line_width = Bbox_Line_Width
 
+                            # Every Camera Captures The First Frames Grabbed After The Pattern Is On Screen And The Trigger Fired
+                            Capture_From = Capture_Start(PATTERN_VIEW_WIN, Pattern_Rendered_At, [MAS_cap] + [camera_service.Get_Camera(Index) for Index in Camera_Runs], Denoise_Frames)
+
                             # Apply Bbox Image To Section
-                            MAS2_cap = cv2.VideoCapture(Selected_Camera, cv2.CAP_DSHOW)
-                            ret, sec_frame = MAS2_cap.read()
-                            MAS2_cap.release()
+                            sec_frame, Capture_Latency = Capture_After_Render(MAS_cap, Capture_From, Denoise_Frames, Denoise_Boxes, Denoise_Method, Denoise_Margin)
+                            Capture_Degraded = MAS_cap.Degraded_Since(Capture_From)
+                            if sec_frame is None:
+                                logger.warning("No Camera Frame After Pattern Render, Using Latest Frame")
+                                # Copied, The Sample Is Scored And Saved On The Pool While Previews Refill The Ring
+                                ret, sec_frame = MAS_cap.read()
+                                sec_frame = sec_frame.copy() if ret else None
+                                Capture_Degraded = True
+                            if Capture_Degraded:
+                                logger.warning(f"Sample Captured While Camera Was Degraded, Health {MAS_cap.Health()}")
                             print("Taking Picture Of Pattern Displayed")
-
-                            # Copy Frame
-                            copy_frame = copy.deepcopy(sec_frame)
-                            
-                            # Update Display Window
-                            MAS_Image = cv2.rectangle(copy_frame, Start_point, End_point, color, line_width)
-                            Resized_MAS_Image = cv2.resize(MAS_Image, (MAS_Width, MAS_Height), interpolation=cv2.INTER_AREA)
-                            Resized_MAS_Image_imgbytes = cv2.imencode('.png', Resized_MAS_Image)[1].tobytes()
-                            MAIN_APP_WIN['-MAS_Camera_Display-'].update(data=Resized_MAS_Image_imgbytes)
+                            logger.debug(f"Display To Capture Latency {Capture_Latency} ms")
+
+                            # Additional Cameras, Decoding Since Capture_Start So These Frames Come From The Same Render
+                            Camera_Frames = dict()
+                            for Index in Camera_Runs:
+                                Offset_X, Offset_Y = Camera_Offsets.get(Index, (0, 0))
+                                Camera = camera_service.Get_Camera(Index)
+                                Camera_Frame, Camera_Latency = Capture_After_Render(Camera, Capture_From, Denoise_Frames, ssim_engine.Offset_Regions(Denoise_Boxes, Offset_X, Offset_Y), Denoise_Method, Denoise_Margin)
+                                if Camera_Frame is None:
+                                    logger.warning(f"No Frame From Camera {Index + 1}, Skipping Its Sample, Health {Camera.Health()}")
+                                    continue
+                                Camera_Frames[Index] = (Camera_Frame, Camera_Latency, Camera.Degraded_Since(Capture_From))
+
+                            # Update Display Window, The Bbox Is Drawn At Display Size And On The Saved Full Scale Copy By The Scoring Pool
+                            MAS_Preview.Show_Boxes(MAIN_APP_WIN['-MAS_Camera_Display-'], sec_frame, [(Xmin, Ymin, Xmax, Ymax)], color, line_width)
 
                             # Get File
                             Thumbnail_File = Thumbnail_Files[Sample_Count-1]
@@ -3282,62 +3858,56 @@ if __name__ == '__main__':
 
                             try:
                                 Returned_List = Thumbnails_Refresh(PATTERN_VIEW_WIN, PV_Width, PV_Height, None, Pattern_File_Path, Thumbnail_File_Path, Origin_File_Path=Origin_File_Path, Refresh=False, Bbox = "Active", Image_List = Thumbnail_Files)
+                                Pattern_Rendered_At = Pattern_Render_Ack(PATTERN_VIEW_WIN)
+                                Prefetch_Run_Patterns(Thumbnail_Files, Sample_Count, NMS_Master_Pattern_Folder, MAS_Origin_Folder, (PV_Width, PV_Height), (int(MAS_Data[6]), int(MAS_Data[8]), int(MAS_Data[7]), int(MAS_Data[9])))
 
-                                # Get Cropped Pattern Section
-                                Cropped_Pattern = Returned_List[1]
-
-                                # Get Cropped Image Section
-                                MAS_Cropped_Section = sec_frame[Ymin:Ymax, Xmin:Xmax]
-                                
-                                # Carry Out SSIM TEST
-                                (Result, diff) = compare_ssim(MAS_Cropped_Section, Cropped_Pattern, full=True, multichannel=True)
-                                logger.debug("SSIM Computed")
-                                logger.debug(f"Test Result is {Result}")
-                                SSIM_List.append(Result)
+                                # Regions Scored For The Current Mode
+                                MAS_Regions = list()
+                                if Mode == "multiple":
+                                    MAS_Regions = ssim_engine.Parse_Bbox_Data(MAS_Data[14], MAS_Data[13])
+                                if MAS_Regions == []:
+                                    MAS_Regions = [ssim_engine.Single_Region(MAS_Data)]
 
                                 # Get Pattern_Id
                                 Id_Split = Thumbnail_File.split("_")
                                 Id = Id_Split[0]
-                                
-                                # Save Cropped Image
-                                cv2.imwrite(f"{Destination_Folder}/{Id}_Image.png", MAS_Cropped_Section)
-
-                                # Save Cropped Pattern
-                                cv2.imwrite(f"{Destination_Folder}/{Id}_Pattern.png", Cropped_Pattern)
-
-                                # Save Full Scale Image
-                                cv2.imwrite(f"{Destination_Folder}/{Id}_FullScale_Image.png", MAS_Image)
-
-                                # Save Full Scale Pattern
-                                cv2.imwrite(f"{Destination_Folder}/{Id}_FullScale_Pattern.png", Returned_List[0])
-
-                                # Collection SSIM
-                                Total = 0
-                                SSIM_List_Length = len(SSIM_List)
 
-                                for SSIM in SSIM_List:
-                                    Total = Total + SSIM
-
-                                Average_SSIM = Total/SSIM_List_Length
-
-                                # Display Current SSIM result
-                                MAIN_APP_WIN["-MAS_Single_SSIM_Result-"].Update(round(Result,6))
-                                MAIN_APP_WIN["-MAS_Overall_SSIM_Result-"].Update(round(Average_SSIM,6))
-
-                                # Create Annotation Files
-                                Annotation_Folder_Path = f"{Destination_Folder}/ANNOTATION"
-                                os.makedirs(Annotation_Folder_Path, exist_ok=True)
-
-                                # Write To Annotation
-                                if os.path.exists(f'{Annotation_Folder_Path}/Annotation.csv'):
-                                    with open(f'{Annotation_Folder_Path}/Annotation.csv', 'a', newline='') as file:
-                                        writer = csv.writer(file)
-                                        writer.writerow([Id, f"{Id}_Image.png", f"{Id}_Pattern.png", Result, Average_SSIM])
-                                else:
-                                    with open(f'{Annotation_Folder_Path}/Annotation.csv', 'w+', newline='') as file:
-                                        writer = csv.writer(file)
-                                        writer.writerow(["SN", "Image_Name", "Pattern_Name", "SSIM_Value","Current Average Value"])
-                                        writer.writerow([Id, f"{Id}_Image.png", f"{Id}_Pattern.png", Result, Average_SSIM])
+                                # Score And Save On The Scoring Pool, Result Comes Back As '-SSIM_RESULT-'
+                                MAS_Sample = {
+                                    "Id": Id,
+                                    "Frame": sec_frame,
+                                    "Full_Scale_Image": sec_frame,
+                                    "Full_Scale_Pattern": Returned_List[0],
+                                    "Cropped_Pattern": Returned_List[1],
+                                    "Crop_Box": (Xmin, Ymin, Xmax, Ymax),
+                                    "Pattern_File_Path": Pattern_File_Path,
+                                    "Pattern_Name": Thumbnail_File,
+                                    "Regions": MAS_Regions,
+                                    "Metric": MAS_Data[15],
+                                    "Registration": (MAS_Data[16] == "Enabled"),
+                                    "Threshold": float(required_data[10]),
+                                    "Bands": ssim_engine.Parse_Coarse_Bands(required_data[11]),
+                                    "Capture_Latency_ms": Capture_Latency,
+                                    "Degraded": Capture_Degraded,
+                                    "Overlay": {"Image": [(Xmin, Ymin, Xmax, Ymax)], "Pattern": [(Returned_List[2], Returned_List[3], Returned_List[4], Returned_List[5])], "Color": color, "Line_Width": line_width}
+                                    }
+                                scoring_worker.Submit_Sample(MAIN_APP_WIN, Current_Run, MAS_Sample)
+                                logger.debug(f"Queued Sample {Id} For Scoring")
+
+                                # Additional Cameras Use Their Own Frame And Crop Position With The Same Pattern
+                                for Index, (Camera_Frame, Camera_Latency, Camera_Degraded) in Camera_Frames.items():
+                                    Offset_X, Offset_Y = Camera_Offsets.get(Index, (0, 0))
+                                    scoring_worker.Submit_Sample(MAIN_APP_WIN, Camera_Runs[Index], dict(MAS_Sample,
+                                        Frame = Camera_Frame,
+                                        Full_Scale_Image = Camera_Frame,
+                                        Overlay = dict(MAS_Sample["Overlay"], Image = [(Xmin + Offset_X, Ymin + Offset_Y, Xmax + Offset_X, Ymax + Offset_Y)]),
+                                        Crop_Box = (Xmin + Offset_X, Ymin + Offset_Y, Xmax + Offset_X, Ymax + Offset_Y),
+                                        Pattern_Name = f"CAMERA_{Index + 1}/{Thumbnail_File}",
+                                        Regions = ssim_engine.Offset_Regions(MAS_Regions, Offset_X, Offset_Y),
+                                        Capture_Latency_ms = Camera_Latency,
+                                        Degraded = Camera_Degraded
+                                        ))
+                                    logger.debug(f"Queued Sample {Id} Of Camera {Index + 1} For Scoring")
 
                             except Exception as e:
                                 sg.Popup(f"Unable To Focus Pattern {e}", keep_on_top=True)
@@ -3354,6 +3924,9 @@ if __name__ == '__main__':
                             # print(SSIM_DATA_POINTS)
                             # print(f"Overall Average After {Sample_Count} Patterns is {Average_SSIM}")
 
+                            # Run End, Pattern Statistics Scored So Far Are Written
+                            Pattern_Statistics.Flush()
+
                             # Reset Variables
                             Sample_Count = 0
                             Number_of_Patterns = copy.deepcopy(Pattern_Count)
@@ -3363,8 +3936,6 @@ if __name__ == '__main__':
                             MAIN_APP_WIN["-MAS_Pattern_Count-"].update(Number_of_Patterns)
                             MAIN_APP_WIN["-MAS_Collection_Count-"].Update(Collection_Count)
 
-                            # Clear Collection_List
-                            SSIM_List.clear()
 
                             # Stop App On Single Run
                             if (Single_Run == True):
@@ -3379,10 +3950,46 @@ if __name__ == '__main__':
                                 Destination_Folder = f"{Returned_Values[1]}/{Returned_Values[0]}/run_{len(os.listdir(f'{Returned_Values[1]}/{Returned_Values[0]}')) + 1}"
                                 os.makedirs(Destination_Folder, exist_ok=True)
 
+                                # Samples Still Being Scored Keep Their Own Run
+                                Current_Run = scoring_worker.Run_State(Destination_Folder, Pattern_Statistics)
+                                Camera_Runs = Additional_Camera_Runs(Destination_Folder, Pattern_Statistics)
+
+
+                    # Display Scoring Results From The Scoring Pool
+                    if (mas_event == "-SSIM_RESULT-"):
+                        Scored_Sample = mas_values["-SSIM_RESULT-"]
+
+                        if "Error" in Scored_Sample:
+                            sg.Popup(f"Unable To Score Sample {Scored_Sample['Id']}, {Scored_Sample['Error']}", keep_on_top=True)
+
+                        # Additional Cameras Only Update Their Own Line
+                        elif Scored_Sample["Run"].Camera is not None:
+                            Camera_Results[Scored_Sample["Run"].Camera] = f"CAM {Scored_Sample['Run'].Camera + 1}: {round(Scored_Sample['Result'], 4)} {Scored_Sample['Decision']}".strip()
+                            MAIN_APP_WIN["-MAS_Camera_Results-"].Update("\n".join(Camera_Results[Index] for Index in sorted(Camera_Results)))
+
+                        else:
+                            logger.debug("SSIM Computed")
+                            logger.debug(f"Test Result is {Scored_Sample['Result']}")
+                            logger.debug(f"Applied Registration Shift is {Scored_Sample['Shift']}")
+
+                            # Display Current SSIM result
+                            MAIN_APP_WIN["-MAS_Single_SSIM_Result-"].Update(round(Scored_Sample["Result"],6))
+
+                            # Display Pass/Fail Decision And The Level That Decided It
+                            if Scored_Sample["Decision"] != "":
+                                logger.debug(f"Decision is {Scored_Sample['Decision']} At Level {Scored_Sample['Decision_Level']}")
+                                MAIN_APP_WIN["-MAS_Decision-"].Update(f"{Scored_Sample['Decision']} (L{Scored_Sample['Decision_Level']})", background_color=("green" if Scored_Sample["Decision"] == "PASS" else "red"))
+
+                            # Only The Current Run Updates The Overall Average
+                            if Scored_Sample["Run"] is Current_Run:
+                                Average_SSIM = Scored_Sample["Average"]
+                                MAIN_APP_WIN["-MAS_Overall_SSIM_Result-"].Update(round(Average_SSIM,6))
+                                logger.debug(f"Run Summary is {Scored_Sample['Summary']}")
 
                     # Close MAS window
                     if (mas_event == sg.WIN_CLOSED) or (mas_event == "-MAS_Exit_Button-"):
                         logger.debug("Closing Main App Section")
+                        Pattern_Statistics.Flush()
 
                         # Closing Camera Setting Window
                         Thread_Control= False
@@ -3396,7 +4003,6 @@ if __name__ == '__main__':
                         except:
                             sg.Popup("Closed Window", "Pattern Window Has Already Been Closed", keep_on_top=True)
 
-                        MAS_cap.release()
                         MAIN_APP_WIN.close()
 
 
@@ -3451,6 +4057,29 @@ if __name__ == '__main__':
                     #     get_collection = analysis_event.split("Collection_")
                     #     Selected_Collection = get_collection[1]
                     
+                    # View Sample Heatmap, Generated On First Request
+                    if (analysis_event != None) and (analysis_event.startswith("HEATMAP,")):
+                        try:
+                            Event_Split = analysis_event.split(",")
+                            Heatmap_Path = ssim_engine.Load_Heatmap(Event_Split[1], Event_Split[2])
+                            logger.debug(f"Showing Heatmap {Heatmap_Path}")
+
+                        except Exception as e:
+                            logger.exception(str(e))
+                            sg.popup(f"Unable To Create The Heatmap {e}", title = "Invalid File", keep_on_top=True)
+
+                        else:
+                            # Open Image View Window
+                            IMAGE_WIN, IMAGE_WIN_Width, IMAGE_WIN_Height = Image_View_Win(Image_Path = Heatmap_Path)
+                            Image_View = True
+
+                            while Image_View:
+                                Image_Event, Image_Value = IMAGE_WIN.read()
+
+                                if(Image_Event == sg.WIN_CLOSED):
+                                    IMAGE_WIN.close()
+                                    Image_View = False
+
                     # View Image Section
                     if (analysis_event != None) and (analysis_event.endswith(".png")):
                         
@@ -3504,6 +4133,7 @@ if __name__ == '__main__':
 
             # Closing Application
             if (home_event == sg.WIN_CLOSED) or (home_event == "CLOSE"):
+                camera_service.Stop_All()
                 logger.debug("Closing Home Window")
                 HOME_WIN.close()
                 break
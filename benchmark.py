@@ -0,0 +1,342 @@
+"""
+WinSSIM Benchmarks
+-> Measures the speed and accuracy of the scoring engine on saved result crops
+-> The preview and display benchmarks measure the camera preview loop and the image path to
+Tk on synthetic frames
+-> Run From The Repository Root, e.g. python benchmark.py metrics Mirror_Standard/Results/<Date>/<Session>/run_1
+"""
+
+# -------- Importing Modules -------- #
+import argparse
+import os
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+import camera_service
+import ssim_engine
+
+
+############################
+# Shared Helpers
+############################
+
+# Whole Crop Region Of A Pair
+def Full_Region(Image):
+    Height, Width = Image.shape[:2]
+    return (0, 0, Width, Height, 0, 0, Width, Height)
+
+
+"""
+Time A Scoring Call
+-:> Returns (mean seconds per call, last result)
+
+Function: Callable to time
+Repeats: Number of timed calls
+"""
+def Time_Call(Function, Repeats):
+    Result = Function()
+    Start = time.perf_counter()
+    for _ in range(Repeats):
+        Result = Function()
+    return (time.perf_counter() - Start) / Repeats, Result
+
+
+############################
+# Metric Mode Comparison
+############################
+
+"""
+Metric Mode Comparison
+-> Scores every crop pair of a run with each metric mode
+-> Speed: time per sample and speedup against bgr
+-> Agreement: mean absolute difference and correlation against bgr
+-> Blur Robustness: score drop when the camera crop is blurred, lower is more robust
+"""
+def Metrics(Args):
+    Pairs = ssim_engine.Load_Crop_Pairs(Args.run_folder)
+    if Pairs == []:
+        print(f"No Crop Pairs Found In {Args.run_folder}")
+        return
+
+    Scores, Blurred_Scores, Times = dict(), dict(), dict()
+    for Metric in ssim_engine.Metric_Modes:
+        Scores[Metric], Blurred_Scores[Metric], Times[Metric] = list(), list(), list()
+
+        for Id, Image, Pattern in Pairs:
+            Region = [Full_Region(Image)]
+            Blurred = cv2.GaussianBlur(Image, (0, 0), Args.blur)
+
+            Elapsed, (Score,) = Time_Call(lambda: ssim_engine.Score_Regions(Image, Pattern, Region, Metric=Metric), Args.repeats)
+            (Blurred_Score,) = ssim_engine.Score_Regions(Blurred, Pattern, Region, Metric=Metric)
+
+            Times[Metric].append(Elapsed)
+            Scores[Metric].append(Score)
+            Blurred_Scores[Metric].append(Blurred_Score)
+
+    Baseline = np.array(Scores["bgr"])
+    print(f"{len(Pairs)} Samples, Blur Sigma {Args.blur}")
+    print(f"{'METRIC':<8}{'MS/SAMPLE':>11}{'SPEEDUP':>9}{'MEAN |D|':>10}{'CORR':>8}{'BLUR DROP':>11}")
+
+    for Metric in ssim_engine.Metric_Modes:
+        Values = np.array(Scores[Metric])
+        Drop = np.mean(Values - np.array(Blurred_Scores[Metric]))
+        Correlation = np.corrcoef(Baseline, Values)[0, 1] if len(Values) > 1 else float("nan")
+        print(f"{Metric:<8}{np.mean(Times[Metric]) * 1000:>11.3f}{np.mean(Times['bgr']) / np.mean(Times[Metric]):>9.2f}"
+              f"{np.mean(np.abs(Values - Baseline)):>10.4f}{Correlation:>8.3f}{Drop:>11.4f}")
+
+
+############################
+# Tiled Scoring Comparison
+############################
+
+"""
+Tiled Scoring Comparison
+-> Scores a synthetic full-scale frame pair with the float64 path and the tiled float32 path
+-> Reports time, peak traced memory and the score difference against Tiled_Tolerance
+"""
+def Tiled(Args):
+    Random = np.random.default_rng(0)
+    Pattern = cv2.GaussianBlur(Random.integers(0, 256, (Args.height, Args.width, 3), dtype=np.uint8), (5, 5), 0)
+    Noise = Random.integers(-Args.noise, Args.noise + 1, Pattern.shape)
+    Frame = np.clip(Pattern.astype(np.int16) + Noise, 0, 255).astype(np.uint8)
+    Region = [Full_Region(Frame)]
+
+    Results = dict()
+    for Name, Budget in (("float64", float("inf")), ("tiled", Args.budget * 1024 * 1024)):
+        tracemalloc.start()
+        Elapsed, (Score,) = Time_Call(lambda: ssim_engine.Score_Regions(Frame, Pattern, Region, Memory_Budget=Budget), Args.repeats)
+        Peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        Results[Name] = Score
+        print(f"{Name:<8} {Elapsed * 1000:>9.1f} ms {Peak / 1024 / 1024:>9.1f} MiB peak  score {Score:.10f}")
+
+    Difference = abs(Results["tiled"] - Results["float64"])
+    print(f"|Difference| {Difference:.2e} (Tolerance {ssim_engine.Tiled_Tolerance:.0e})")
+
+
+############################
+# Coarse To Fine Comparison
+############################
+
+"""
+Coarse To Fine Comparison
+-> Calibrates the coarse bands on a run (or uses the given ones) and decides every sample
+-> Reports the samples decided per pyramid level, time against a full resolution score
+and the decisions that differ from the full resolution decision
+"""
+def Coarse(Args):
+    Pairs = ssim_engine.Load_Crop_Pairs(Args.run_folder)
+    if Pairs == []:
+        print(f"No Crop Pairs Found In {Args.run_folder}")
+        return
+
+    if Args.bands is None:
+        Bands = ssim_engine.Calibrate_Coarse_Bands([(Image, Pattern) for _, Image, Pattern in Pairs], Metric=Args.metric)
+    else:
+        Bands = ssim_engine.Parse_Coarse_Bands(Args.bands)
+    print(f"{len(Pairs)} Samples, Threshold {Args.threshold}, Bands {Bands}")
+
+    Levels, Mismatches, Full_Time, Coarse_Time = dict(), 0, 0.0, 0.0
+    for Id, Image, Pattern in Pairs:
+        Region = [Full_Region(Image)]
+        Stats = ssim_engine.Region_Stats(Pattern, [Region[0][4:]], Args.metric)
+
+        Elapsed, (Score,) = Time_Call(lambda: ssim_engine.Score_Regions(Image, None, Region, Stats, Args.metric), Args.repeats)
+        Full_Time += Elapsed
+
+        Elapsed, (_, Result, Decision, Level) = Time_Call(lambda: ssim_engine.Decide_Regions(Image, Region, Stats, Args.threshold, Bands, Args.metric), Args.repeats)
+        Coarse_Time += Elapsed
+
+        Levels[Level] = Levels.get(Level, 0) + 1
+        if Decision != ("PASS" if Score >= Args.threshold else "FAIL"):
+            Mismatches += 1
+        print(f"{Id:<6} full {Score:.4f}  level {Level} {Result:.4f} {Decision}")
+
+    print(f"Decided Per Level {dict(sorted(Levels.items()))}, Decisions Differing From Full Resolution {Mismatches}")
+    print(f"Full {Full_Time / len(Pairs) * 1000:.3f} ms/sample, Coarse To Fine {Coarse_Time / len(Pairs) * 1000:.3f} ms/sample")
+
+
+############################
+# Preview Loop Comparison
+############################
+
+"""
+Synthetic Capture
+-> Cycles through a few noisy frames, read fills the given image like cv2.VideoCapture does
+"""
+class Synthetic_Capture:
+    def __init__(self, Width, Height, Count=4):
+        Generator = np.random.default_rng(0)
+        self.Frames = [Generator.integers(0, 256, (Height, Width, 3), dtype=np.uint8) for _ in range(Count)]
+        self.Index = 0
+
+    def read(self, image=None):
+        Frame = self.Frames[self.Index % len(self.Frames)]
+        self.Index += 1
+        if (image is not None) and (image.shape == Frame.shape):
+            np.copyto(image, Frame)
+            return True, image
+        return True, Frame.copy()
+
+
+# One Preview Frame As The Windows Did It, Every Step Returns A New Array
+def Preview_Before(cap, Size):
+    ret, frame = cap.read()
+    frame_copy = frame.copy()
+    cv2.rectangle(frame_copy, (10, 10), (200, 200), (0, 0, 255), 2)
+    resized = cv2.resize(frame_copy, Size, interpolation=cv2.INTER_AREA)
+    return [frame, frame_copy, resized], cv2.imencode('.png', resized)[1].tobytes()
+
+
+# One Preview Frame Through A Grab Slot And The Reused Display Buffers
+def Preview_After(cap, Slot, Preview):
+    ret, frame = cap.read(Slot)
+    frame_copy = Preview.Overlay(frame)
+    cv2.rectangle(frame_copy, (10, 10), (200, 200), (0, 0, 255), 2)
+    resized = Preview.Resize(frame_copy)
+    return [frame, frame_copy, resized], cv2.imencode('.png', resized)[1].tobytes()
+
+
+# One Preview Frame Resized First, The Overlay Is Drawn On The Display Buffer
+def Preview_Display_Overlay(cap, Slot, Preview):
+    ret, frame = cap.read(Slot)
+    resized = Preview.Resize(frame)
+    camera_service.Draw_Boxes(resized, [(10, 10, 200, 200)], (Preview.Size[0] / frame.shape[1], Preview.Size[1] / frame.shape[0]), (0, 0, 255), 2)
+    return [frame, resized], cv2.imencode('.png', resized)[1].tobytes()
+
+
+"""
+Preview Loop Comparison
+-> Runs the capture, overlay, resize and encode steps of a preview frame with fresh arrays,
+with the reused grab slot and Preview_Buffers, and with the overlay drawn at display size
+-> Reports frame sized arrays allocated per frame, peak transient bytes per frame and time
+per frame, the PNG bytes are allocated by both paths
+"""
+def Preview(Args):
+    Size = (Args.display_width, Args.display_height)
+    cap = Synthetic_Capture(Args.width, Args.height)
+    Slot = np.empty((Args.height, Args.width, 3), np.uint8)
+    Preview_Buffer = camera_service.Preview_Buffers(*Size)
+    Paths = {
+        "before": lambda: Preview_Before(cap, Size),
+        "after": lambda: Preview_After(cap, Slot, Preview_Buffer),
+        "display": lambda: Preview_Display_Overlay(cap, Slot, Preview_Buffer)
+        }
+
+    print(f"{Args.width}x{Args.height} Frames Shown At {Size[0]}x{Size[1]}, {Args.frames} Frames")
+    for Name, Function in Paths.items():
+        # Warm Up So The Reused Buffers Exist
+        Function()
+        Buffers = [Slot, Preview_Buffer.Overlay_Buffer, Preview_Buffer.Display_Buffer]
+
+        Allocations, Peak = 0, 0
+        tracemalloc.start()
+        for _ in range(Args.frames):
+            tracemalloc.reset_peak()
+            Before, _ = tracemalloc.get_traced_memory()
+            Arrays, _ = Function()
+            Peak += tracemalloc.get_traced_memory()[1] - Before
+            Allocations += sum(1 for Array in Arrays if not any(np.shares_memory(Array, Buffer) for Buffer in Buffers))
+            del Arrays
+        tracemalloc.stop()
+
+        Elapsed, _ = Time_Call(Function, Args.frames)
+        print(f"{Name:<7} {Allocations / Args.frames:.1f} arrays/frame  {Peak / Args.frames / 1024:.1f} KiB transient/frame  {Elapsed * 1000:.3f} ms/frame")
+
+
+############################
+# Display Transport Comparison
+############################
+
+"""
+Display Transport Comparison
+-> Per displayed frame cost of the PNG path (imencode + a new PhotoImage from the bytes)
+against the PPM path (Display_Bytes + loading into one reused PhotoImage)
+-> The Tk half needs a display, without one only the encode cost is reported
+"""
+def Display(Args):
+    Generator = np.random.default_rng(0)
+    Frame = cv2.GaussianBlur(Generator.integers(0, 256, (Args.height, Args.width, 3), dtype=np.uint8), (15, 15), 5)
+
+    try:
+        import tkinter as tk
+        Root = tk.Tk()
+        Root.withdraw()
+    except Exception as e:
+        Root = None
+        print(f"No Tk Display ({e}), Reporting Encode Cost Only")
+
+    Png = lambda: cv2.imencode('.png', Frame)[1].tobytes()
+    Ppm = lambda: camera_service.Display_Bytes(Frame)
+    Paths = {"png": (Png, None), "ppm": (Ppm, None)}
+    if Root is not None:
+        Photo = tk.PhotoImage(master=Root, data=Ppm())
+        Paths["png"] = (Png, lambda Data: tk.PhotoImage(master=Root, data=Data))
+        Paths["ppm"] = (Ppm, lambda Data: Photo.configure(data=Data))
+
+    print(f"{Args.width}x{Args.height} Frame, {Args.repeats} Repeats")
+    for Name, (Encode, Load) in Paths.items():
+        Encode_Time, Data = Time_Call(Encode, Args.repeats)
+        Line = f"{Name}  encode {Encode_Time * 1000:.3f} ms  {len(Data) / 1024:.0f} KiB"
+        if Load is not None:
+            Load_Time, _ = Time_Call(lambda: Load(Data), Args.repeats)
+            Line += f"  tk load {Load_Time * 1000:.3f} ms  total {(Encode_Time + Load_Time) * 1000:.3f} ms/frame"
+        print(Line)
+
+    if Root is not None:
+        Root.destroy()
+
+
+############################
+# Command Line
+############################
+
+def main():
+    Parser = argparse.ArgumentParser(description="WinSSIM scoring benchmarks")
+    Commands = Parser.add_subparsers(dest="command", required=True)
+
+    Metrics_Parser = Commands.add_parser("metrics", help="Compare the bgr, luma and msssim metric modes")
+    Metrics_Parser.add_argument("run_folder", help="Results run_N folder holding {Id}_Image.png / {Id}_Pattern.png crops")
+    Metrics_Parser.add_argument("--repeats", type=int, default=5, help="Timed calls per sample")
+    Metrics_Parser.add_argument("--blur", type=float, default=2.0, help="Gaussian sigma used for the blur robustness check")
+    Metrics_Parser.set_defaults(Function=Metrics)
+
+    Tiled_Parser = Commands.add_parser("tiled", help="Compare float64 and tiled float32 scoring of a full-scale frame")
+    Tiled_Parser.add_argument("--width", type=int, default=3840, help="Frame width")
+    Tiled_Parser.add_argument("--height", type=int, default=2160, help="Frame height")
+    Tiled_Parser.add_argument("--noise", type=int, default=20, help="Uniform noise added to the camera frame")
+    Tiled_Parser.add_argument("--budget", type=int, default=64, help="Tiled memory budget in MiB")
+    Tiled_Parser.add_argument("--repeats", type=int, default=3, help="Timed calls per path")
+    Tiled_Parser.set_defaults(Function=Tiled)
+
+    Coarse_Parser = Commands.add_parser("coarse", help="Compare coarse-to-fine decisions with full resolution decisions")
+    Coarse_Parser.add_argument("run_folder", help="Results run_N folder holding {Id}_Image.png / {Id}_Pattern.png crops")
+    Coarse_Parser.add_argument("--threshold", type=float, required=True, help="Pass threshold")
+    Coarse_Parser.add_argument("--bands", default=None, help="Bands dict, calibrated on the run when omitted")
+    Coarse_Parser.add_argument("--metric", default="bgr", choices=ssim_engine.Metric_Modes, help="Metric mode")
+    Coarse_Parser.add_argument("--repeats", type=int, default=5, help="Timed calls per sample")
+    Coarse_Parser.set_defaults(Function=Coarse)
+
+    Preview_Parser = Commands.add_parser("preview", help="Compare allocating and buffer reusing preview loops")
+    Preview_Parser.add_argument("--width", type=int, default=1920, help="Camera frame width")
+    Preview_Parser.add_argument("--height", type=int, default=1080, help="Camera frame height")
+    Preview_Parser.add_argument("--display-width", type=int, default=640, help="Display width")
+    Preview_Parser.add_argument("--display-height", type=int, default=360, help="Display height")
+    Preview_Parser.add_argument("--frames", type=int, default=50, help="Frames per path")
+    Preview_Parser.set_defaults(Function=Preview)
+
+    Display_Parser = Commands.add_parser("display", help="Compare the PNG and PPM image paths to Tk")
+    Display_Parser.add_argument("--width", type=int, default=1920, help="Frame width")
+    Display_Parser.add_argument("--height", type=int, default=1080, help="Frame height")
+    Display_Parser.add_argument("--repeats", type=int, default=20, help="Timed calls per path")
+    Display_Parser.set_defaults(Function=Display)
+
+    Args = Parser.parse_args()
+    Args.Function(Args)
+
+
+if __name__ == "__main__":
+    main()
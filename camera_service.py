@@ -0,0 +1,1037 @@
+# Camera Imports
+from collections import deque
+import threading
+import logging
+import atexit
+import time
+import cv2
+import os
+import re
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+############################
+# Camera Service
+############################
+
+# Frames Kept In The Ring Buffer Of Each Camera
+Ring_Size = 8
+
+# Seconds To Wait For A Frame Before The Camera Is Treated As Unavailable
+Frame_Timeout = 3.0
+
+# Pause After A Failed Grab So A Missing Device Does Not Spin The Owner Thread
+Retry_Delay = 0.05
+
+# Consecutive Failed Grabs After Which The Device Is Reopened
+Reconnect_After = 20
+
+# Seconds Between Reconnect Attempts, The Last One Repeats Until The Device Is Back
+Reconnect_Backoff = (0.5, 1, 2, 4, 8)
+
+# Seconds A Camera Stays Degraded After A Failure, A Dropped Frame Or A Reconnect
+Degraded_Hold = 2.0
+
+# An Interval Between Grabbed Frames Longer Than This Many Frame Periods Counts The Missing Frames As Dropped
+Drop_Factor = 1.8
+
+# Ways Of Combining The Frames Of A Denoised Capture
+Denoise_Methods = ("median", "mean")
+
+
+############################
+# Capture Backends
+############################
+
+# Only One Thread Opens Or Probes A Device At A Time, Most Drivers Allow A Single Owner
+_Device_Locks = dict()
+_Device_Locks_Lock = threading.Lock()
+
+
+# Lock Of One Camera Index, Devices Of Other Indices Open And Probe Independently
+def _Device_Lock(Index):
+    with _Device_Locks_Lock:
+        return _Device_Locks.setdefault(Index, threading.Lock())
+
+
+# Backends Selectable In camctrl, The Device Ones Use The Camera Index, The Replay Ones Use The Source Path
+Camera_Backends = ("dshow", "v4l2", "file", "folder")
+
+# Frame Rate Of Replayed Sources Without Their Own
+Replay_Fps = 30
+
+# Image Files Read By The Folder Backend
+Frame_Extensions = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+
+# Natural Sort Key So frame_10 Follows frame_9
+def _Natural_Key(Text):
+    return [int(x) if x.isdigit() else x.lower() for x in re.split(r'(\d+)', Text)]
+
+
+"""
+Folder Capture
+-> Reads the image files of a folder in natural order as camera frames, looping at the end
+-> Same read/grab/retrieve/set/isOpened/release methods as cv2.VideoCapture, grab only
+moves to the next file and retrieve reads it
+
+Folder_Path: Folder holding the frames
+"""
+class Folder_Capture:
+    def __init__(self, Folder_Path):
+        self.Files = list()
+        if os.path.isdir(Folder_Path):
+            self.Files = sorted([f"{Folder_Path}/{x}" for x in os.listdir(Folder_Path) if x.lower().endswith(Frame_Extensions)], key=_Natural_Key)
+        self.Position = 0
+        self.Grabbed = None
+
+    def isOpened(self):
+        return self.Files != []
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def grab(self):
+        if self.Files == []:
+            return False
+        self.Grabbed = self.Files[self.Position]
+        self.Position = (self.Position + 1) % len(self.Files)
+        return True
+
+    def retrieve(self, image=None):
+        if self.Grabbed is None:
+            return False, None
+        frame = cv2.imread(self.Grabbed)
+
+        # Fill The Given Frame Like cv2.VideoCapture.retrieve Does
+        if (frame is not None) and (image is not None) and (image.shape == frame.shape) and (image.dtype == frame.dtype):
+            np.copyto(image, frame)
+            frame = image
+        return frame is not None, frame
+
+    def set(self, Property, Value):
+        return False
+
+    def get(self, Property):
+        return Replay_Fps if Property == cv2.CAP_PROP_FPS else 0
+
+    def release(self):
+        self.Files = list()
+
+
+"""
+Paced Capture
+-> Delivers the frames of a replayed source at a fixed rate, frame k at Start + k / Fps,
+so every run sees the same frames at the same times whatever the machine speed
+-> Video files loop at the end, camera properties (focus) are ignored
+
+cap: The replay capture (cv2.VideoCapture of a file or Folder_Capture)
+Fps: Delivery rate, the source rate is used when it reports one
+"""
+class Paced_Capture:
+    def __init__(self, cap, Fps=Replay_Fps):
+        self.cap = cap
+        Source_Fps = cap.get(cv2.CAP_PROP_FPS) if cap.isOpened() else 0
+        self.Period = 1 / (Source_Fps if Source_Fps and Source_Fps > 0 else Fps)
+        self.Start = None
+        self.Count = 0
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    # Waits For The Delivery Time Of The Next Frame, Decoding Is Left To retrieve
+    def grab(self):
+        if self.Start is None:
+            self.Start = time.monotonic()
+
+        Delay = self.Start + self.Count * self.Period - time.monotonic()
+        if Delay > 0:
+            time.sleep(Delay)
+        self.Count += 1
+
+        if self.cap.grab():
+            return True
+        # Loop The Video Back To Its First Frame
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return self.cap.grab()
+
+    def retrieve(self, image=None):
+        return self.cap.retrieve(image)
+
+    def set(self, Property, Value):
+        return False
+
+    def get(self, Property):
+        return 1 / self.Period if Property == cv2.CAP_PROP_FPS else 0
+
+    def release(self):
+        self.cap.release()
+
+
+"""
+Open Capture
+-> Opens a camera or a replay source for the selected backend
+-:> Returns an object with the cv2.VideoCapture read/grab/retrieve/set/isOpened/release methods
+
+Backend: One of Camera_Backends
+Index: Camera index of the device backends
+Source: Video file or frame folder of the replay backends
+"""
+def Open_Capture(Backend, Index, Source=""):
+    if Backend == "dshow":
+        return cv2.VideoCapture(Index, cv2.CAP_DSHOW)
+    elif Backend == "v4l2":
+        return cv2.VideoCapture(Index, cv2.CAP_V4L2)
+    elif Backend == "file":
+        return Paced_Capture(cv2.VideoCapture(Source))
+    elif Backend == "folder":
+        return Paced_Capture(Folder_Capture(Source))
+    raise ValueError(f"Unknown Camera Backend {Backend}, Expected One Of {Camera_Backends}")
+
+
+############################
+# Capture Profiles
+############################
+
+# Pixel Formats A Profile Can Request, MJPG Keeps High Resolutions At Full Frame Rate Over USB
+Pixel_Formats = ("MJPG", "YUYV")
+
+
+"""
+Parse Size
+-:> Returns (Width, Height) from a "1920x1080" string, None for a blank string
+
+Text: Size string
+"""
+def Parse_Size(Text):
+    Text = str(Text).strip().lower()
+    if Text in ("", "none"):
+        return None
+    Width, Height = (int(x) for x in Text.split("x"))
+    if (Width <= 0) or (Height <= 0):
+        raise ValueError(f"Invalid Size {Text}")
+    return (Width, Height)
+
+
+"""
+Apply Profile
+-> Requests the mode of a capture profile from a freshly opened device, the pixel format is
+set before the size since drivers choose the sizes per format
+-> Drivers fall back to the nearest mode they support, the negotiated mode is logged
+-> Replay captures ignore the profile
+
+cap: The opened capture
+Profile: Dict with optional "Size" (Width, Height), "Format" (one of Pixel_Formats) and "Fps"
+"""
+def Apply_Profile(cap, Profile):
+    if not Profile:
+        return
+
+    if Profile.get("Format") in Pixel_Formats:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*Profile["Format"]))
+    if Profile.get("Size"):
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, Profile["Size"][0])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, Profile["Size"][1])
+    if Profile.get("Fps"):
+        cap.set(cv2.CAP_PROP_FPS, Profile["Fps"])
+
+    if isinstance(cap, cv2.VideoCapture):
+        Fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+        Format = "".join(chr((Fourcc >> (8 * i)) & 0xFF) for i in range(4))
+        logger.info(f"Negotiated {int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))}x{int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))} {Format} At {cap.get(cv2.CAP_PROP_FPS)} FPS For Profile {Profile}")
+
+
+"""
+Camera Service
+-> One owner thread opens the device once and grabs continuously, keeping the driver queue
+drained, but a grabbed frame is only decoded into the ring buffer when one was requested
+-> Captures request the frames they wait for, previews request one frame per update with
+Request_Preview, so frames nobody looks at cost a grab and no decode
+-> Every entry is (Sequence, Timestamp, Frame), the timestamp is time.monotonic() taken when
+the grab started, so a frame stamped after a trigger was exposed after it
+-> The preview, the capture trigger and the settings windows all read from the buffer, no
+window opens the device itself
+-> Frames are grabbed into Size + 1 preallocated slots used in turn, the slot being filled is
+never in the buffer, so a grab allocates nothing once the frame size is known
+-> Frames in the buffer are shared and their slot is refilled Size + 1 grabs later, readers
+copy before drawing on them or keeping them, Capture and Capture_Frames users get copies
+-> Property changes (focus) are queued and applied by the owner thread between grabs
+-> A profile with a preview size also keeps a downscaled copy of every decoded frame for the
+live previews, made on the owner thread so the window loop only encodes a small frame
+-> Health: grabbed, decoded, failed and dropped frames and reconnects are counted, after
+Reconnect_After failed grabs in a row the device is reopened with backoff, the buffered
+frames stay readable meanwhile and the camera is marked degraded (see Degraded_Since)
+
+Index: The camera index
+Focus: Optional focus value applied when the device opens
+Backend: One of Camera_Backends
+Source: Video file or frame folder of the replay backends
+Profile: Optional capture profile, see Apply_Profile, "Preview" is the (Width, Height) of the preview frames
+"""
+class Camera_Service:
+    def __init__(self, Index, Focus=None, Size=Ring_Size, Backend="dshow", Source="", Profile=None):
+        self.Index = Index
+        self.Backend = Backend
+        self.Source = Source
+        self.Profile = Profile or dict()
+        self.Buffer = deque(maxlen=Size)
+        self.Slots = [None] * (Size + 1)
+        self.Sequence = 0
+        self.Condition = threading.Condition()
+        self.Pending = deque()
+        self.Demand = 0
+        self.Preview_Wanted = False
+        self.Preview_Slots = [None, None]
+        self.Preview_Entry = None
+        self.Properties = dict()
+        self.Counters = {"Grabbed": 0, "Decoded": 0, "Failed": 0, "Dropped": 0, "Reconnects": 0}
+        self.Degraded_Until = 0.0
+        self.Frame_Period = None
+        self.Device_Size = None
+        self.Stopping = threading.Event()
+        self.Opened = threading.Event()
+        self.Available = False
+        self.Running = False
+        self.Thread = None
+
+        if Focus is not None:
+            self.Set(cv2.CAP_PROP_FOCUS, Focus)
+
+    """
+    Start The Owner Thread
+    -:> Returns True when the device opened
+
+    Timeout: Seconds to wait for the device to open
+    """
+    def Start(self, Timeout=Frame_Timeout):
+        if not self.Running:
+            self.Running = True
+            self.Opened.clear()
+            self.Stopping.clear()
+            self.Thread = threading.Thread(target=self._Grab_Loop, name=f"Camera_{self.Index}", daemon=True)
+            self.Thread.start()
+            logger.debug(f"Started Camera {self.Index} Service")
+
+        self.Opened.wait(Timeout)
+        return self.Available
+
+    # Stop The Owner Thread And Release The Device
+    def Stop(self):
+        self.Running = False
+        self.Stopping.set()
+        if (self.Thread is not None) and (self.Thread is not threading.current_thread()):
+            self.Thread.join(Frame_Timeout)
+        self.Thread = None
+        with self.Condition:
+            self.Buffer.clear()
+            self.Condition.notify_all()
+        logger.debug(f"Stopped Camera {self.Index} Service, Health {self.Health()}")
+
+    # Queue A Capture Property Change For The Owner Thread
+    def Set(self, Property, Value):
+        self.Pending.append((Property, Value))
+
+    # Open The Device With The Profile And The Properties Set So Far
+    def _Open(self):
+        with _Device_Lock(self.Index):
+            cap = Open_Capture(self.Backend, self.Index, self.Source)
+            if cap.isOpened():
+                Apply_Profile(cap, self.Profile)
+                for Property, Value in self.Properties.items():
+                    cap.set(Property, Value)
+
+        Fps = cap.get(cv2.CAP_PROP_FPS) if cap.isOpened() else 0
+        self.Frame_Period = 1 / Fps if Fps and Fps > 0 else None
+        Size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))) if cap.isOpened() else (0, 0)
+        self.Device_Size = Size if min(Size) > 0 else None
+        return cap
+
+    # Keep The Camera Degraded For At Least Seconds From Now
+    def _Degrade(self, Seconds=Degraded_Hold):
+        self.Degraded_Until = max(self.Degraded_Until, time.monotonic() + Seconds)
+
+    """
+    Reconnect
+    -> Releases the device and reopens it with backoff until it opens or the service stops
+    -:> Returns the reopened capture, or None when the service stopped first
+
+    cap: The failing capture
+    """
+    def _Reconnect(self, cap):
+        cap.release()
+        Attempt = 0
+        while self.Running:
+            Delay = Reconnect_Backoff[min(Attempt, len(Reconnect_Backoff) - 1)]
+            Attempt += 1
+            logger.warning(f"Camera {self.Index} Not Delivering Frames, Reconnect Attempt {Attempt} In {Delay} s")
+            self._Degrade(Delay + Degraded_Hold)
+            if self.Stopping.wait(Delay):
+                return None
+
+            try:
+                cap = self._Open()
+            except Exception as e:
+                logger.exception(f"Camera {self.Index} Reopen Error {str(e)}")
+                continue
+
+            if cap.isOpened():
+                self.Counters["Reconnects"] += 1
+                self._Degrade()
+                logger.info(f"Camera {self.Index} Reconnected After {Attempt} Attempts")
+                return cap
+            cap.release()
+        return None
+
+    # Owner Thread, The Only Place The Device Is Touched
+    def _Grab_Loop(self):
+        try:
+            cap = self._Open()
+            self.Available = cap.isOpened()
+        except Exception as e:
+            logger.exception(f"Camera {self.Index} Open Error {str(e)}")
+            self.Available = False
+            self.Running = False
+            self.Opened.set()
+            return
+        self.Opened.set()
+
+        Failures = 0
+        Last_Grab = None
+        try:
+            while self.Running and self.Available:
+                while self.Pending:
+                    Property, Value = self.Pending.popleft()
+                    self.Properties[Property] = Value
+                    cap.set(Property, Value)
+
+                # Every Frame Is Grabbed, Only Requested Ones Are Decoded
+                Timestamp = time.monotonic()
+                if not cap.grab():
+                    self.Counters["Failed"] += 1
+                    self._Degrade()
+                    Failures += 1
+                    Last_Grab = None
+                    if Failures >= Reconnect_After:
+                        cap = self._Reconnect(cap)
+                        Failures = 0
+                        if cap is None:
+                            break
+                    else:
+                        time.sleep(Retry_Delay)
+                    continue
+
+                # Frames The Device Skipped Show Up As A Long Interval Between Grabbed Frames
+                Failures = 0
+                Grabbed_At = time.monotonic()
+                self.Counters["Grabbed"] += 1
+                if (Last_Grab is not None) and (self.Frame_Period is not None) and (Grabbed_At - Last_Grab > Drop_Factor * self.Frame_Period):
+                    self.Counters["Dropped"] += int(round((Grabbed_At - Last_Grab) / self.Frame_Period)) - 1
+                    self._Degrade()
+                Last_Grab = Grabbed_At
+
+                if (self.Demand <= 0) and (not self.Preview_Wanted):
+                    continue
+
+                # Decode Into The Next Slot, A Size Change Reallocates It Once
+                Slot = (self.Sequence + 1) % len(self.Slots)
+                ret, frame = cap.retrieve(self.Slots[Slot])
+                if not ret:
+                    self.Counters["Failed"] += 1
+                    self._Degrade()
+                    continue
+                self.Slots[Slot] = frame
+                self.Counters["Decoded"] += 1
+
+                with self.Condition:
+                    self.Sequence += 1
+                    self.Demand = max(self.Demand - 1, 0)
+                    self.Buffer.append((self.Sequence, Timestamp, frame))
+                    self.Condition.notify_all()
+
+                if self.Preview_Wanted:
+                    self.Preview_Wanted = False
+                    self._Update_Preview(self.Sequence, Timestamp, frame)
+
+        except Exception as e:
+            logger.exception(f"Camera {self.Index} Grab Error {str(e)}")
+
+        finally:
+            if cap is not None:
+                cap.release()
+            self.Available = False
+            self.Running = False
+
+    # Frame Size Delivered, From The Newest Frame, The Device Or The Profile, None While Unknown
+    def Frame_Size(self):
+        Entry = self.Latest()
+        if Entry is not None:
+            return (Entry[2].shape[1], Entry[2].shape[0])
+        return self.Device_Size or self.Profile.get("Size")
+
+    # Counters And State Of The Camera, For Monitoring
+    def Health(self):
+        return dict(self.Counters, Degraded=self.Degraded_Since(time.monotonic()), Available=self.Available)
+
+    """
+    Degraded Since
+    -:> Returns True when the camera failed, dropped frames or reconnected within Degraded_Hold
+    seconds before the given time or at any point after it, samples captured after that time
+    are marked degraded
+
+    Time: time.monotonic() value, e.g. the render time of the captured pattern
+    """
+    def Degraded_Since(self, Time):
+        return self.Degraded_Until > Time
+
+    # Downscaled Preview Entry, Written Into The Preview Slot The Windows Are Not Showing
+    def _Update_Preview(self, Sequence, Timestamp, frame):
+        Size = self.Profile.get("Preview")
+        if not Size:
+            return
+        Slot = Sequence % 2
+        Buffer = self.Preview_Slots[Slot]
+        if (Buffer is None) or (Buffer.shape != (Size[1], Size[0]) + frame.shape[2:]):
+            Buffer = self.Preview_Slots[Slot] = np.empty((Size[1], Size[0]) + frame.shape[2:], frame.dtype)
+        cv2.resize(frame, Size, dst=Buffer, interpolation=cv2.INTER_LINEAR)
+        self.Preview_Entry = (Sequence, Timestamp, Buffer)
+
+    # Ask For The Next Count Grabbed Frames To Be Decoded
+    def Request(self, Count=1):
+        with self.Condition:
+            self.Demand = max(self.Demand, Count)
+
+    # Ask For The Next Grabbed Frame To Be Decoded For The Live Previews
+    def Request_Preview(self):
+        self.Preview_Wanted = True
+
+    # Newest Buffer Entry, None While The Buffer Is Empty
+    def Latest(self):
+        with self.Condition:
+            return self.Buffer[-1] if self.Buffer else None
+
+    # Newest Preview Entry, The Downscaled One When The Profile Has A Preview Size
+    def Latest_Preview(self):
+        if self.Profile.get("Preview") and (self.Preview_Entry is not None):
+            return self.Preview_Entry
+        return self.Latest()
+
+    # Up To Count Newest Buffer Entries, Oldest First, The Frames Are Shared Slots
+    def Frames(self, Count):
+        with self.Condition:
+            return list(self.Buffer)[-Count:]
+
+    """
+    Wait For A Frame
+    -> Requests a decode when no buffered frame is new enough
+    -:> Returns the first buffer entry whose grab started after the given time, or None on timeout
+
+    After: time.monotonic() value the frame must be newer than, None waits for any frame
+    Timeout: Seconds to wait
+    """
+    def Wait_For_Frame(self, After=None, Timeout=Frame_Timeout):
+        Deadline = time.monotonic() + Timeout
+        with self.Condition:
+            while True:
+                for Entry in self.Buffer:
+                    if (After is None) or (Entry[1] > After):
+                        return Entry
+                self.Demand = max(self.Demand, 1)
+
+                Remaining = Deadline - time.monotonic()
+                if (Remaining <= 0) or (not self.Running):
+                    return None
+                self.Condition.wait(Remaining)
+
+    """
+    Capture Frames
+    -> Consecutive frames for a multi-frame capture, the first Count frames decoded after a time
+    -> Requests and waits for the missing frames, so the cost is Count frame periods, Count is
+    capped at the ring size
+    -:> Returns the buffer entries oldest first with copies of their frames, taken while the
+    owner thread cannot append, so no slot is refilled mid copy, or None when they did not
+    arrive in time
+
+    Count: Number of frames
+    After: time.monotonic() value the frames must be newer than, None means now
+    Timeout: Seconds to wait on top of the time the frames take to arrive
+    """
+    def Capture_Frames(self, Count, After=None, Timeout=Frame_Timeout):
+        Count = max(1, min(int(Count), self.Buffer.maxlen))
+        After = time.monotonic() if After is None else After
+        Deadline = time.monotonic() + Timeout
+        with self.Condition:
+            while True:
+                Entries = [Entry for Entry in self.Buffer if Entry[1] > After]
+                if len(Entries) >= Count:
+                    return [(Sequence, Timestamp, Frame.copy()) for Sequence, Timestamp, Frame in Entries[:Count]]
+                self.Demand = max(self.Demand, Count - len(Entries))
+
+                Remaining = Deadline - time.monotonic()
+                if (Remaining <= 0) or (not self.Running):
+                    return None
+                self.Condition.wait(Remaining)
+
+    """
+    Capture
+    -> Frame for a capture trigger, the first one whose grab started after the call
+    -:> Returns (True, copy of the frame), or (False, None) when no frame arrived in time
+    """
+    def Capture(self, Timeout=Frame_Timeout):
+        Entries = self.Capture_Frames(1, time.monotonic(), Timeout)
+        if Entries is None:
+            return False, None
+        return True, Entries[0][2]
+
+    """
+    Read
+    -> Same shape as cv2.VideoCapture.read(), decodes the next grabbed frame
+    -:> Returns (True, the frame), or (False, None) when no frame arrived in time, the frame
+    is a shared slot for immediate display, the newest decoded frame is returned when the
+    camera stopped delivering
+    -> Callers keeping the frame past display (scoring, saving, holding it) copy it or use Capture
+    """
+    def read(self):
+        Entry = self.Wait_For_Frame(time.monotonic()) or self.Latest()
+        if Entry is None:
+            return False, None
+        return True, Entry[2]
+
+
+############################
+# Temporal Denoising
+############################
+
+"""
+Temporal Denoise
+-> Combines several frames of a static scene into one, averaging out sensor noise and flicker
+-> Only the union of the boxes is combined, vectorized over the frame stack, the rest of the
+returned frame is the newest frame
+-:> Returns a new frame, the input frames are not modified
+
+Frames: Equally sized frames, oldest first
+Boxes: List of (Xmin, Ymin, Xmax, Ymax) boxes to combine, None combines the whole frame
+Method: "median" or "mean"
+Margin: Pixels added around the union of the boxes
+"""
+def Temporal_Denoise(Frames, Boxes=None, Method="median", Margin=0):
+    if Method not in Denoise_Methods:
+        raise ValueError(f"Unknown Denoise Method {Method}, Expected One Of {Denoise_Methods}")
+
+    Output = Frames[-1].copy()
+    if len(Frames) == 1:
+        return Output
+
+    # Union Of The Boxes, Clipped To The Frame
+    Height, Width = Output.shape[:2]
+    if Boxes:
+        Xmin = max(min(Box[0] for Box in Boxes) - Margin, 0)
+        Ymin = max(min(Box[1] for Box in Boxes) - Margin, 0)
+        Xmax = min(max(Box[2] for Box in Boxes) + Margin, Width)
+        Ymax = min(max(Box[3] for Box in Boxes) + Margin, Height)
+    else:
+        Xmin, Ymin, Xmax, Ymax = 0, 0, Width, Height
+
+    Stack = np.stack([Frame[Ymin:Ymax, Xmin:Xmax] for Frame in Frames])
+    if Method == "median":
+        Combined = np.median(Stack, axis=0)
+    else:
+        Combined = Stack.mean(axis=0, dtype=np.float32)
+
+    Output[Ymin:Ymax, Xmin:Xmax] = np.rint(Combined)
+    return Output
+
+
+############################
+# Preview Buffers
+############################
+
+# Live Preview Rate When othsetctrl Has None
+Preview_Fps = 15
+
+# Live Preview Rate While A Scoring Cycle Is In Progress
+Busy_Preview_Fps = 2
+
+# Live Frames Are Only Looked At, A Bilinear Resize Is Enough
+Preview_Interpolation = cv2.INTER_LINEAR
+
+
+"""
+Display Bytes
+-> Uncompressed PPM (PGM for grayscale) bytes of an image, Tk reads them without inflating
+and the encode is a copy, where PNG spends tens of milliseconds per 1080p frame on deflate
+-:> Returns the bytes, usable wherever PySimpleGUI takes image data
+
+image: 8 bit BGR or grayscale image, other types are clipped to 8 bit
+"""
+def Display_Bytes(image):
+    if image.dtype != np.uint8:
+        image = np.clip(image, 0, 255).astype(np.uint8)
+    return cv2.imencode('.ppm' if image.ndim == 3 else '.pgm', image)[1].tobytes()
+
+
+"""
+Show Image
+-> Shows an image on a PySimpleGUI Image element through one PhotoImage kept per element,
+the new pixels are loaded into it in place instead of building a new PhotoImage each time
+-> A new PhotoImage is made only when the image size changes or the element was given another
+image through update
+
+element: The sg.Image element, e.g. window["Pattern_Display"]
+image: 8 bit BGR or grayscale image at display size
+Data: Optional Display_Bytes of the image, e.g. cached ones, encoded here when None
+"""
+def Show_Image(element, image, Data=None):
+    # Tk Is Only Imported By The Display Path, Headless Users Of The Capture Code Never Load It
+    import tkinter as tk
+
+    if Data is None:
+        Data = Display_Bytes(image)
+    Photo = getattr(element, "Reused_Photo", None)
+    if (Photo is None) or (Photo.width(), Photo.height()) != (image.shape[1], image.shape[0]):
+        Photo = tk.PhotoImage(master=element.Widget, data=Data)
+        element.Reused_Photo = Photo
+    else:
+        Photo.configure(data=Data)
+
+    if str(element.Widget.cget("image")) != str(Photo):
+        element.Widget.configure(image=Photo, width=image.shape[1], height=image.shape[0])
+        element.Widget.image = Photo
+
+
+"""
+Draw Boxes
+-> Draws bboxes given in source image coordinates on an image scaled from that source, the
+corners, line width and labels are mapped by the scale so a display sized image shows the
+boxes where they are on the full frame
+-:> Returns the image, drawn on in place
+
+image: The image drawn on
+Boxes: List of (Xmin, Ymin, Xmax, Ymax) in source coordinates
+Scale: (X, Y) scale from the source to the image, (1, 1) for the source itself
+Color: Bbox color
+Line_Width: Bbox line width at source scale
+Labels: Optional list of texts drawn in the top left corner of each box
+"""
+def Draw_Boxes(image, Boxes, Scale, Color, Line_Width, Labels=None):
+    Scale_X, Scale_Y = Scale
+    Line_Scale = min(Scale_X, Scale_Y)
+    Width = max(1, int(round(Line_Width * Line_Scale)))
+    for Number, (Xmin, Ymin, Xmax, Ymax) in enumerate(Boxes):
+        Start_Point = (int(round(Xmin * Scale_X)), int(round(Ymin * Scale_Y)))
+        cv2.rectangle(image, Start_Point, (int(round(Xmax * Scale_X)), int(round(Ymax * Scale_Y))), Color, Width)
+        if Labels is not None:
+            Label_Point = (Start_Point[0] + int(round(5 * Line_Scale)), Start_Point[1] + int(round(25 * Line_Scale)))
+            cv2.putText(image, f"{Labels[Number]}", Label_Point, cv2.FONT_HERSHEY_SIMPLEX, 0.9 * Line_Scale, Color, Width)
+    return image
+
+
+"""
+Preview Buffers
+-> Preallocated overlay and display buffers of one preview, reused on every update
+-> Overlay copies a frame into the overlay buffer with np.copyto, bboxes are drawn on it
+without allocating a new frame
+-> Resize writes into the display buffer through the dst argument of cv2.resize
+-> Show_Boxes draws bboxes on the display buffer after the resize, so an overlay costs no
+full resolution copy of the frame
+-> Show_Latest skips camera frames that were already shown, so only a new frame costs a
+resize and a PPM copy into the reused PhotoImage of the element (see Show_Image)
+-> Hold keeps the shown frame in a held buffer for windows that draw on or test the last
+shown frame later, the camera slot it came from is refilled a few grabs on
+-> Show_Latest is capped at Fps, and at Busy_Preview_Fps while scoring is busy, so the
+window loop ticks stay cheap between updates
+-> Live frames use the cheap preview resize, captured frames shown through Show keep the
+area resize
+
+Width: Display width
+Height: Display height
+Fps: Live preview rate cap
+"""
+class Preview_Buffers:
+    def __init__(self, Width, Height, Fps=Preview_Fps):
+        self.Size = (Width, Height)
+        self.Fps = Fps
+        self.Overlay_Buffer = None
+        self.Display_Buffer = None
+        self.Held_Buffer = None
+        self.Last_Shown = None
+        self.Last_Update = 0.0
+
+    # Buffer Matching A Frame, Reallocated Only When The Frame Shape Changes
+    @staticmethod
+    def _Matching(Buffer, Shape, Dtype):
+        if (Buffer is None) or (Buffer.shape != Shape) or (Buffer.dtype != Dtype):
+            return np.empty(Shape, Dtype)
+        return Buffer
+
+    # Copy Of A Frame In The Overlay Buffer, Safe To Draw On Until The Next Call
+    def Overlay(self, frame):
+        self.Overlay_Buffer = self._Matching(self.Overlay_Buffer, frame.shape, frame.dtype)
+        np.copyto(self.Overlay_Buffer, frame)
+        return self.Overlay_Buffer
+
+    # Copy Of A Frame In The Held Buffer, Stable Until The Next Call
+    def Hold(self, frame):
+        self.Held_Buffer = self._Matching(self.Held_Buffer, frame.shape, frame.dtype)
+        np.copyto(self.Held_Buffer, frame)
+        return self.Held_Buffer
+
+    # Frame Resized Into The Display Buffer
+    def Resize(self, frame, Interpolation=cv2.INTER_AREA):
+        self.Display_Buffer = self._Matching(self.Display_Buffer, (self.Size[1], self.Size[0]) + frame.shape[2:], frame.dtype)
+        cv2.resize(frame, self.Size, dst=self.Display_Buffer, interpolation=Interpolation)
+        return self.Display_Buffer
+
+    # Display Bytes Of The Frame At Display Size
+    def Encode(self, frame, Interpolation=cv2.INTER_AREA):
+        return Display_Bytes(self.Resize(frame, Interpolation))
+
+    # Frame Shown At Display Size On An Image Element
+    def Show(self, element, frame, Interpolation=cv2.INTER_AREA):
+        Show_Image(element, self.Resize(frame, Interpolation))
+
+    """
+    Show Boxes
+    -> Shows a frame at display size with bboxes drawn on the display buffer, see Draw_Boxes
+
+    element: The sg.Image element
+    frame: Full size frame, it is not drawn on
+    Boxes: List of (Xmin, Ymin, Xmax, Ymax) in frame coordinates
+    Color: Bbox color
+    Line_Width: Bbox line width at frame scale
+    Labels: Optional list of texts drawn in each box
+    """
+    def Show_Boxes(self, element, frame, Boxes, Color, Line_Width, Labels=None, Interpolation=cv2.INTER_AREA):
+        Display = self.Resize(frame, Interpolation)
+        Draw_Boxes(Display, Boxes, (self.Size[0] / frame.shape[1], self.Size[1] / frame.shape[0]), Color, Line_Width, Labels)
+        Show_Image(element, Display)
+
+    # A Live Update Is Due When The Rate Interval Has Passed
+    def Due(self, Busy=False):
+        Fps = min(self.Fps, Busy_Preview_Fps) if Busy else self.Fps
+        return (Fps <= 0) or (time.monotonic() - self.Last_Update >= 1 / Fps)
+
+    """
+    Show Latest
+    -> Shows the newest camera frame on a window image element, a frame already shown is skipped
+    and nothing is shown before the next update is due
+    -:> Returns the shown frame, or None when there was no new frame, the frame is a shared
+    slot unless Hold is set
+
+    window: The window holding the image element
+    key: Key of the image element
+    camera: The Camera_Service to preview
+    Hold: Return the frame in the held buffer instead of the shared slot
+    Busy: A scoring cycle is in progress, the busy rate applies
+    """
+    def Show_Latest(self, window, key, camera, Hold=False, Busy=False):
+        if not self.Due(Busy):
+            return None
+
+        # Decode Is Requested For The Next Update, The Newest Decoded Frame Is Shown Now
+        camera.Request_Preview()
+        Entry = camera.Latest() if Hold else camera.Latest_Preview()
+        if (Entry is None) or (self.Last_Shown == (camera, Entry[0])):
+            return None
+
+        self.Last_Shown = (camera, Entry[0])
+        self.Last_Update = time.monotonic()
+        self.Show(window[key], Entry[2], Preview_Interpolation)
+        return self.Hold(Entry[2]) if Hold else Entry[2]
+
+
+############################
+# Camera Registry
+############################
+
+# Running Services By Camera Index
+_Cameras = dict()
+_Cameras_Lock = threading.Lock()
+
+# Backend And Replay Source Used By New Services
+_Backend = {"Backend": "dshow", "Source": ""}
+
+# Capture Profiles By Camera Index, Applied When A Service Opens Its Device
+_Profiles = dict()
+
+
+# Backend And Source Used By New Services
+def Current_Backend():
+    return _Backend["Backend"], _Backend["Source"]
+
+
+"""
+Set Backend
+-> Selects the capture backend of every camera, running cameras are stopped when it changes
+so the next Get_Camera opens the new source
+
+Backend: One of Camera_Backends
+Source: Video file or frame folder of the replay backends
+"""
+def Set_Backend(Backend, Source=""):
+    if Backend not in Camera_Backends:
+        raise ValueError(f"Unknown Camera Backend {Backend}, Expected One Of {Camera_Backends}")
+
+    if (_Backend["Backend"], _Backend["Source"]) != (Backend, Source):
+        _Backend["Backend"], _Backend["Source"] = Backend, Source
+        Stop_All()
+        logger.info(f"Camera Backend Set To {Backend} {Source}".strip())
+
+
+"""
+Set Profiles
+-> Selects the capture profile of every camera, running cameras whose profile changed are
+stopped so the next Get_Camera opens them in the new mode
+
+Profiles: Dict of camera index -> profile, see Apply_Profile
+"""
+def Set_Profiles(Profiles):
+    Changed = [Index for Index in set(_Profiles) | set(Profiles) if _Profiles.get(Index) != Profiles.get(Index)]
+    _Profiles.clear()
+    _Profiles.update(Profiles)
+    for Index in Changed:
+        Release_Camera(Index)
+    if Changed != []:
+        logger.info(f"Camera Profiles Set To {Profiles}")
+
+
+"""
+Get Camera
+-> Shared service of a camera, started on first use and kept running across windows
+-:> Returns the Camera_Service, its Available flag tells if the device opened
+
+Index: The camera index
+Focus: Optional focus value applied when the service starts, later changes go through Set
+"""
+def Get_Camera(Index, Focus=None):
+    with _Cameras_Lock:
+        Camera = _Cameras.get(Index)
+        if (Camera is None) or (not Camera.Running):
+            Camera = Camera_Service(Index, Focus, Backend=_Backend["Backend"], Source=_Backend["Source"], Profile=_Profiles.get(Index))
+            _Cameras[Index] = Camera
+
+    Camera.Start()
+    return Camera
+
+
+# True While The Service Of A Camera Is Grabbing
+def Is_Running(Index):
+    with _Cameras_Lock:
+        Camera = _Cameras.get(Index)
+    return (Camera is not None) and Camera.Running and Camera.Available
+
+
+# Stop And Forget One Camera
+def Release_Camera(Index):
+    with _Cameras_Lock:
+        Camera = _Cameras.pop(Index, None)
+    if Camera is not None:
+        Camera.Stop()
+
+
+# Health Of Every Running Camera By Index, For Monitoring
+def Health_Report():
+    with _Cameras_Lock:
+        Cameras = dict(_Cameras)
+    return {Index: Camera.Health() for Index, Camera in Cameras.items()}
+
+
+# Stop Every Camera, Also Run At Interpreter Exit
+def Stop_All():
+    with _Cameras_Lock:
+        Cameras = list(_Cameras.values())
+        _Cameras.clear()
+    for Camera in Cameras:
+        Camera.Stop()
+
+
+atexit.register(Stop_All)
+
+
+############################
+# Camera Discovery
+############################
+
+# Camera Indices Probed By Discovery, One Per camctrl Camera Column
+Discovery_Indices = (0, 1, 2)
+
+# Resolutions Requested While Probing, The Ones The Device Actually Delivers Are Kept
+Probe_Resolutions = ((640, 480), (1280, 720), (1920, 1080), (2560, 1440), (3840, 2160))
+
+
+# Running Service Of A Camera, None When It Has None
+def _Running_Camera(Index):
+    with _Cameras_Lock:
+        Camera = _Cameras.get(Index)
+    return Camera if (Camera is not None) and Camera.Running else None
+
+
+"""
+Probe Camera
+-> Opens one index with the selected backend and records the resolutions it delivers,
+the caller holds the device lock of the index
+-:> Returns a list of [Width, Height], empty when the device did not open
+"""
+def _Probe_Camera(Index):
+    Resolutions = list()
+    try:
+        cap = Open_Capture(_Backend["Backend"], Index, _Backend["Source"])
+        if cap.isOpened():
+            for Width, Height in Probe_Resolutions:
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, Width)
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, Height)
+                ret, frame = cap.read()
+                if ret and ([frame.shape[1], frame.shape[0]] not in Resolutions):
+                    Resolutions.append([frame.shape[1], frame.shape[0]])
+        cap.release()
+
+    except Exception as e:
+        logger.debug(f"Camera {Index} Probe Error {str(e)}")
+        Resolutions = list()
+    return Resolutions
+
+
+"""
+Discover Cameras
+-> Opens every index once with the selected backend and records the resolutions it delivers
+-> Cameras already running in a service are not reopened, they are present when their device
+opened and their current frame size is reported when known
+-> Each index is probed under its own device lock, a service starting on another index
+does not wait for the probe
+-> Slow with real devices, run it on a background thread and cache the result
+
+-:> Returns a dict of available index -> list of [Width, Height], missing indices are left out
+
+Indices: Camera indices to probe
+"""
+def Discover_Cameras(Indices=Discovery_Indices):
+    Cameras = dict()
+    for Index in Indices:
+        Camera = _Running_Camera(Index)
+        if Camera is None:
+            with _Device_Lock(Index):
+                # A Service May Have Started While Waiting For The Lock
+                Camera = _Running_Camera(Index)
+                if Camera is None:
+                    Resolutions = _Probe_Camera(Index)
+                    if Resolutions != []:
+                        Cameras[Index] = Resolutions
+                    logger.debug(f"Camera {Index} Resolutions {Resolutions}")
+                    continue
+
+        # Running Services Are Reported From Their Open State
+        Camera.Opened.wait(Frame_Timeout)
+        if Camera.Available:
+            Size = Camera.Frame_Size()
+            Cameras[Index] = [list(Size)] if Size else list()
+        logger.debug(f"Camera {Index} Running, Available {Camera.Available}")
+
+    return Cameras
@@ -0,0 +1,280 @@
+# Pattern Cache Imports
+from collections import OrderedDict
+import threading
+import logging
+import cv2
+import os
+
+import camera_service
+
+logger = logging.getLogger(__name__)
+
+
+############################
+# Pattern Image Cache
+############################
+
+# Memory Held By The Shared Cache, A 4K Pattern Is About 24 MiB Decoded
+Cache_Budget_Bytes = 256 * 1024 * 1024
+
+
+"""
+Pattern Cache
+-> Byte budgeted LRU cache of decoded pattern images, their display size renditions, the
+encoded display bytes of those renditions and bbox crops, shared by every window so showing a
+pattern again costs no disk read, decode, resize, crop or encode
+-> Entries are keyed by (path, modified time, file size) plus the rendition, a pattern
+replaced on disk therefore never matches an old entry
+-> Cached images are read only and shared, copy before drawing on them
+-> Least recently used entries are dropped once the budget is exceeded, an image larger than
+the whole budget is returned without being kept
+-> Safe to use from several threads, files are decoded outside the lock
+
+Budget_Bytes: Memory the cached images may hold
+"""
+class Pattern_Cache:
+    def __init__(self, Budget_Bytes=Cache_Budget_Bytes):
+        self.Budget_Bytes = Budget_Bytes
+        self.Entries = OrderedDict()
+        self.Bytes = 0
+        self.Hits = 0
+        self.Misses = 0
+        self.Lock = threading.Lock()
+
+    # Cached Image Of A Key, None On A Miss
+    def _Lookup(self, Key):
+        with self.Lock:
+            Image = self.Entries.get(Key)
+            if Image is None:
+                self.Misses += 1
+                return None
+            self.Entries.move_to_end(Key)
+            self.Hits += 1
+            return Image
+
+    # Keep An Image (Or Display Bytes) And Drop The Least Recently Used Ones Over Budget
+    def _Store(self, Key, Image):
+        if not isinstance(Image, bytes):
+            Image.flags.writeable = False
+        if _Entry_Bytes(Image) > self.Budget_Bytes:
+            return Image
+
+        with self.Lock:
+            if Key in self.Entries:
+                return self.Entries[Key]
+            self.Entries[Key] = Image
+            self.Bytes += _Entry_Bytes(Image)
+            while self.Bytes > self.Budget_Bytes:
+                _, Dropped = self.Entries.popitem(last=False)
+                self.Bytes -= _Entry_Bytes(Dropped)
+        return Image
+
+    # Cache Key Of A Pattern File Plus A Rendition, None When The File Is Missing
+    def _Key(self, Pattern_File_Path, *Rendition):
+        try:
+            File_Stat = os.stat(Pattern_File_Path)
+        except OSError:
+            return None
+        return (Pattern_File_Path, File_Stat.st_mtime_ns, File_Stat.st_size) + Rendition
+
+    """
+    Load
+    -> Decoded pattern, resized to the display size when one is given
+    -:> Returns the cached read only image, or None when the file can not be read
+
+    Pattern_File_Path: Path to the pattern image
+    Size: Optional (Width, Height) display size
+    Interpolation: Resize interpolation of the display rendition
+    """
+    def Load(self, Pattern_File_Path, Size=None, Interpolation=cv2.INTER_AREA):
+        Key = self._Key(Pattern_File_Path, *((tuple(Size), Interpolation) if Size is not None else (None, None)))
+        if Key is None:
+            return None
+        Image = self._Lookup(Key)
+        if Image is not None:
+            return Image
+
+        # Display Renditions Are Made From The Cached Full Size Image
+        if Size is not None:
+            Full_Image = self.Load(Pattern_File_Path)
+            if Full_Image is None:
+                return None
+            return self._Store(Key, cv2.resize(Full_Image, tuple(Size), interpolation=Interpolation))
+
+        Image = cv2.imread(Pattern_File_Path)
+        if Image is None:
+            logger.warning(f"Unable To Read Pattern {Pattern_File_Path}")
+            return None
+        return self._Store(Key, Image)
+
+    """
+    Load Crop
+    -> Bbox crop of the full size pattern, as saved next to every sample
+    -:> Returns the cached read only crop, or None when the file can not be read
+
+    Pattern_File_Path: Path to the pattern image
+    Box: (Xmin, Ymin, Xmax, Ymax) of the crop
+    """
+    def Load_Crop(self, Pattern_File_Path, Box):
+        Key = self._Key(Pattern_File_Path, "Crop", tuple(Box))
+        if Key is None:
+            return None
+        Crop = self._Lookup(Key)
+        if Crop is not None:
+            return Crop
+
+        Full_Image = self.Load(Pattern_File_Path)
+        if Full_Image is None:
+            return None
+        Xmin, Ymin, Xmax, Ymax = Box
+        return self._Store(Key, Full_Image[Ymin:Ymax, Xmin:Xmax].copy())
+
+    """
+    Load Display Bytes
+    -> Encoded display bytes (camera_service.Display_Bytes) of the display size rendition
+    -:> Returns the cached bytes for camera_service.Show_Image, or None when the file can not be read
+
+    Pattern_File_Path: Path to the pattern image
+    Size: (Width, Height) display size
+    Interpolation: Resize interpolation of the display rendition
+    """
+    def Load_Display_Bytes(self, Pattern_File_Path, Size, Interpolation=cv2.INTER_AREA):
+        Key = self._Key(Pattern_File_Path, "Bytes", tuple(Size), Interpolation)
+        if Key is None:
+            return None
+        Data = self._Lookup(Key)
+        if Data is not None:
+            return Data
+
+        Image = self.Load(Pattern_File_Path, Size, Interpolation)
+        if Image is None:
+            return None
+        return self._Store(Key, camera_service.Display_Bytes(Image))
+
+    # Drop Every Entry
+    def Clear(self):
+        with self.Lock:
+            self.Entries.clear()
+            self.Bytes = 0
+
+    # Counters For Monitoring
+    def Stats(self):
+        with self.Lock:
+            return {"Entries": len(self.Entries), "Bytes": self.Bytes, "Hits": self.Hits, "Misses": self.Misses}
+
+
+# Memory Held By A Cache Entry
+def _Entry_Bytes(Entry):
+    return len(Entry) if isinstance(Entry, bytes) else Entry.nbytes
+
+
+# Cache Shared By Every Window
+Shared_Cache = Pattern_Cache()
+
+
+"""
+Load Pattern
+-> Decoded pattern from the shared cache, see Pattern_Cache.Load
+-:> Returns the read only image, or None when the file can not be read
+"""
+def Load_Pattern(Pattern_File_Path, Size=None, Interpolation=cv2.INTER_AREA):
+    return Shared_Cache.Load(Pattern_File_Path, Size, Interpolation)
+
+
+"""
+Load Pattern Crop
+-> Bbox crop from the shared cache, see Pattern_Cache.Load_Crop
+-:> Returns the read only crop, or None when the file can not be read
+"""
+def Load_Pattern_Crop(Pattern_File_Path, Box):
+    return Shared_Cache.Load_Crop(Pattern_File_Path, Box)
+
+
+"""
+Show Pattern
+-> Shows the display size rendition of a pattern from the shared cache, the decode, resize and
+encode are skipped when it was shown or prefetched before
+-:> Returns the read only display image, or None when the file can not be read
+
+element: The sg.Image element, e.g. window["Pattern_Display"]
+Pattern_File_Path: Path to the pattern image
+Size: (Width, Height) display size
+"""
+def Show_Pattern(element, Pattern_File_Path, Size):
+    Image = Shared_Cache.Load(Pattern_File_Path, Size)
+    if Image is None:
+        return None
+    camera_service.Show_Image(element, Image, Shared_Cache.Load_Display_Bytes(Pattern_File_Path, Size))
+    return Image
+
+
+############################
+# Pattern Prefetch
+############################
+
+# Patterns Loaded Ahead Of The Current One In A Run
+Prefetch_Depth = 2
+
+
+"""
+Pattern Prefetcher
+-> Loads upcoming patterns into the cache on a background thread, so switching to the next
+pattern of a run finds it decoded, scaled, cropped and encoded and only swaps the data shown
+-> Display size requests also encode the display bytes, requests with a box also crop it
+-> A new request replaces the queued ones, patterns the run has moved past are not loaded
+-> The thread is started on first use and sleeps while nothing is queued
+
+Cache: The Pattern_Cache the patterns are loaded into
+"""
+class Pattern_Prefetcher:
+    def __init__(self, Cache=Shared_Cache):
+        self.Cache = Cache
+        self.Queue = list()
+        self.Condition = threading.Condition()
+        self.Thread = None
+
+    """
+    Prefetch
+    -> Queues patterns to load, in the order they will be shown
+
+    Requests: List of (Pattern_File_Path, Size) or (Pattern_File_Path, Size, Box), Size None
+    for the full size pattern, Box the (Xmin, Ymin, Xmax, Ymax) crop
+    """
+    def Prefetch(self, Requests):
+        with self.Condition:
+            self.Queue = list(Requests)
+            if (self.Thread is None) or (not self.Thread.is_alive()):
+                self.Thread = threading.Thread(target=self._Run, name="Pattern_Prefetch", daemon=True)
+                self.Thread.start()
+            self.Condition.notify()
+
+    # Prefetch Thread, Loads Queued Patterns One At A Time
+    def _Run(self):
+        while True:
+            with self.Condition:
+                while self.Queue == []:
+                    self.Condition.wait()
+                Pattern_File_Path, Size, *Box = self.Queue.pop(0)
+
+            try:
+                self.Cache.Load(Pattern_File_Path, Size)
+                if Size is not None:
+                    self.Cache.Load_Display_Bytes(Pattern_File_Path, Size)
+                if Box:
+                    self.Cache.Load_Crop(Pattern_File_Path, Box[0])
+            except Exception as e:
+                logger.warning(f"Prefetch Of {Pattern_File_Path} Failed: {e}")
+
+
+# Prefetcher Shared By Every Window
+Shared_Prefetcher = Pattern_Prefetcher()
+
+
+"""
+Prefetch Patterns
+-> Queues upcoming patterns on the shared prefetcher, see Pattern_Prefetcher.Prefetch
+
+Requests: See Pattern_Prefetcher.Prefetch
+"""
+def Prefetch_Patterns(Requests):
+    Shared_Prefetcher.Prefetch(Requests)
@@ -0,0 +1,276 @@
+# Statistics Imports
+import threading
+import atexit
+import json
+import math
+import time
+import os
+
+
+############################
+# Streaming Statistics
+############################
+
+# Histogram Range And Resolution Used For Percentiles
+Histogram_Low = -1.0
+Histogram_High = 1.0
+Histogram_Bins = 200
+
+# Weight Of The Newest Sample In The Exponentially Weighted Mean
+Ewma_Alpha = 0.2
+
+
+"""
+Run Statistics
+-> Streaming aggregate of SSIM scores, every update is O(1) and the state is a few numbers
+-> Mean and variance use Welford's update, so no score list is kept
+-> Percentiles are read from a fixed histogram over the SSIM range, accurate to one bin
+(0.01) which is enough for run summaries
+-> The state is saved as JSON and can be loaded to continue aggregating
+"""
+class Run_Statistics:
+    def __init__(self):
+        self.Count = 0
+        self.Mean = 0.0
+        self.M2 = 0.0
+        self.Min = None
+        self.Max = None
+        self.Ewma = None
+        self.Histogram = [0] * Histogram_Bins
+
+    # Add One Score
+    def Update(self, Value):
+        Value = float(Value)
+        self.Count += 1
+        Delta = Value - self.Mean
+        self.Mean += Delta / self.Count
+        self.M2 += Delta * (Value - self.Mean)
+
+        self.Min = Value if self.Min is None else min(self.Min, Value)
+        self.Max = Value if self.Max is None else max(self.Max, Value)
+        self.Ewma = Value if self.Ewma is None else Ewma_Alpha * Value + (1 - Ewma_Alpha) * self.Ewma
+
+        Bin = int((Value - Histogram_Low) / (Histogram_High - Histogram_Low) * Histogram_Bins)
+        self.Histogram[min(max(Bin, 0), Histogram_Bins - 1)] += 1
+
+    # Sample Variance
+    def Variance(self):
+        return self.M2 / (self.Count - 1) if self.Count > 1 else 0.0
+
+    # Sample Standard Deviation
+    def Std(self):
+        return math.sqrt(self.Variance())
+
+    """
+    Approximate Percentile
+    -:> Returns the score below which Percent of the samples lie, interpolated inside its bin
+
+    Percent: Percentile between 0 and 100
+    """
+    def Percentile(self, Percent):
+        if self.Count == 0:
+            return None
+
+        Target = Percent / 100 * self.Count
+        Bin_Width = (Histogram_High - Histogram_Low) / Histogram_Bins
+        Seen = 0
+        for Bin, Count in enumerate(self.Histogram):
+            if (Count > 0) and (Seen + Count >= Target):
+                Value = Histogram_Low + (Bin + (Target - Seen) / Count) * Bin_Width
+                return min(max(Value, self.Min), self.Max)
+            Seen += Count
+
+        return self.Max
+
+    # Values Shown In Summaries
+    def Summary(self):
+        return {
+            "Count": self.Count,
+            "Mean": self.Mean,
+            "Std": self.Std(),
+            "Min": self.Min,
+            "Max": self.Max,
+            "Ewma": self.Ewma,
+            "P05": self.Percentile(5),
+            "P50": self.Percentile(50),
+            "P95": self.Percentile(95)
+            }
+
+    # Persisted State, The Summary Is Included For Readers That Only Display It
+    def To_Dict(self):
+        return {
+            "State": {"Count": self.Count, "Mean": self.Mean, "M2": self.M2, "Min": self.Min, "Max": self.Max, "Ewma": self.Ewma, "Histogram": self.Histogram},
+            "Summary": self.Summary()
+            }
+
+    @classmethod
+    def From_Dict(cls, Data):
+        Statistics = cls()
+        State = Data["State"]
+        Statistics.Count, Statistics.Mean, Statistics.M2 = State["Count"], State["Mean"], State["M2"]
+        Statistics.Min, Statistics.Max, Statistics.Ewma = State["Min"], State["Max"], State["Ewma"]
+        if len(State["Histogram"]) == Histogram_Bins:
+            Statistics.Histogram = list(State["Histogram"])
+        return Statistics
+
+
+############################
+# Persistence
+############################
+
+# Write JSON Through A Temporary File So Readers Never See A Partial File
+def _Write_Json(File_Path, Data):
+    Temporary_Path = f"{File_Path}.tmp"
+    with open(Temporary_Path, "w") as File:
+        json.dump(Data, File, indent=1)
+    os.replace(Temporary_Path, File_Path)
+
+
+# Read A JSON Object, An Empty Dict When The File Is Missing Or Unreadable
+def _Read_Json(File_Path):
+    try:
+        with open(File_Path) as File:
+            Data = json.load(File)
+    except (OSError, ValueError):
+        return dict()
+    return Data if isinstance(Data, dict) else dict()
+
+
+# Run Summary File Inside The ANNOTATION Folder
+Summary_File_Name = "Summary.json"
+
+# Per Pattern Statistics File At The Results Folder Level
+Pattern_Statistics_File_Name = "Pattern_Statistics.json"
+
+# Pattern Statistics Are Written After This Many Updates Or Seconds, And At Run End
+Pattern_Flush_Updates = 50
+Pattern_Flush_Seconds = 10.0
+
+
+"""
+Save Run Summary
+-> Writes the run statistics to ANNOTATION/Summary.json
+
+Annotation_Folder_Path: The ANNOTATION folder of the run
+Statistics: The Run_Statistics of the run
+"""
+def Save_Run_Summary(Annotation_Folder_Path, Statistics):
+    os.makedirs(Annotation_Folder_Path, exist_ok=True)
+    _Write_Json(f"{Annotation_Folder_Path}/{Summary_File_Name}", Statistics.To_Dict())
+
+
+"""
+Load Run Summary
+-:> Returns the summary dict of a run (see Run_Statistics.Summary), or None when the run has none
+
+Annotation_Folder_Path: The ANNOTATION folder of the run
+"""
+def Load_Run_Summary(Annotation_Folder_Path):
+    try:
+        with open(f"{Annotation_Folder_Path}/{Summary_File_Name}") as File:
+            return json.load(File)["Summary"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+"""
+Pattern Statistics
+-> Run_Statistics of every pattern, kept across runs in one JSON file
+-> Shared by the scoring threads, an update is O(1) under the lock and only marks the pattern dirty
+-> The file is written every Pattern_Flush_Updates updates or Pattern_Flush_Seconds seconds,
+on Flush (run end) and at interpreter exit, only dirty patterns are serialized again and the
+file is written outside the update lock
+-> A flush re-reads the file and only replaces the dirty patterns, so patterns written by
+another instance are kept
+-> Sessions use Shared_Pattern_Statistics, one instance per results folder
+
+Results_Folder_Path: The results folder holding Pattern_Statistics.json
+"""
+class Pattern_Statistics:
+    def __init__(self, Results_Folder_Path):
+        self.File_Path = f"{Results_Folder_Path}/{Pattern_Statistics_File_Name}"
+        self.Patterns = dict()
+        self.Serialized = _Read_Json(self.File_Path)
+        self.Dirty = set()
+        self.Pending_Updates = 0
+        self.Last_Flush = time.monotonic()
+        self.Lock = threading.Lock()
+        self.File_Lock = threading.Lock()
+
+        for Name, Data in list(self.Serialized.items()):
+            try:
+                self.Patterns[Name] = Run_Statistics.From_Dict(Data)
+            except (ValueError, KeyError, TypeError):
+                self.Serialized.pop(Name)
+
+    # Add One Score Of A Pattern, The File Is Written When A Flush Is Due
+    def Update(self, Pattern_Name, Value):
+        with self.Lock:
+            self.Patterns.setdefault(Pattern_Name, Run_Statistics()).Update(Value)
+            self.Dirty.add(Pattern_Name)
+            self.Pending_Updates += 1
+            Due = (self.Pending_Updates >= Pattern_Flush_Updates) or (time.monotonic() - self.Last_Flush >= Pattern_Flush_Seconds)
+
+        if Due:
+            self.Flush()
+
+    # Write The Dirty Patterns To The File, Nothing Is Written When None Changed
+    def Flush(self):
+        with self.File_Lock:
+            with self.Lock:
+                if self.Dirty == set():
+                    return
+
+            # Patterns Written Since The Last Read Are Picked Up, Then Only Dirty Ones Replaced
+            On_Disk = _Read_Json(self.File_Path)
+            with self.Lock:
+                for Name, Data in On_Disk.items():
+                    if (Name not in self.Dirty) and (Data != self.Serialized.get(Name)):
+                        try:
+                            self.Patterns[Name] = Run_Statistics.From_Dict(Data)
+                            self.Serialized[Name] = Data
+                        except (ValueError, KeyError, TypeError):
+                            continue
+                for Name in self.Dirty:
+                    self.Serialized[Name] = self.Patterns[Name].To_Dict()
+                self.Dirty.clear()
+                self.Pending_Updates = 0
+                self.Last_Flush = time.monotonic()
+                Snapshot = dict(self.Serialized)
+            _Write_Json(self.File_Path, Snapshot)
+
+    # Summary Of One Pattern, None If It Was Never Scored
+    def Summary(self, Pattern_Name):
+        with self.Lock:
+            Statistics = self.Patterns.get(Pattern_Name)
+            return None if Statistics is None else Statistics.Summary()
+
+
+# Results Folder -> Its Shared Pattern_Statistics
+_Shared_Pattern_Statistics = dict()
+_Shared_Lock = threading.Lock()
+
+
+"""
+Shared Pattern Statistics
+-> The Pattern_Statistics of a results folder, created on first use and shared by every later
+session of the process, so no stale instance can overwrite newer updates
+-:> Returns the shared Pattern_Statistics
+
+Results_Folder_Path: The results folder holding Pattern_Statistics.json
+"""
+def Shared_Pattern_Statistics(Results_Folder_Path):
+    Key = os.path.abspath(Results_Folder_Path)
+    with _Shared_Lock:
+        if Key not in _Shared_Pattern_Statistics:
+            _Shared_Pattern_Statistics[Key] = Pattern_Statistics(Results_Folder_Path)
+        return _Shared_Pattern_Statistics[Key]
+
+
+# Interpreter Exit, Writes What The Shared Instances Still Hold
+@atexit.register
+def _Flush_Shared_Pattern_Statistics():
+    with _Shared_Lock:
+        Instances = list(_Shared_Pattern_Statistics.values())
+    for Instance in Instances:
+        Instance.Flush()
@@ -0,0 +1,254 @@
+# Worker Imports
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import logging
+import csv
+import cv2
+import os
+
+import run_statistics
+import ssim_engine
+
+logger = logging.getLogger(__name__)
+
+
+############################
+# Annotation File
+############################
+
+# Columns Of Every Run Annotation.csv
+Annotation_Header = ["SN", "Image_Name", "Pattern_Name", "SSIM_Value", "Current Average Value", "Shift_X", "Shift_Y", "Decision", "Decision_Level", "Capture_Latency_ms", "Degraded", "Coarse_SSIM_Value"]
+
+
+"""
+Annotation Scores
+-> Splits a sample score into the SSIM_Value and Coarse_SSIM_Value columns, a sample decided
+on a coarse pyramid level has no full resolution score, its SSIM_Value is left blank
+-> Only full resolution scores belong in the run and pattern statistics
+
+-:> Returns (SSIM_Value, Coarse_SSIM_Value, Full_Resolution)
+
+Result: The sample score
+Decision_Level: Pyramid level that decided the sample, 0 for full resolution
+"""
+def Annotation_Scores(Result, Decision_Level):
+    if Decision_Level > 0:
+        return "", Result, False
+    return Result, "", True
+
+
+"""
+Write Annotation Row
+-> Appends one sample row to the run Annotation.csv, creating the file and its header first if needed
+
+Annotation_Folder_Path: The ANNOTATION folder of the run
+Row: The row values, in the order of Annotation_Header
+"""
+def Write_Annotation_Row(Annotation_Folder_Path, Row):
+    os.makedirs(Annotation_Folder_Path, exist_ok=True)
+    Annotation_File_Path = f"{Annotation_Folder_Path}/Annotation.csv"
+    New_File = not os.path.exists(Annotation_File_Path)
+
+    with open(Annotation_File_Path, 'a', newline='') as file:
+        writer = csv.writer(file)
+        if New_File:
+            writer.writerow(Annotation_Header)
+        writer.writerow(Row)
+
+
+############################
+# Run State
+############################
+
+"""
+Run State
+-> Holds the destination folder and the streaming statistics of one run
+-> Samples of a run may finish out of order, so the statistics, the run summary and the
+annotation rows are updated under the run lock, in completion order
+-> A new run gets a new state, samples still in flight keep writing to their own run
+-> Additional cameras get their own state inside the run folder, tagged with the camera index
+
+Destination_Folder: The run_N folder the samples are saved to
+Pattern_Statistics: Optional run_statistics.Pattern_Statistics shared across runs
+Camera: Camera index of an additional camera, None for the main camera
+"""
+class Run_State:
+    def __init__(self, Destination_Folder, Pattern_Statistics=None, Camera=None):
+        self.Destination_Folder = Destination_Folder
+        self.Camera = Camera
+        self.Annotation_Folder_Path = f"{Destination_Folder}/ANNOTATION"
+        self.Statistics = run_statistics.Run_Statistics()
+        self.Pattern_Statistics = Pattern_Statistics
+        self.Lock = threading.Lock()
+
+    # Record A Score, Save The Run Summary And Return The Running Average
+    def Add_Score(self, Result):
+        self.Statistics.Update(Result)
+        run_statistics.Save_Run_Summary(self.Annotation_Folder_Path, self.Statistics)
+        return self.Statistics.Mean
+
+
+############################
+# Scoring Pool
+############################
+
+# Scoring Threads, OpenCV and Numpy Release The GIL While Filtering And Encoding
+Scoring_Workers = 2
+
+# Persistent Pool, Created On First Use
+_Scoring_Pool = None
+_Scoring_Pool_Lock = threading.Lock()
+
+# Samples Submitted And Not Yet Finished
+_Pending_Samples = 0
+_Pending_Lock = threading.Lock()
+
+
+# Shared Pool Used By Every Session
+def Scoring_Pool():
+    global _Scoring_Pool
+    with _Scoring_Pool_Lock:
+        if _Scoring_Pool is None:
+            _Scoring_Pool = ThreadPoolExecutor(max_workers=Scoring_Workers, thread_name_prefix="SSIM_Scoring")
+        return _Scoring_Pool
+
+
+"""
+Annotated
+-> Full scale image with the overlay bboxes of a sample drawn on a copy, the image itself
+when the sample has no overlay
+-:> Returns the image to save
+
+Image: The full scale camera frame or pattern
+Sample: The sample dict, see Score_Sample
+Side: "Image" or "Pattern", the overlay bbox list drawn
+"""
+def Annotated(Image, Sample, Side):
+    Overlay = Sample.get("Overlay")
+    if (Overlay is None) or (Overlay.get(Side, []) == []):
+        return Image
+
+    Image = Image.copy()
+    for Xmin, Ymin, Xmax, Ymax in Overlay[Side]:
+        cv2.rectangle(Image, (Xmin, Ymin), (Xmax, Ymax), Overlay["Color"], Overlay["Line_Width"])
+    return Image
+
+
+"""
+Score And Save One Sample
+-> Runs on a pool thread: SSIM, the four result images, the annotation row and the run average
+-> Aligns the camera boxes to the pattern first when registration is enabled, the mean
+applied shift is saved with the sample and the saved camera crop is shifted with it
+-> With a pass threshold set the sample is decided coarse to fine, the decision and the
+pyramid level that made it are saved with the sample, a coarse score is saved in
+Coarse_SSIM_Value and left out of the run average and the run and pattern statistics
+-> The bboxes of an "Overlay" are drawn on copies of the full scale image and pattern here,
+the only full resolution copies of the overlay, the windows draw theirs at display size
+-> The display to capture latency of the sample, when measured, is saved with it, and so is
+whether the camera was degraded (failing, dropping frames or reconnecting) during the capture
+-> Posts a '-SSIM_RESULT-' event to the window with a dict holding "Id", "Result",
+"Average", "Summary", "Region_Results", "Shift", "Decision", "Decision_Level" and "Run", or "Id", "Error" and "Run" if the sample failed
+
+window: The window the result event is posted to
+Run: The Run_State of the sample
+Sample: Dict with "Id", "Frame", "Full_Scale_Image", "Full_Scale_Pattern", "Cropped_Pattern",
+"Crop_Box", "Pattern_File_Path", "Pattern_Name", "Regions", "Metric", "Registration", "Threshold", "Bands"
+and optionally "Capture_Latency_ms", "Degraded" and "Overlay", a dict with the "Image" and "Pattern"
+bbox lists of (Xmin, Ymin, Xmax, Ymax), "Color" and "Line_Width"
+"""
+def Score_Sample(window, Run, Sample):
+    Id = Sample["Id"]
+    try:
+        # Cached Pattern Side Statistics
+        Regions = Sample["Regions"]
+        Pattern_Stats = ssim_engine.Load_Pattern_Stats(Sample["Pattern_File_Path"], [Region[4:] for Region in Regions], Metric=Sample["Metric"])
+
+        # Optional Alignment Of The Camera Boxes
+        Shifts = None
+        Shift = (0.0, 0.0)
+        if Sample.get("Registration"):
+            Shifts = ssim_engine.Register_Regions(Sample["Frame"], Regions, Pattern_Stats)
+            Valid_Shifts = [x for x in Shifts if x is not None]
+            if Valid_Shifts != []:
+                Shift = (sum(x[0] for x in Valid_Shifts)/len(Valid_Shifts), sum(x[1] for x in Valid_Shifts)/len(Valid_Shifts))
+            logger.debug(f"Registration Shifts For {Id} Are {Shifts}")
+
+        # Pass/Fail Decision, Coarse To Fine
+        Decision, Decision_Level = "", 0
+        if Sample.get("Threshold", 0) > 0:
+            Region_Results, Result, Decision, Decision_Level = ssim_engine.Decide_Regions(Sample["Frame"], Regions, Pattern_Stats, Sample["Threshold"], Sample.get("Bands", dict()), Metric=Sample["Metric"], Shifts=Shifts)
+
+        else:
+            # Carry Out SSIM TEST On All Regions In One Pass
+            Region_Results = ssim_engine.Score_Regions(Sample["Frame"], None, Regions, Pattern_Stats=Pattern_Stats, Metric=Sample["Metric"], Shifts=Shifts)
+            Valid_Results = [x for x in Region_Results if x is not None]
+            if Valid_Results == []:
+                raise ValueError("Camera Image and Pattern Image Bbox Are Not The Same Size")
+
+            Result = sum(Valid_Results)/len(Valid_Results)
+        logger.debug(f"Region Results For {Id} Are {Region_Results}")
+
+        # Save Sample Images
+        # Shifts Within The Engine Tolerance Of A Whole Pixel Are Sliced, The Rest Resampled
+        Xmin, Ymin, Xmax, Ymax = Sample["Crop_Box"]
+        Cropped_Image = ssim_engine.Shifted_Crop(Sample["Frame"], (Xmin, Ymin, Xmax, Ymax), Shift)
+        cv2.imwrite(f"{Run.Destination_Folder}/{Id}_Image.png", Cropped_Image)
+        cv2.imwrite(f"{Run.Destination_Folder}/{Id}_Pattern.png", Sample["Cropped_Pattern"])
+        cv2.imwrite(f"{Run.Destination_Folder}/{Id}_FullScale_Image.png", Annotated(Sample["Full_Scale_Image"], Sample, "Image"))
+        cv2.imwrite(f"{Run.Destination_Folder}/{Id}_FullScale_Pattern.png", Annotated(Sample["Full_Scale_Pattern"], Sample, "Pattern"))
+
+        # Display To Capture Latency, Blank When Not Measured
+        Capture_Latency = Sample.get("Capture_Latency_ms")
+        Capture_Latency = "" if Capture_Latency is None else round(Capture_Latency, 1)
+        Degraded = "YES" if Sample.get("Degraded") else ""
+
+        # Running Average And Annotation In Completion Order
+        SSIM_Value, Coarse_SSIM_Value, Full_Resolution = Annotation_Scores(Result, Decision_Level)
+        with Run.Lock:
+            Average_SSIM = Run.Add_Score(Result) if Full_Resolution else Run.Statistics.Mean
+            Write_Annotation_Row(Run.Annotation_Folder_Path, [Id, f"{Id}_Image.png", f"{Id}_Pattern.png", SSIM_Value, Average_SSIM, round(Shift[0], 3), round(Shift[1], 3), Decision, Decision_Level, Capture_Latency, Degraded, Coarse_SSIM_Value])
+            Summary = Run.Statistics.Summary()
+
+        # Pattern Statistics Across Runs
+        if (Run.Pattern_Statistics is not None) and Full_Resolution:
+            Run.Pattern_Statistics.Update(Sample.get("Pattern_Name", f"{Id}_Pattern.png"), Result)
+
+        Event_Value = {"Id": Id, "Result": Result, "Average": Average_SSIM, "Summary": Summary, "Region_Results": Region_Results, "Shift": Shift, "Decision": Decision, "Decision_Level": Decision_Level, "Run": Run}
+
+    except Exception as e:
+        logger.exception(f"Scoring Error For Sample {Id}: {str(e)}")
+        Event_Value = {"Id": Id, "Error": str(e), "Run": Run}
+
+    # Check To Prevent Errors On Window Close
+    try:
+        window.write_event_value('-SSIM_RESULT-', Event_Value)
+    except Exception as e:
+        logger.debug(f"Result Of Sample {Id} Not Posted: {e}")
+
+
+# Count A Sample Out When Its Job Finishes
+def _Sample_Done(Future):
+    global _Pending_Samples
+    with _Pending_Lock:
+        _Pending_Samples -= 1
+
+
+# Samples Queued Or Being Scored, Used To Slow The Live Previews While Scoring
+def Pending_Samples():
+    with _Pending_Lock:
+        return _Pending_Samples
+
+
+"""
+Submit A Sample For Scoring
+-> Queues Score_Sample on the shared pool and returns immediately
+
+-:> Returns the Future of the job
+"""
+def Submit_Sample(window, Run, Sample):
+    global _Pending_Samples
+    with _Pending_Lock:
+        _Pending_Samples += 1
+    Future = Scoring_Pool().submit(Score_Sample, window, Run, Sample)
+    Future.add_done_callback(_Sample_Done)
+    return Future
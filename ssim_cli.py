@@ -0,0 +1,311 @@
+"""
+WinSSIM Headless Scoring
+-> Scores samples without the GUI, the camera or a display, spread over a process pool
+-> Results are written in the Annotation.csv format used by the app
+
+Modes
+-> pair: One camera image against one pattern image
+-> run: Re-scores the {Id}_Image.png / {Id}_Pattern.png crops of saved run_N folders
+-> captures: Scores a folder of full camera captures against the mirror standards, using
+the crop settings saved in the app database
+
+Examples
+-> python ssim_cli.py pair capture.png Mirror_Standard/MirrorStandards/01_Pattern.png --db WinSsim.db
+-> python ssim_cli.py run Mirror_Standard/Results --workers 8
+-> python ssim_cli.py captures Captures/ --patterns Mirror_Standard/MirrorStandards --db WinSsim.db --output Rescored/
+"""
+
+# -------- Importing Modules -------- #
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import sqlite3
+import logging
+import csv
+import os
+import re
+
+import cv2
+
+import run_statistics
+import scoring_worker
+import ssim_engine
+
+logger = logging.getLogger(__name__)
+
+
+############################
+# Database Settings
+############################
+
+"""
+Load Database Settings
+-> Opens the app database read-only and returns the scoring settings
+
+-:> Returns a dict with "Regions", "Metric", "Registration", "Threshold" and "Bands"
+
+Db_Path: Path to WinSsim.db
+"""
+def Load_Db_Settings(Db_Path):
+    Connection = sqlite3.connect(f"file:{Db_Path}?mode=ro", uri=True)
+    Connection.row_factory = sqlite3.Row
+    try:
+        nms_data = Connection.execute("SELECT * FROM nmsctrl WHERE rowid=1").fetchone()
+        othset_data = Connection.execute("SELECT * FROM othsetctrl WHERE rowid=1").fetchone()
+    finally:
+        Connection.close()
+
+    # Columns Added By Later Migrations May Be Missing From Older Databases
+    def Column(Row, Name, Default):
+        return Row[Name] if Name in Row.keys() else Default
+
+    Regions = list()
+    if nms_data["Mode"] == "multiple":
+        Regions = ssim_engine.Parse_Bbox_Data(nms_data["Bbox_Data"], nms_data["Bbox_Count"])
+    if Regions == []:
+        Regions = [ssim_engine.Single_Region(nms_data)]
+
+    return {
+        "Regions": Regions,
+        "Metric": Column(nms_data, "Metric_Mode", "bgr"),
+        "Registration": Column(nms_data, "Registration", "Disabled") == "Enabled",
+        "Threshold": float(Column(othset_data, "Pass_Threshold", 0) or 0),
+        "Bands": ssim_engine.Parse_Coarse_Bands(Column(othset_data, "Coarse_Bands", "None"))
+        }
+
+
+############################
+# Scoring Jobs
+############################
+
+"""
+Score One Job
+-> Runs in a pool process, reads both images there so only paths cross the process boundary
+
+-:> Returns (Job, Outcome), Outcome being a dict with "Result", "Shift", "Decision" and
+"Decision_Level", or with "Error" when the job failed
+
+Job: Dict with "Image_Path", "Pattern_Path", "Regions" (None scores the whole images),
+"Metric", "Registration", "Threshold" and "Bands"
+"""
+def Score_Job(Job):
+    try:
+        Image = cv2.imread(Job["Image_Path"])
+        Pattern = cv2.imread(Job["Pattern_Path"])
+        if (Image is None) or (Pattern is None):
+            raise ValueError("Unable To Read Image Or Pattern")
+
+        Regions = Job["Regions"]
+        if Regions is None:
+            Height, Width = Image.shape[:2]
+            Regions = [(0, 0, Width, Height, 0, 0, Width, Height)]
+
+        Pattern_Stats = ssim_engine.Region_Stats(Pattern, [Region[4:] for Region in Regions], Job["Metric"])
+
+        # Optional Alignment Of The Camera Boxes
+        Shifts = None
+        Shift = (0.0, 0.0)
+        if Job["Registration"]:
+            Shifts = ssim_engine.Register_Regions(Image, Regions, Pattern_Stats)
+            Valid_Shifts = [x for x in Shifts if x is not None]
+            if Valid_Shifts != []:
+                Shift = (sum(x[0] for x in Valid_Shifts)/len(Valid_Shifts), sum(x[1] for x in Valid_Shifts)/len(Valid_Shifts))
+
+        # Pass/Fail Decision, Coarse To Fine
+        Decision, Decision_Level = "", 0
+        if Job["Threshold"] > 0:
+            _, Result, Decision, Decision_Level = ssim_engine.Decide_Regions(Image, Regions, Pattern_Stats, Job["Threshold"], Job["Bands"], Metric=Job["Metric"], Shifts=Shifts)
+
+        else:
+            Region_Results = ssim_engine.Score_Regions(Image, None, Regions, Pattern_Stats=Pattern_Stats, Metric=Job["Metric"], Shifts=Shifts)
+            Valid_Results = [x for x in Region_Results if x is not None]
+            if Valid_Results == []:
+                raise ValueError("Camera Image and Pattern Image Bbox Are Not The Same Size")
+            Result = sum(Valid_Results)/len(Valid_Results)
+
+        return Job, {"Result": Result, "Shift": Shift, "Decision": Decision, "Decision_Level": Decision_Level}
+
+    except Exception as e:
+        return Job, {"Error": str(e)}
+
+
+# Natural Sort Key, Same Ordering As The App
+def Natural_Keys(text):
+    return [int(c) if c.isdigit() else c for c in re.split(r'(\d+)', text)]
+
+
+"""
+Write Annotation
+-> Writes the scored jobs of one output in SN order, with the running average like the app
+-> Also writes the run summary next to the annotation file
+
+-:> Returns the number of failed jobs
+
+Annotation_Folder_Path: Folder receiving Annotation.csv and Summary.json
+Scored: List of (Job, Outcome) tuples of that output
+"""
+def Write_Annotation(Annotation_Folder_Path, Scored):
+    os.makedirs(Annotation_Folder_Path, exist_ok=True)
+    Statistics = run_statistics.Run_Statistics()
+    Failed = 0
+
+    with open(f"{Annotation_Folder_Path}/Annotation.csv", 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(scoring_worker.Annotation_Header)
+
+        for Job, Outcome in sorted(Scored, key=lambda x: Natural_Keys(x[0]["Id"])):
+            if "Error" in Outcome:
+                logger.warning(f"Skipped {Job['Image_Path']}: {Outcome['Error']}")
+                Failed += 1
+                continue
+
+            # Coarse Decisions Are Kept Out Of The Full Resolution Column And Statistics
+            SSIM_Value, Coarse_SSIM_Value, Full_Resolution = scoring_worker.Annotation_Scores(Outcome["Result"], Outcome["Decision_Level"])
+            if Full_Resolution:
+                Statistics.Update(Outcome["Result"])
+            writer.writerow([
+                Job["Id"], os.path.basename(Job["Image_Path"]), os.path.basename(Job["Pattern_Path"]),
+                SSIM_Value, Statistics.Mean, round(Outcome["Shift"][0], 3), round(Outcome["Shift"][1], 3),
+                Outcome["Decision"], Outcome["Decision_Level"], "", "", Coarse_SSIM_Value
+                ])
+
+    run_statistics.Save_Run_Summary(Annotation_Folder_Path, Statistics)
+    return Failed
+
+
+"""
+Run Jobs
+-> Scores every job on a process pool and writes one annotation file per output folder
+
+Jobs: List of job dicts, each with an "Output" annotation folder and an "Id"
+Workers: Number of processes, None uses every core
+"""
+def Run_Jobs(Jobs, Workers):
+    Outputs = dict()
+    with ProcessPoolExecutor(max_workers=Workers) as Pool:
+        for Job, Outcome in Pool.map(Score_Job, Jobs, chunksize=max(1, len(Jobs) // (4 * (Workers or os.cpu_count() or 1)))):
+            Outputs.setdefault(Job["Output"], list()).append((Job, Outcome))
+
+    Failed = 0
+    for Output, Scored in Outputs.items():
+        Failed += Write_Annotation(Output, Scored)
+        print(f"{Output}/Annotation.csv: {len(Scored)} Samples")
+
+    print(f"Scored {len(Jobs) - Failed} Of {len(Jobs)} Samples")
+
+
+############################
+# Modes
+############################
+
+# Scoring Settings From The Database Or The Command Line
+def Job_Settings(Args):
+    Settings = Load_Db_Settings(Args.db) if Args.db else {"Regions": None, "Metric": "bgr", "Registration": False, "Threshold": 0.0, "Bands": dict()}
+    if Args.metric is not None:
+        Settings["Metric"] = Args.metric
+    if Args.registration:
+        Settings["Registration"] = True
+    if Args.threshold is not None:
+        Settings["Threshold"] = Args.threshold
+    return Settings
+
+
+# Score One Pair And Print The Result
+def Pair(Args):
+    Settings = Job_Settings(Args)
+    Job, Outcome = Score_Job(dict(Settings, Image_Path=Args.image, Pattern_Path=Args.pattern))
+    if "Error" in Outcome:
+        raise SystemExit(Outcome["Error"])
+    print(f"SSIM {Outcome['Result']:.6f} Shift {Outcome['Shift']} {Outcome['Decision']} {Outcome['Decision_Level'] if Outcome['Decision'] else ''}".strip())
+
+
+"""
+Run Folders
+-> Finds every run folder (a folder with {Id}_Image.png crops) under the given paths
+-> The saved crops are scored whole, the FullScale images are skipped since they carry the drawn bbox
+-> Writes ANNOTATION/Rescored/Annotation.csv inside each run, or mirrors the runs under --output
+"""
+def Runs(Args):
+    Settings = Job_Settings(Args)
+    Settings["Regions"] = None
+
+    Jobs = list()
+    for Root_Path in Args.folders:
+        for Folder_Path, Sub_Folders, Files in os.walk(Root_Path):
+            Sub_Folders[:] = [x for x in Sub_Folders if x not in ("ANNOTATION", ssim_engine.Heatmap_Folder_Name)]
+            Crops = [x for x in Files if x.endswith("_Image.png") and not x.endswith("_FullScale_Image.png")]
+            if Crops == []:
+                continue
+
+            if Args.output:
+                Output = os.path.join(Args.output, os.path.relpath(Folder_Path, Root_Path), "ANNOTATION")
+            else:
+                Output = os.path.join(Folder_Path, "ANNOTATION", "Rescored")
+
+            for Crop in Crops:
+                Id = Crop.split("_")[0]
+                Jobs.append(dict(Settings, Id=Id, Image_Path=os.path.join(Folder_Path, Crop), Pattern_Path=os.path.join(Folder_Path, f"{Id}_Pattern.png"), Output=Output))
+
+    Run_Jobs(Jobs, Args.workers)
+
+
+"""
+Capture Folders
+-> Scores full camera captures named {Id}_*.png against {Id}_Pattern.png in the pattern folder
+-> Uses the crop boxes saved in the database, like an active session
+"""
+def Captures(Args):
+    Settings = Job_Settings(Args)
+
+    Patterns = {x.split("_")[0]: os.path.join(Args.patterns, x) for x in os.listdir(Args.patterns) if os.path.isfile(os.path.join(Args.patterns, x))}
+    Output = os.path.join(Args.output or Args.folder, "ANNOTATION")
+
+    Jobs = list()
+    for Capture in sorted(os.listdir(Args.folder), key=Natural_Keys):
+        Id = Capture.split("_")[0]
+        if (not Capture.lower().endswith((".png", ".jpg", ".bmp"))) or (Id not in Patterns):
+            continue
+        Jobs.append(dict(Settings, Id=Id, Image_Path=os.path.join(Args.folder, Capture), Pattern_Path=Patterns[Id], Output=Output))
+
+    Run_Jobs(Jobs, Args.workers)
+
+
+############################
+# Command Line
+############################
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s:%(levelname)s:%(message)s")
+
+    Parser = argparse.ArgumentParser(description="Headless WinSSIM scoring")
+    Commands = Parser.add_subparsers(dest="command", required=True)
+
+    # Options Shared By Every Mode
+    Shared = argparse.ArgumentParser(add_help=False)
+    Shared.add_argument("--db", default=None, help="App database to read crop boxes and scoring settings from (opened read-only)")
+    Shared.add_argument("--metric", default=None, choices=ssim_engine.Metric_Modes, help="Metric mode, defaults to the database setting or bgr")
+    Shared.add_argument("--registration", action="store_true", help="Align camera boxes to the pattern before scoring")
+    Shared.add_argument("--threshold", type=float, default=None, help="Pass threshold, 0 disables decisions")
+    Shared.add_argument("--workers", type=int, default=None, help="Scoring processes, defaults to every core")
+
+    Pair_Parser = Commands.add_parser("pair", parents=[Shared], help="Score one image against one pattern")
+    Pair_Parser.add_argument("image", help="Camera image")
+    Pair_Parser.add_argument("pattern", help="Pattern image")
+    Pair_Parser.set_defaults(Function=Pair)
+
+    Runs_Parser = Commands.add_parser("run", parents=[Shared], help="Re-score saved run folders")
+    Runs_Parser.add_argument("folders", nargs="+", help="Run folders, or any folder above them such as Mirror_Standard/Results")
+    Runs_Parser.add_argument("--output", default=None, help="Folder to mirror the run annotations into")
+    Runs_Parser.set_defaults(Function=Runs)
+
+    Captures_Parser = Commands.add_parser("captures", parents=[Shared], help="Score a folder of captures against the mirror standards")
+    Captures_Parser.add_argument("folder", help="Folder of {Id}_*.png captures")
+    Captures_Parser.add_argument("--patterns", default="Mirror_Standard/MirrorStandards", help="Mirror standard pattern folder")
+    Captures_Parser.add_argument("--output", default=None, help="Folder receiving ANNOTATION/Annotation.csv, defaults to the capture folder")
+    Captures_Parser.set_defaults(Function=Captures)
+
+    Args = Parser.parse_args()
+    Args.Function(Args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1039 @@
+# Engine Imports
+import numpy as np
+import threading
+import zipfile
+import hashlib
+import ast
+import cv2
+import os
+
+
+############################
+# SSIM Constants
+############################
+
+"""
+These values mirror the defaults of skimage's structural_similarity
+(uniform 7x7 window, sample covariance, K1 = 0.01, K2 = 0.03 and an 8-bit
+data range) so scores produced here line up with the compare_ssim values
+already stored in previous Annotation files.
+"""
+
+# Sliding Window Size
+SSIM_Win_Size = 7
+
+# Border Dropped From The SSIM Map Before Averaging
+SSIM_Pad = (SSIM_Win_Size - 1) // 2
+
+# Stability Constants For 8-bit Images
+SSIM_Data_Range = 255
+SSIM_C1 = (0.01 * SSIM_Data_Range) ** 2
+SSIM_C2 = (0.03 * SSIM_Data_Range) ** 2
+
+# Sample Covariance Normalisation
+SSIM_Cov_Norm = (SSIM_Win_Size ** 2) / (SSIM_Win_Size ** 2 - 1)
+
+
+"""
+Metric Modes (nmsctrl.Metric_Mode)
+-> bgr: Full resolution SSIM averaged over the three colour channels (original behaviour)
+-> luma: Full resolution SSIM of the Y (luma) channel only, about a third of the bgr cost
+-> msssim: Multi-scale SSIM over a 2x downsampled pyramid of up to five levels,
+less sensitive to camera blur than single scale SSIM
+"""
+Metric_Modes = ("bgr", "luma", "msssim")
+
+# Multi-Scale SSIM Level Weights (Wang, Simoncelli and Bovik 2003)
+MS_SSIM_Weights = (0.0448, 0.2856, 0.3001, 0.2363, 0.1333)
+
+
+"""
+Tiled Scoring
+-> Regions whose float64 statistics would exceed Tile_Memory_Budget are scored by
+Tiled_Ssim, which streams over the crop in overlapping float32 strips
+-> Tiled scores match the float64 scores within Tiled_Tolerance, the measured worst
+case on 4K BGR crops is about 2e-8 (see benchmark.py tiled)
+"""
+
+# Working Memory Allowed For One Scoring Pass (Bytes)
+Tile_Memory_Budget = 64 * 1024 * 1024
+
+# Maximum Absolute Difference Between Tiled And Full Float64 Scores
+Tiled_Tolerance = 1e-5
+
+# Full Size Float Arrays Held At Once By The Float64 Path And By A Float32 Strip
+_Full_Path_Arrays = 6
+_Strip_Arrays = 12
+
+
+"""
+Region Registration (nmsctrl.Registration)
+-> Small camera or monitor movements shift the camera box away from the pattern box
+-> When enabled, every camera box is moved by the sub-pixel shift found by phase
+correlation against the pattern crop before it is scored
+"""
+
+# Largest Shift Searched For, In Pixels
+Registration_Max_Shift = 8
+
+# Shifts Closer Than This To A Whole Pixel Are Snapped To It, So Aligned Regions Are Sliced Not Resampled
+Shift_Tolerance = 0.05
+
+
+"""
+Coarse To Fine Decisions (othsetctrl.Pass_Threshold, othsetctrl.Coarse_Bands)
+-> With a pass threshold set, a sample is first scored on 2x downsampled pyramid levels,
+coarsest first, and decided there when its score is further from the threshold than
+the calibrated uncertainty band of that level
+-> Only borderline samples get the full resolution score (level 0)
+-> Bands are a {Level: Band} dict, see Calibrate_Coarse_Bands
+"""
+
+# Coarsest Pyramid Level Tried
+Coarse_Levels = 2
+
+# Safety Factor Applied To The Largest Calibration Error
+Calibration_Margin = 1.5
+
+
+############################
+# Region Helpers
+############################
+
+"""
+Bbox Data Parser
+-> Converts The Bbox_Data String Stored In nmsctrl Into A List Of Regions
+
+-:> Returns a list of (CB_X, CB_Y, CE_X, CE_Y, SB_X, SB_Y, SE_X, SE_Y) tuples, the
+first four values are the camera (crop) box and the last four the pattern (sync) box
+
+Bbox_Data: The Bbox_Data value from the database, either the stored string or a dict
+Bbox_Count: The number of bbox saved with the data
+"""
+def Parse_Bbox_Data(Bbox_Data, Bbox_Count):
+
+    # No Multi Bbox Data Saved
+    if Bbox_Data in (None, "", "None"):
+        return []
+
+    if isinstance(Bbox_Data, str):
+        Bbox_Value = ast.literal_eval(Bbox_Data)
+    else:
+        Bbox_Value = Bbox_Data
+
+    Regions = list()
+    for i in range(1, int(Bbox_Count) + 1):
+        try:
+            Regions.append((
+                int(Bbox_Value[f"CB_X_Bbox_{i}"]), int(Bbox_Value[f"CB_Y_Bbox_{i}"]),
+                int(Bbox_Value[f"CE_X_Bbox_{i}"]), int(Bbox_Value[f"CE_Y_Bbox_{i}"]),
+                int(Bbox_Value[f"SB_X_Bbox_{i}"]), int(Bbox_Value[f"SB_Y_Bbox_{i}"]),
+                int(Bbox_Value[f"SE_X_Bbox_{i}"]), int(Bbox_Value[f"SE_Y_Bbox_{i}"])
+                ))
+
+        # Skip Bbox That Were Never Saved
+        except KeyError:
+            continue
+
+    return Regions
+
+
+"""
+Single Region From The nmsctrl Row
+-> Builds the region tuple used by the single bbox mode (Crop_X1..Y2 and Sync_X1..Y2)
+
+nms_data: A row fetched with database("nmsctrl")
+"""
+def Single_Region(nms_data):
+    return (
+        int(nms_data[2]), int(nms_data[4]), int(nms_data[3]), int(nms_data[5]),
+        int(nms_data[6]), int(nms_data[8]), int(nms_data[7]), int(nms_data[9])
+        )
+
+
+"""
+Offset Regions
+-> Moves the camera boxes of regions, the pattern boxes stay where they are
+-> Used for additional cameras whose crop sits elsewhere in their frame
+
+-:> Returns the list of moved region tuples
+
+Regions: List of region tuples
+Offset_X: Pixels added to the camera box x coordinates
+Offset_Y: Pixels added to the camera box y coordinates
+"""
+def Offset_Regions(Regions, Offset_X, Offset_Y):
+    return [(Region[0] + Offset_X, Region[1] + Offset_Y, Region[2] + Offset_X, Region[3] + Offset_Y) + tuple(Region[4:]) for Region in Regions]
+
+
+# Clip A Box The Same Way Numpy Slicing Does
+def _Clip_Box(Shape, X1, Y1, X2, Y2):
+    Y1, Y2, _ = slice(Y1, Y2).indices(Shape[0])
+    X1, X2, _ = slice(X1, X2).indices(Shape[1])
+    return X1, Y1, max(X1, X2), max(Y1, Y2)
+
+
+# Smallest Box Containing Every Box In The List
+def _Union_Box(Boxes):
+    return (
+        min(Box[0] for Box in Boxes), min(Box[1] for Box in Boxes),
+        max(Box[2] for Box in Boxes), max(Box[3] for Box in Boxes)
+        )
+
+
+############################
+# Filtered Statistics
+############################
+
+# Uniform Window Mean
+def _Box_Mean(Image):
+    return cv2.boxFilter(Image, -1, (SSIM_Win_Size, SSIM_Win_Size), normalize=True, borderType=cv2.BORDER_REFLECT)
+
+
+"""
+Shared Filtered Statistics
+-> Converts the area covered by the boxes to float once
+-> Computes the local mean and the local mean of squares once for that area
+
+Because the outer SSIM_Pad pixels of every region are discarded, the filtered
+value of an interior pixel only depends on pixels inside its own region. The
+statistics of the union area can therefore be sliced for every region without
+changing the result.
+
+-:> Returns (Origin, Image, Mean, Mean_Sq), Origin being the (x, y) offset of the union area
+
+Image: The full uint8 image
+Boxes: List of (X1, Y1, X2, Y2) boxes already clipped to the image
+"""
+def _Shared_Stats(Image, Boxes):
+    X1, Y1, X2, Y2 = _Union_Box(Boxes)
+    Area = Image[Y1:Y2, X1:X2].astype(np.float64)
+    return (X1, Y1), Area, _Box_Mean(Area), _Box_Mean(Area * Area)
+
+
+# Convert An Image To The Channels Scored By A Metric Mode
+def _Metric_Image(Image, Metric):
+    if Metric not in Metric_Modes:
+        raise ValueError(f"Unknown SSIM Metric Mode {Metric}")
+
+    if (Metric == "luma") and (Image.ndim == 3):
+        return cv2.cvtColor(Image, cv2.COLOR_BGR2GRAY)
+    return Image
+
+
+# Bytes Used By The Float64 Statistics Of The Union Of The Boxes
+def _Full_Path_Bytes(Image, Boxes):
+    X1, Y1, X2, Y2 = _Union_Box(Boxes)
+    Channels = Image.shape[2] if Image.ndim == 3 else 1
+    return (X2 - X1) * (Y2 - Y1) * Channels * 8 * _Full_Path_Arrays
+
+
+"""
+Per Region Statistics
+-> Computes the statistics of one side (camera or pattern) for every box in one pass
+
+-:> Returns a list with, for every box, a dict holding the clipped "Box", the uint8
+"Crop" and the interior "Mean" and "Mean_Sq" maps, or None when the box is smaller
+than the SSIM window. "Mean" and "Mean_Sq" are None when the boxes are too large for
+the memory budget, those regions are scored by Tiled_Ssim from the crop alone
+
+Image: The full uint8 image
+Boxes: List of (X1, Y1, X2, Y2) boxes
+Metric: The metric mode the statistics are used for, see Metric_Modes
+Memory_Budget: Bytes allowed for the float64 statistics
+"""
+def Region_Stats(Image, Boxes, Metric="bgr", Memory_Budget=Tile_Memory_Budget):
+    Image = _Metric_Image(Image, Metric)
+    Clipped = [_Clip_Box(Image.shape, *Box) for Box in Boxes]
+    Valid = [i for i, Box in enumerate(Clipped) if min(Box[2] - Box[0], Box[3] - Box[1]) >= SSIM_Win_Size]
+
+    Stats = [None] * len(Boxes)
+    if Valid == []:
+        return Stats
+
+    # Crops Only When The Statistics Would Exceed The Budget
+    if _Full_Path_Bytes(Image, [Clipped[i] for i in Valid]) > Memory_Budget:
+        for Index in Valid:
+            X1, Y1, X2, Y2 = Clipped[Index]
+            Stats[Index] = {"Box": Clipped[Index], "Crop": Image[Y1:Y2, X1:X2], "Mean": None, "Mean_Sq": None}
+        return Stats
+
+    Origin, Area, Mean, Mean_Sq = _Shared_Stats(Image, [Clipped[i] for i in Valid])
+
+    for Index in Valid:
+        X1, Y1, X2, Y2 = Clipped[Index]
+        Interior = (
+            slice(Y1 - Origin[1] + SSIM_Pad, Y2 - Origin[1] - SSIM_Pad),
+            slice(X1 - Origin[0] + SSIM_Pad, X2 - Origin[0] - SSIM_Pad)
+            )
+        Stats[Index] = {
+            "Box": Clipped[Index],
+            "Crop": Image[Y1:Y2, X1:X2],
+            "Mean": Mean[Interior],
+            "Mean_Sq": Mean_Sq[Interior]
+            }
+
+    return Stats
+
+
+# SSIM Map Of One Region From Its Filtered Statistics
+def _Ssim_Map(X, Y, Mean_X, Mean_Sq_X, Mean_Y, Mean_Sq_Y):
+    Interior = (slice(SSIM_Pad, -SSIM_Pad), slice(SSIM_Pad, -SSIM_Pad))
+
+    # Cross Term Is The Only Statistic Tied To The Pairing Of Both Images
+    Mean_XY = _Box_Mean(X * Y)[Interior]
+
+    Var_X = SSIM_Cov_Norm * (Mean_Sq_X - Mean_X * Mean_X)
+    Var_Y = SSIM_Cov_Norm * (Mean_Sq_Y - Mean_Y * Mean_Y)
+    Cov_XY = SSIM_Cov_Norm * (Mean_XY - Mean_X * Mean_Y)
+
+    Numerator = (2 * Mean_X * Mean_Y + SSIM_C1) * (2 * Cov_XY + SSIM_C2)
+    Denominator = (Mean_X * Mean_X + Mean_Y * Mean_Y + SSIM_C1) * (Var_X + Var_Y + SSIM_C2)
+    return Numerator / Denominator
+
+
+"""
+Tiled SSIM
+-> Scores a crop pair in horizontal strips sized to fit the memory budget
+-> Every strip overlaps its neighbours by SSIM_Pad rows on each side, so each output
+row sees exactly the same window as in the full image and no border effect is added
+-> Works in float32 on values centred around zero, which keeps the variance terms
+(mean of squares minus squared mean) accurate to within Tiled_Tolerance
+
+-:> Returns the mean SSIM of the pair, same as the float64 score within Tiled_Tolerance
+
+X: The camera crop
+Y: The pattern crop of the same size
+Memory_Budget: Bytes allowed for the working arrays of one strip
+"""
+def Tiled_Ssim(X, Y, Memory_Budget=Tile_Memory_Budget):
+    Height, Width = X.shape[:2]
+    Channels = X.shape[2] if X.ndim == 3 else 1
+    Output_Rows = Height - 2 * SSIM_Pad
+    Output_Size = Output_Rows * (Width - 2 * SSIM_Pad) * Channels
+
+    # Output Rows Per Strip
+    Row_Bytes = Width * Channels * 4 * _Strip_Arrays
+    Strip_Rows = max(1, Memory_Budget // Row_Bytes - 2 * SSIM_Pad)
+
+    Interior = (slice(SSIM_Pad, -SSIM_Pad), slice(SSIM_Pad, -SSIM_Pad))
+    Offset = np.float32(SSIM_Data_Range / 2)
+    C1, C2, Cov_Norm = np.float32(SSIM_C1), np.float32(SSIM_C2), np.float32(SSIM_Cov_Norm)
+
+    Total = 0.0
+    for Start in range(0, Output_Rows, Strip_Rows):
+        Stop = min(Start + Strip_Rows, Output_Rows)
+
+        # Strip Rows Plus The Window Overlap, Centred Around Zero
+        X_Strip = X[Start:Stop + 2 * SSIM_Pad].astype(np.float32)
+        Y_Strip = Y[Start:Stop + 2 * SSIM_Pad].astype(np.float32)
+        X_Strip -= Offset
+        Y_Strip -= Offset
+
+        Mean_X = _Box_Mean(X_Strip)[Interior]
+        Mean_Y = _Box_Mean(Y_Strip)[Interior]
+        Var_X = _Box_Mean(X_Strip * X_Strip)[Interior] - Mean_X * Mean_X
+        Var_Y = _Box_Mean(Y_Strip * Y_Strip)[Interior] - Mean_Y * Mean_Y
+        Cov_XY = _Box_Mean(X_Strip * Y_Strip)[Interior] - Mean_X * Mean_Y
+
+        # Undo The Centring For The Luminance Term
+        Mean_X += Offset
+        Mean_Y += Offset
+
+        Numerator = (2 * Mean_X * Mean_Y + C1) * (2 * Cov_Norm * Cov_XY + C2)
+        Denominator = (Mean_X * Mean_X + Mean_Y * Mean_Y + C1) * (Cov_Norm * (Var_X + Var_Y) + C2)
+        Total += float((Numerator / Denominator).sum(dtype=np.float64))
+
+    return Total / Output_Size
+
+
+# Next Pyramid Level, 2x2 Averaging
+def _Half_Size(Image):
+    Height, Width = Image.shape[0] // 2, Image.shape[1] // 2
+    return cv2.resize(Image[:Height * 2, :Width * 2], (Width, Height), interpolation=cv2.INTER_AREA)
+
+
+"""
+Multi-Scale SSIM
+-> Scores a crop pair over a pyramid halved with 2x2 averaging at every level
+-> Uses the contrast-structure term of every level and the full SSIM of the coarsest one
+-> Small crops use fewer levels, the weights of the levels used are renormalised
+
+-:> Returns the MS-SSIM score of the pair
+
+X: The camera crop
+Y: The pattern crop of the same size
+"""
+def Ms_Ssim(X, Y):
+    X = X.astype(np.float64)
+    Y = Y.astype(np.float64)
+    Interior = (slice(SSIM_Pad, -SSIM_Pad), slice(SSIM_Pad, -SSIM_Pad))
+
+    # Levels Whose Size Still Fits The Window
+    Levels = 1
+    while (Levels < len(MS_SSIM_Weights)) and (min(X.shape[:2]) >> Levels >= SSIM_Win_Size):
+        Levels += 1
+
+    Weights = np.array(MS_SSIM_Weights[:Levels])
+    Weights = Weights / Weights.sum()
+
+    Value = 1.0
+    for Level in range(Levels):
+        Mean_X, Mean_Y = _Box_Mean(X)[Interior], _Box_Mean(Y)[Interior]
+        Var_X = SSIM_Cov_Norm * (_Box_Mean(X * X)[Interior] - Mean_X * Mean_X)
+        Var_Y = SSIM_Cov_Norm * (_Box_Mean(Y * Y)[Interior] - Mean_Y * Mean_Y)
+        Cov_XY = SSIM_Cov_Norm * (_Box_Mean(X * Y)[Interior] - Mean_X * Mean_Y)
+
+        Contrast_Structure = (2 * Cov_XY + SSIM_C2) / (Var_X + Var_Y + SSIM_C2)
+
+        if Level == Levels - 1:
+            Luminance = (2 * Mean_X * Mean_Y + SSIM_C1) / (Mean_X * Mean_X + Mean_Y * Mean_Y + SSIM_C1)
+            Term = (Luminance * Contrast_Structure).mean()
+        else:
+            Term = Contrast_Structure.mean()
+
+            # Next Pyramid Level
+            X, Y = _Half_Size(X), _Half_Size(Y)
+
+        # Negative Terms Would Make The Weighted Product Undefined
+        Value *= max(Term, 0.0) ** Weights[Level]
+
+    return float(Value)
+
+
+############################
+# Region Registration
+############################
+
+# Gray Float32 Copy Of A Crop
+def _Gray_Float(Crop):
+    if Crop.ndim == 3:
+        Crop = cv2.cvtColor(Crop, cv2.COLOR_BGR2GRAY)
+    return Crop.astype(np.float32)
+
+
+# Windowed Spectrum Of A Gray Crop, The Window Stops The Crop Edges From Dominating The Correlation
+def _Windowed_Spectrum(Gray):
+    Window = cv2.createHanningWindow((Gray.shape[1], Gray.shape[0]), cv2.CV_32F)
+    return np.fft.rfft2((Gray - Gray.mean()) * Window)
+
+
+# Vertex Offset Of A Parabola Through Three Samples Around A Peak
+def _Sub_Pixel_Offset(Left, Centre, Right):
+    Curvature = Left - 2 * Centre + Right
+    if Curvature >= 0:
+        return 0.0
+    return float(np.clip(0.5 * (Left - Right) / Curvature, -0.5, 0.5))
+
+
+"""
+Pattern Spectrum
+-> Windowed FFT of a pattern crop, computed once and kept on the region statistics
+so later captures of the same pattern only transform the camera crop
+
+-:> Returns the spectrum of the pattern crop
+
+Stats: A region statistics dict from Region_Stats or Load_Pattern_Stats
+"""
+def Pattern_Spectrum(Stats):
+    if "Spectrum" not in Stats:
+        Stats["Spectrum"] = _Windowed_Spectrum(_Gray_Float(Stats["Crop"]))
+    return Stats["Spectrum"]
+
+
+"""
+Region Registration
+-> Finds the shift of every camera box against its pattern crop by phase correlation
+-> The correlation peak is searched within Max_Shift pixels and refined to sub-pixel
+precision with a parabola fit on each axis
+
+-:> Returns a list with one (Shift_X, Shift_Y) tuple per region, the camera box content
+sits at box + shift, or None for regions that can not be scored
+
+Frame: The captured camera frame
+Regions: List of (CB_X, CB_Y, CE_X, CE_Y, SB_X, SB_Y, SE_X, SE_Y) tuples
+Pattern_Stats: List of pattern statistics, one per region
+Max_Shift: Largest shift searched for, in pixels
+"""
+def Register_Regions(Frame, Regions, Pattern_Stats, Max_Shift=Registration_Max_Shift):
+    Shifts = list()
+    for Region, Stats in zip(Regions, Pattern_Stats):
+        X1, Y1, X2, Y2 = _Clip_Box(Frame.shape, *Region[:4])
+        if (Stats is None) or ((Y2 - Y1, X2 - X1) != Stats["Crop"].shape[:2]):
+            Shifts.append(None)
+            continue
+
+        # Normalised Cross Power Spectrum
+        Cross_Power = _Windowed_Spectrum(_Gray_Float(Frame[Y1:Y2, X1:X2])) * np.conj(Pattern_Spectrum(Stats))
+        Cross_Power /= np.abs(Cross_Power) + 1e-9
+        Correlation = np.fft.irfft2(Cross_Power, s=(Y2 - Y1, X2 - X1))
+
+        # Peak Within The Allowed Shift, Negative Shifts Wrap Around
+        Height, Width = Correlation.shape
+        Shift_Range_Y = np.arange(-min(Max_Shift, Height // 2), min(Max_Shift, Height // 2) + 1)
+        Shift_Range_X = np.arange(-min(Max_Shift, Width // 2), min(Max_Shift, Width // 2) + 1)
+        Window = Correlation[np.ix_(Shift_Range_Y % Height, Shift_Range_X % Width)]
+        Peak_Y, Peak_X = np.unravel_index(np.argmax(Window), Window.shape)
+        Shift_Y, Shift_X = int(Shift_Range_Y[Peak_Y]), int(Shift_Range_X[Peak_X])
+
+        # Sub-Pixel Refinement
+        Centre = Correlation[Shift_Y % Height, Shift_X % Width]
+        Shifts.append((
+            Shift_X + _Sub_Pixel_Offset(Correlation[Shift_Y % Height, (Shift_X - 1) % Width], Centre, Correlation[Shift_Y % Height, (Shift_X + 1) % Width]),
+            Shift_Y + _Sub_Pixel_Offset(Correlation[(Shift_Y - 1) % Height, Shift_X % Width], Centre, Correlation[(Shift_Y + 1) % Height, Shift_X % Width])
+            ))
+
+    return Shifts
+
+
+"""
+Snap Shift
+-> Rounds every shift component within Tolerance of a whole pixel to it, phase correlation
+almost never returns an exact (0, 0) for a well aligned region
+-:> Returns the snapped (Shift_X, Shift_Y), None stays None
+
+Shift: The (Shift_X, Shift_Y) shift from Register_Regions
+Tolerance: Largest distance to a whole pixel snapped, in pixels
+"""
+def Snap_Shift(Shift, Tolerance=Shift_Tolerance):
+    if Shift is None:
+        return None
+    return tuple(float(round(Value)) if abs(Value - round(Value)) < Tolerance else Value for Value in Shift)
+
+
+# Box Moved By A Whole Pixel Shift, None When The Shift Is Fractional Or The Box Leaves The Image
+def _Moved_Box(Shape, Box, Shift):
+    if any(Value != round(Value) for Value in Shift):
+        return None
+    X1, Y1, X2, Y2 = Box[0] + int(Shift[0]), Box[1] + int(Shift[1]), Box[2] + int(Shift[0]), Box[3] + int(Shift[1])
+    if (X1 < 0) or (Y1 < 0) or (X2 > Shape[1]) or (Y2 > Shape[0]):
+        return None
+    return (X1, Y1, X2, Y2)
+
+
+"""
+Shifted Crop
+-> Cuts a box out of an image moved by a sub-pixel shift, pixels outside the image repeat the border
+-> Shifts are snapped first (see Snap_Shift), a whole pixel shift inside the image is a plain
+slice, only a fractional one is resampled
+
+-:> Returns the crop, same size and type as the unshifted one, a view of the image when sliced
+
+Image: The full image
+Box: The (X1, Y1, X2, Y2) box
+Shift: The (Shift_X, Shift_Y) shift from Register_Regions
+"""
+def Shifted_Crop(Image, Box, Shift):
+    Shift = Snap_Shift(Shift)
+    Moved_Box = _Moved_Box(Image.shape, Box, Shift)
+    if Moved_Box is not None:
+        return Image[Moved_Box[1]:Moved_Box[3], Moved_Box[0]:Moved_Box[2]]
+
+    X1, Y1, X2, Y2 = Box
+    Centre = (X1 + (X2 - X1 - 1) / 2 + Shift[0], Y1 + (Y2 - Y1 - 1) / 2 + Shift[1])
+    return cv2.getRectSubPix(Image, (X2 - X1, Y2 - Y1), Centre)
+
+
+############################
+# Batched Region Scoring
+############################
+
+"""
+Batched Multi Region SSIM
+-> Scores every region of one captured frame against one pattern image in a single pass
+-> Float conversion and window filtering are done once per image, not once per region
+-> Pattern side statistics can be passed in precomputed (see Load_Pattern_Stats), in
+which case only the camera side and the cross terms are computed
+-> Multichannel images are scored like compare_ssim(..., multichannel=True)
+-> The metric mode selects bgr, luma or multi-scale SSIM, see Metric_Modes
+-> Regions too large for the memory budget are scored by Tiled_Ssim
+-> Registration shifts are snapped (see Snap_Shift), regions with a whole pixel shift stay in
+the batched pass with their box moved, only fractional shifts are scored from a resampled crop
+
+-:> Returns a list with one SSIM score per region, in the order of Regions. A region
+whose camera and pattern boxes differ in size, or that is smaller than the SSIM
+window, gets None instead of a score
+
+Frame: The captured camera frame (uint8, gray or BGR)
+Pattern: The pattern image the frame is compared against, may be None when Pattern_Stats is given
+Regions: List of (CB_X, CB_Y, CE_X, CE_Y, SB_X, SB_Y, SE_X, SE_Y) tuples, see Parse_Bbox_Data
+Pattern_Stats: Optional list of pattern statistics, one per region, computed for the same metric
+Metric: The metric mode, see Metric_Modes
+Memory_Budget: Bytes allowed for the float64 statistics before switching to tiled scoring
+Shifts: Optional list of (Shift_X, Shift_Y) per region, see Register_Regions
+"""
+def Score_Regions(Frame, Pattern, Regions, Pattern_Stats=None, Metric="bgr", Memory_Budget=Tile_Memory_Budget, Shifts=None):
+
+    # Pattern Side Statistics
+    if Pattern_Stats is None:
+        Pattern_Stats = Region_Stats(Pattern, [Region[4:] for Region in Regions], Metric, Memory_Budget)
+
+    Frame = _Metric_Image(Frame, Metric)
+
+    # Clip Boxes Like The Crops Taken By The App
+    Frame_Boxes = [_Clip_Box(Frame.shape, *Region[:4]) for Region in Regions]
+
+    # Regions That Can Be Scored
+    Valid = list()
+    for Index, (Frame_Box, Stats) in enumerate(zip(Frame_Boxes, Pattern_Stats)):
+        if Stats is None:
+            continue
+
+        Size = (Frame_Box[3] - Frame_Box[1], Frame_Box[2] - Frame_Box[0])
+        if (Size == Stats["Crop"].shape[:2]) and (Frame.shape[2:] == Stats["Crop"].shape[2:]):
+            Valid.append(Index)
+
+    Scores = [None] * len(Regions)
+    if Valid == []:
+        return Scores
+
+    # Registered Regions Are Scored From Their Shifted Crop
+    if Shifts is not None:
+        Shifts = [Snap_Shift(Shift) for Shift in Shifts]
+
+        # Whole Pixel Shifts Move The Box And Stay In The Batched Pass
+        for Index in Valid:
+            Moved_Box = None if Shifts[Index] is None else _Moved_Box(Frame.shape, Frame_Boxes[Index], Shifts[Index])
+            if Moved_Box is not None:
+                Frame_Boxes[Index] = Moved_Box
+                Shifts[Index] = (0.0, 0.0)
+
+        Shifted = [i for i in Valid if Shifts[i] not in (None, (0, 0))]
+        for Index in Shifted:
+            Crop = Shifted_Crop(Frame, Frame_Boxes[Index], Shifts[Index])
+            Height, Width = Crop.shape[:2]
+            (Scores[Index],) = Score_Regions(Crop, None, [(0, 0, Width, Height) + tuple(Regions[Index][4:])], [Pattern_Stats[Index]], Metric, Memory_Budget)
+
+        Valid = [i for i in Valid if i not in Shifted]
+        if Valid == []:
+            return Scores
+
+    # Multi-Scale Regions Are Scored From Their Crops
+    if Metric == "msssim":
+        for Index in Valid:
+            X1, Y1, X2, Y2 = Frame_Boxes[Index]
+            Scores[Index] = Ms_Ssim(Frame[Y1:Y2, X1:X2], Pattern_Stats[Index]["Crop"])
+        return Scores
+
+    # Large Regions Are Streamed In Strips
+    Tiled = [i for i in Valid if Pattern_Stats[i]["Mean"] is None]
+    if _Full_Path_Bytes(Frame, [Frame_Boxes[i] for i in Valid]) > Memory_Budget:
+        Tiled = Valid
+
+    for Index in Tiled:
+        X1, Y1, X2, Y2 = Frame_Boxes[Index]
+        Scores[Index] = Tiled_Ssim(Frame[Y1:Y2, X1:X2], Pattern_Stats[Index]["Crop"], Memory_Budget)
+
+    Valid = [i for i in Valid if i not in Tiled]
+    if Valid == []:
+        return Scores
+
+    # Camera Side Statistics Shared By All Regions
+    Origin, Frame_Area, Frame_Mean, Frame_Mean_Sq = _Shared_Stats(Frame, [Frame_Boxes[i] for i in Valid])
+
+    for Index in Valid:
+        X1, Y1, X2, Y2 = Frame_Boxes[Index]
+        X1, X2 = X1 - Origin[0], X2 - Origin[0]
+        Y1, Y2 = Y1 - Origin[1], Y2 - Origin[1]
+        Interior = (slice(Y1 + SSIM_Pad, Y2 - SSIM_Pad), slice(X1 + SSIM_Pad, X2 - SSIM_Pad))
+
+        Stats = Pattern_Stats[Index]
+        S = _Ssim_Map(
+            Frame_Area[Y1:Y2, X1:X2], Stats["Crop"].astype(np.float64),
+            Frame_Mean[Interior], Frame_Mean_Sq[Interior],
+            Stats["Mean"], Stats["Mean_Sq"]
+            )
+
+        Scores[Index] = float(S.mean())
+
+    return Scores
+
+
+############################
+# Coarse To Fine Decisions
+############################
+
+"""
+Bands Parser
+-> Converts the Coarse_Bands value stored in othsetctrl into a {Level: Band} dict
+
+Coarse_Bands: The stored string, 'None' or an empty value when not calibrated
+"""
+def Parse_Coarse_Bands(Coarse_Bands):
+    if Coarse_Bands in (None, "", "None"):
+        return dict()
+    if isinstance(Coarse_Bands, str):
+        Coarse_Bands = ast.literal_eval(Coarse_Bands)
+    return {int(Level): float(Band) for Level, Band in Coarse_Bands.items()}
+
+
+# Mean SSIM Of A Crop Pair
+def _Pair_Score(X, Y):
+    Height, Width = X.shape[:2]
+    return Score_Regions(X, Y, [(0, 0, Width, Height, 0, 0, Width, Height)])[0]
+
+
+# Crop Pair At A Pyramid Level, None When It Is Smaller Than The Window
+def _Pair_Level(X, Y, Level):
+    if min(X.shape[:2]) >> Level < SSIM_Win_Size:
+        return None
+    for _ in range(Level):
+        X, Y = _Half_Size(X), _Half_Size(Y)
+    return X, Y
+
+
+"""
+Coarse To Fine Decision
+-> Decides pass or fail on the coarsest pyramid level whose score is clear of the threshold
+-> Falls back to the full resolution Score_Regions result for borderline samples
+-> Multi-scale mode is always scored at full resolution
+
+-:> Returns (Region_Results, Result, Decision, Decision_Level), Result being the mean of the
+region scores of the deciding level, Decision "PASS" or "FAIL" and Decision_Level the
+pyramid level (0 is full resolution). A Result from a level above 0 is a downsampled score,
+it is not comparable with full resolution SSIM and is kept apart from it by the callers
+
+Frame: The captured camera frame
+Regions: List of (CB_X, CB_Y, CE_X, CE_Y, SB_X, SB_Y, SE_X, SE_Y) tuples
+Pattern_Stats: List of pattern statistics, one per region, computed for the same metric
+Threshold: Pass threshold on the mean region score
+Bands: {Level: Band} dict, see Calibrate_Coarse_Bands
+Metric: The metric mode, see Metric_Modes
+Shifts: Optional list of (Shift_X, Shift_Y) per region, see Register_Regions
+"""
+def Decide_Regions(Frame, Regions, Pattern_Stats, Threshold, Bands, Metric="bgr", Shifts=None):
+    Metric_Frame = _Metric_Image(Frame, Metric)
+
+    # Camera And Pattern Crops Of Every Scorable Region
+    Pairs = list()
+    for Index, (Region, Stats) in enumerate(zip(Regions, Pattern_Stats)):
+        Box = _Clip_Box(Metric_Frame.shape, *Region[:4])
+        if (Stats is None) or ((Box[3] - Box[1], Box[2] - Box[0]) != Stats["Crop"].shape[:2]) or (Metric_Frame.shape[2:] != Stats["Crop"].shape[2:]):
+            continue
+
+        if (Shifts is None) or (Shifts[Index] is None):
+            Pairs.append((Index, Metric_Frame[Box[1]:Box[3], Box[0]:Box[2]], Stats["Crop"]))
+        else:
+            Pairs.append((Index, Shifted_Crop(Metric_Frame, Box, Shifts[Index]), Stats["Crop"]))
+
+    # Coarsest Level First
+    if (Metric != "msssim") and (Pairs != []):
+        for Level in sorted(Bands, reverse=True):
+            Level_Pairs = [(Index, _Pair_Level(X, Y, Level)) for Index, X, Y in Pairs]
+            if any(Pair is None for _, Pair in Level_Pairs):
+                continue
+
+            Region_Results = [None] * len(Regions)
+            for Index, (X, Y) in Level_Pairs:
+                Region_Results[Index] = _Pair_Score(X, Y)
+
+            Result = sum(Region_Results[Index] for Index, _ in Level_Pairs)/len(Level_Pairs)
+            if abs(Result - Threshold) > Bands[Level]:
+                return Region_Results, Result, ("PASS" if Result >= Threshold else "FAIL"), Level
+
+    # Borderline, Full Resolution Score
+    Region_Results = Score_Regions(Frame, None, Regions, Pattern_Stats=Pattern_Stats, Metric=Metric, Shifts=Shifts)
+    Valid_Results = [x for x in Region_Results if x is not None]
+    if Valid_Results == []:
+        raise ValueError("Camera Image and Pattern Image Bbox Are Not The Same Size")
+
+    Result = sum(Valid_Results)/len(Valid_Results)
+    return Region_Results, Result, ("PASS" if Result >= Threshold else "FAIL"), 0
+
+
+"""
+Calibrate Coarse Bands
+-> Scores saved crop pairs at every pyramid level and at full resolution
+-> The band of a level is the largest difference to the full resolution score seen,
+times Calibration_Margin, so a coarse score outside the band can not land on the other
+side of the threshold at full resolution for samples like the calibration ones
+
+-:> Returns a {Level: Band} dict, levels too small for every pair are left out
+
+Pairs: List of (Image, Pattern) uint8 crop pairs, see Load_Crop_Pairs
+Levels: Coarsest pyramid level calibrated
+Metric: The metric mode the bands are used with
+"""
+def Calibrate_Coarse_Bands(Pairs, Levels=Coarse_Levels, Metric="bgr"):
+    Errors = {Level: list() for Level in range(1, Levels + 1)}
+
+    for Image, Pattern in Pairs:
+        X, Y = _Metric_Image(Image, Metric), _Metric_Image(Pattern, Metric)
+        Full_Score = _Pair_Score(X, Y)
+
+        for Level in Errors:
+            Level_Pair = _Pair_Level(X, Y, Level)
+            if Level_Pair is not None:
+                Errors[Level].append(abs(_Pair_Score(*Level_Pair) - Full_Score))
+
+    return {Level: round(max(Values) * Calibration_Margin, 4) for Level, Values in Errors.items() if Values != []}
+
+
+"""
+Load Result Crop Pairs
+-> Reads every {Id}_Image.png / {Id}_Pattern.png pair saved by an active session run
+
+-:> Returns a list of (Id, Image, Pattern) tuples
+
+Run_Folder: Path to a run_N results folder
+"""
+def Load_Crop_Pairs(Run_Folder):
+    Pairs = list()
+    for File_Name in sorted(os.listdir(Run_Folder)):
+        if not File_Name.endswith("_Image.png") or File_Name.endswith("_FullScale_Image.png"):
+            continue
+
+        Id = File_Name.split("_")[0]
+        Image = cv2.imread(os.path.join(Run_Folder, File_Name))
+        Pattern = cv2.imread(os.path.join(Run_Folder, f"{Id}_Pattern.png"))
+        if (Image is None) or (Pattern is None) or (Image.shape != Pattern.shape):
+            continue
+
+        Pairs.append((Id, Image, Pattern))
+
+    return Pairs
+
+
+############################
+# Pattern Statistics Cache
+############################
+
+"""
+The pattern side of every comparison never changes between runs, so its
+statistics are stored on disk in a hidden folder inside the pattern folder.
+Entries are keyed by the pattern content hash plus the pattern box, a replaced
+pattern therefore never matches an old entry. Invalidate_Pattern_Stats removes
+the entries of a pattern that has been replaced or removed.
+"""
+
+# Cache Folder Name Inside The Pattern Folder
+Pattern_Cache_Folder_Name = ".ssim_cache"
+
+# Pattern Path -> (Modified Time, Size, Content Hash)
+_Pattern_Hash_Memo = dict()
+
+# (Content Hash, Statistics Kind, Box) -> Region Statistics Loaded This Session
+_Pattern_Stats_Memo = dict()
+
+
+# Default Cache Folder For A Pattern File
+def _Cache_Folder(Pattern_File_Path):
+    return os.path.join(os.path.dirname(Pattern_File_Path), Pattern_Cache_Folder_Name)
+
+
+# Cache File Name Prefix For A Pattern File
+def _Cache_Prefix(Pattern_File_Path):
+    return f"{os.path.basename(Pattern_File_Path)}__"
+
+
+# Write A Cache File Through A Per Writer Temporary File, Readers Never See A Partial File
+def _Save_Cache_File(Cache_File, **Arrays):
+    Temporary_Path = f"{Cache_File}.{os.getpid()}_{threading.get_ident()}.tmp"
+    with open(Temporary_Path, "wb") as File:
+        np.savez(File, **Arrays)
+    os.replace(Temporary_Path, Cache_File)
+
+
+"""
+Pattern Content Hash
+-> Hashes the pattern file content, re-using the previous hash while the file is unchanged
+
+Pattern_File_Path: Path to the pattern image
+"""
+def Pattern_Hash(Pattern_File_Path):
+    File_Stat = os.stat(Pattern_File_Path)
+    Memo = _Pattern_Hash_Memo.get(Pattern_File_Path)
+    if (Memo is not None) and (Memo[:2] == (File_Stat.st_mtime_ns, File_Stat.st_size)):
+        return Memo[2]
+
+    with open(Pattern_File_Path, "rb") as File:
+        Content_Hash = hashlib.sha1(File.read()).hexdigest()
+
+    _Pattern_Hash_Memo[Pattern_File_Path] = (File_Stat.st_mtime_ns, File_Stat.st_size, Content_Hash)
+    return Content_Hash
+
+
+"""
+Load Cached Pattern Statistics
+-> Returns the pattern side statistics of every box, as used by Score_Regions
+-> Reads them from memory or from the cache folder when available
+-> Otherwise reads the pattern once, computes every missing box in one pass and stores them
+
+-:> Returns a list with one statistics dict (or None) per box
+
+Pattern_File_Path: Path to the pattern image
+Boxes: List of pattern (X1, Y1, X2, Y2) boxes, usually [Region[4:] for Region in Regions]
+Cache_Folder: Folder holding the cache files, defaults to a hidden folder next to the pattern
+Metric: The metric mode the statistics are used for, see Metric_Modes
+"""
+def Load_Pattern_Stats(Pattern_File_Path, Boxes, Cache_Folder=None, Metric="bgr"):
+    if Cache_Folder is None:
+        Cache_Folder = _Cache_Folder(Pattern_File_Path)
+
+    # Multi-Scale Mode Only Needs The Colour Crop
+    Stats_Kind = "luma" if Metric == "luma" else "bgr"
+
+    Content_Hash = Pattern_Hash(Pattern_File_Path)
+    Prefix = f"{_Cache_Prefix(Pattern_File_Path)}{Content_Hash[:16]}__{Stats_Kind}__"
+
+    Stats = [None] * len(Boxes)
+    Missing = list()
+
+    for Index, Box in enumerate(Boxes):
+        Key = (Content_Hash, Stats_Kind, tuple(Box))
+
+        # Loaded Earlier This Session
+        if Key in _Pattern_Stats_Memo:
+            Stats[Index] = _Pattern_Stats_Memo[Key]
+            continue
+
+        # Stored On Disk
+        Cache_File = os.path.join(Cache_Folder, f"{Prefix}{'_'.join(str(x) for x in Box)}.npz")
+        try:
+            with np.load(Cache_File) as Data:
+                if Data["Box"].size == 0:
+                    Region = None
+                else:
+                    Region = {
+                        "Box": tuple(int(x) for x in Data["Box"]),
+                        "Crop": Data["Crop"],
+                        "Mean": Data["Mean"] if "Mean" in Data.files else None,
+                        "Mean_Sq": Data["Mean_Sq"] if "Mean_Sq" in Data.files else None
+                        }
+            _Pattern_Stats_Memo[Key] = Stats[Index] = Region
+
+        # Missing, Truncated Or Corrupt Files Are Rebuilt
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+            Missing.append(Index)
+
+    if Missing == []:
+        return Stats
+
+    # Compute All Missing Boxes From A Single Read Of The Pattern
+    Pattern = cv2.imread(Pattern_File_Path)
+    if Pattern is None:
+        raise ValueError(f"Unable To Read Pattern {Pattern_File_Path}")
+
+    os.makedirs(Cache_Folder, exist_ok=True)
+    Computed = Region_Stats(Pattern, [Boxes[i] for i in Missing], Stats_Kind)
+
+    for Index, Region in zip(Missing, Computed):
+        Box = tuple(Boxes[Index])
+        Cache_File = os.path.join(Cache_Folder, f"{Prefix}{'_'.join(str(x) for x in Box)}.npz")
+
+        if Region is None:
+            _Save_Cache_File(Cache_File, Box=np.array([], dtype=np.int64))
+        elif Region["Mean"] is None:
+            _Save_Cache_File(Cache_File, Box=np.array(Region["Box"]), Crop=Region["Crop"])
+        else:
+            _Save_Cache_File(Cache_File, Box=np.array(Region["Box"]), Crop=Region["Crop"], Mean=Region["Mean"], Mean_Sq=Region["Mean_Sq"])
+
+        _Pattern_Stats_Memo[(Content_Hash, Stats_Kind, Box)] = Stats[Index] = Region
+
+    return Stats
+
+
+"""
+Invalidate Cached Pattern Statistics
+-> Removes every cache entry of a pattern, used when a pattern is replaced, added or removed
+
+Pattern_File_Path: Path to the pattern image
+Cache_Folder: Folder holding the cache files, defaults to a hidden folder next to the pattern
+"""
+def Invalidate_Pattern_Stats(Pattern_File_Path, Cache_Folder=None):
+    if Cache_Folder is None:
+        Cache_Folder = _Cache_Folder(Pattern_File_Path)
+
+    # Forget The Content Hash Of The Old File
+    Memo = _Pattern_Hash_Memo.pop(Pattern_File_Path, None)
+    if Memo is not None:
+        for Key in [x for x in _Pattern_Stats_Memo if x[0] == Memo[2]]:
+            _Pattern_Stats_Memo.pop(Key)
+
+    if not os.path.isdir(Cache_Folder):
+        return
+
+    Prefix = _Cache_Prefix(Pattern_File_Path)
+    for Cache_File in os.listdir(Cache_Folder):
+        if Cache_File.startswith(Prefix):
+            os.remove(os.path.join(Cache_Folder, Cache_File))
+
+
+############################
+# Difference Heatmaps
+############################
+
+"""
+Full SSIM Map
+-> Computes the full resolution SSIM map of two equally sized crops, like the
+diff returned by compare_ssim(..., full=True, multichannel=True)
+-> Only used on demand, the production loop only needs the scores
+
+-:> Returns a float64 map the size of the crops (per channel for colour crops)
+
+Image: The camera crop
+Pattern: The pattern crop
+"""
+def Diff_Map(Image, Pattern):
+    if Image.shape != Pattern.shape:
+        raise ValueError("Input images must have the same dimensions.")
+
+    X = Image.astype(np.float64)
+    Y = Pattern.astype(np.float64)
+
+    Mean_X, Mean_Y = _Box_Mean(X), _Box_Mean(Y)
+    Var_X = SSIM_Cov_Norm * (_Box_Mean(X * X) - Mean_X * Mean_X)
+    Var_Y = SSIM_Cov_Norm * (_Box_Mean(Y * Y) - Mean_Y * Mean_Y)
+    Cov_XY = SSIM_Cov_Norm * (_Box_Mean(X * Y) - Mean_X * Mean_Y)
+
+    Numerator = (2 * Mean_X * Mean_Y + SSIM_C1) * (2 * Cov_XY + SSIM_C2)
+    Denominator = (Mean_X * Mean_X + Mean_Y * Mean_Y + SSIM_C1) * (Var_X + Var_Y + SSIM_C2)
+    return Numerator / Denominator
+
+
+"""
+Heatmap Rendering
+-> Averages the channels of an SSIM map and colours it, dissimilar pixels are hot
+
+Diff: An SSIM map as returned by Diff_Map
+"""
+def Render_Heatmap(Diff):
+    if Diff.ndim == 3:
+        Diff = Diff.mean(axis=2)
+
+    Dissimilarity = np.clip((1 - Diff) / 2, 0, 1)
+    return cv2.applyColorMap((Dissimilarity * 255).astype(np.uint8), cv2.COLORMAP_JET)
+
+
+# Heatmap Folder Inside A Run Folder
+Heatmap_Folder_Name = "HEATMAP"
+
+
+"""
+Lazy Sample Heatmap
+-> Builds the difference heatmap of one saved sample the first time it is requested
+-> Caches it in the HEATMAP folder of the run, later requests only return the path
+
+-:> Returns the path to the heatmap image
+
+Run_Folder: Path to the run folder holding {Id}_Image.png and {Id}_Pattern.png
+Id: The sample id (pattern number) of the sample
+"""
+def Load_Heatmap(Run_Folder, Id):
+    Image_Path = f"{Run_Folder}/{Id}_Image.png"
+    Pattern_Path = f"{Run_Folder}/{Id}_Pattern.png"
+    Heatmap_Path = f"{Run_Folder}/{Heatmap_Folder_Name}/{Id}_Heatmap.png"
+
+    # Reuse The Heatmap While It Is Newer Than The Sample
+    if os.path.isfile(Heatmap_Path):
+        if os.path.getmtime(Heatmap_Path) >= max(os.path.getmtime(Image_Path), os.path.getmtime(Pattern_Path)):
+            return Heatmap_Path
+
+    Image = cv2.imread(Image_Path)
+    Pattern = cv2.imread(Pattern_Path)
+    if (Image is None) or (Pattern is None):
+        raise ValueError(f"Sample {Id} Is Missing From {Run_Folder}")
+
+    os.makedirs(f"{Run_Folder}/{Heatmap_Folder_Name}", exist_ok=True)
+    cv2.imwrite(Heatmap_Path, Render_Heatmap(Diff_Map(Image, Pattern)))
+    return Heatmap_Path
@@ -0,0 +1,6 @@
+# Test Imports
+import sys
+import os
+
+# The Modules Live At The Repository Root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
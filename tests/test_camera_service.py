@@ -0,0 +1,136 @@
+# Test Imports
+import numpy as np
+import pytest
+import time
+import cv2
+
+import camera_service
+
+
+# Service With Buffered Frames And No Owner Thread, Frame Values Equal Their Sequence
+def Buffered_Service(Count):
+    Service = camera_service.Camera_Service(0, Size=4)
+    Service.Running = True
+    for Sequence in range(1, Count + 1):
+        Service.Slots[Sequence % len(Service.Slots)] = np.full((4, 6, 3), Sequence, np.uint8)
+        Service.Buffer.append((Sequence, float(Sequence), Service.Slots[Sequence % len(Service.Slots)]))
+    return Service
+
+
+############################
+# Captured Frames
+############################
+
+def test_Captured_Frames_Are_Copies_Of_The_Ring_Slots():
+    Service = Buffered_Service(4)
+    Entries = Service.Capture_Frames(3, After=1.5, Timeout=0)
+
+    assert [Entry[0] for Entry in Entries] == [2, 3, 4]
+    assert not any(np.shares_memory(Entry[2], Slot) for Entry in Entries for Slot in Service.Slots if Slot is not None)
+
+    # Refilling A Slot Afterwards Leaves The Captured Frames Alone
+    Service.Slots[2][:] = 0
+    assert Entries[0][2].max() == 2
+
+
+def test_Capture_Frames_Times_Out_Without_New_Frames():
+    Service = Buffered_Service(2)
+    assert Service.Capture_Frames(1, After=5.0, Timeout=0) is None
+    assert Service.Demand == 1
+
+
+############################
+# Temporal Denoising
+############################
+
+# Frames Of A Static Scene, Each With A Different Constant Value
+def Scene_Frames(Values, Shape=(20, 30, 3)):
+    return [np.full(Shape, Value, np.uint8) for Value in Values]
+
+
+def test_Median_And_Mean_Combine_The_Stack():
+    Frames = Scene_Frames([10, 200, 30, 40])
+
+    assert (camera_service.Temporal_Denoise(Frames, Method="median") == 35).all()
+    assert (camera_service.Temporal_Denoise(Frames, Method="mean") == 70).all()
+
+
+def test_Only_The_Box_Union_Plus_Margin_Is_Combined():
+    Frames = Scene_Frames([10, 20, 90])
+    Output = camera_service.Temporal_Denoise(Frames, [(5, 4, 10, 8), (12, 6, 15, 9)], "median", Margin=2)
+
+    assert (Output[2:11, 3:17] == 20).all()
+    Output[2:11, 3:17] = 90
+    assert (Output == 90).all()
+
+    # The Margin Is Clipped At The Frame Edge
+    Edge = camera_service.Temporal_Denoise(Frames, [(0, 0, 4, 4), (26, 16, 30, 20)], "median", Margin=5)
+    assert (Edge == 20).all()
+
+
+def test_Single_Frame_Passes_Through_As_A_Copy():
+    Frames = Scene_Frames([42])
+    Output = camera_service.Temporal_Denoise(Frames, Method="mean")
+
+    assert np.array_equal(Output, Frames[0])
+    assert not np.shares_memory(Output, Frames[0])
+    with pytest.raises(ValueError):
+        camera_service.Temporal_Denoise(Frames, Method="mode")
+
+
+############################
+# Replay Backends
+############################
+
+# Frame Folder Whose Frame Values Equal Their Number
+def Frame_Folder(tmp_path, Numbers):
+    for Number in Numbers:
+        cv2.imwrite(str(tmp_path / f"frame_{Number}.png"), np.full((6, 8, 3), Number, np.uint8))
+    (tmp_path / "notes.txt").write_text("not a frame")
+    return str(tmp_path)
+
+
+def test_Folder_Capture_Reads_Frames_In_Natural_Order_And_Loops(tmp_path):
+    cap = camera_service.Folder_Capture(Frame_Folder(tmp_path, [10, 2, 1]))
+    Values = [cap.read()[1][0, 0, 0] for _ in range(4)]
+    assert Values == [1, 2, 10, 1]
+
+    # Retrieve Fills A Matching Frame In Place
+    Slot = np.zeros((6, 8, 3), np.uint8)
+    assert cap.grab()
+    ret, frame = cap.retrieve(Slot)
+    assert ret and (frame is Slot) and (Slot[0, 0, 0] == 2)
+
+    cap.release()
+    assert not cap.isOpened()
+    assert cap.read() == (False, None)
+
+
+def test_Paced_Capture_Delivers_At_The_Source_Rate(tmp_path):
+    cap = camera_service.Paced_Capture(camera_service.Folder_Capture(Frame_Folder(tmp_path, [1, 2, 3])))
+    assert cap.get(cv2.CAP_PROP_FPS) == camera_service.Replay_Fps
+
+    Start = time.monotonic()
+    Values = [cap.read()[1][0, 0, 0] for _ in range(5)]
+    assert Values == [1, 2, 3, 1, 2]
+    assert time.monotonic() - Start >= 4 / camera_service.Replay_Fps - 0.005
+
+
+def test_Open_Capture_Rejects_Unknown_Backends():
+    with pytest.raises(ValueError):
+        camera_service.Open_Capture("gstreamer", 0)
+
+
+############################
+# Capture Profiles
+############################
+
+@pytest.mark.parametrize("Text, Size", [("1920x1080", (1920, 1080)), (" 640X480 ", (640, 480)), ("", None), ("None", None)])
+def test_Parse_Size(Text, Size):
+    assert camera_service.Parse_Size(Text) == Size
+
+
+@pytest.mark.parametrize("Text", ["1920", "0x1080", "wide x tall"])
+def test_Parse_Size_Rejects_Invalid_Sizes(Text):
+    with pytest.raises(ValueError):
+        camera_service.Parse_Size(Text)
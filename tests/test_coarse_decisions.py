@@ -0,0 +1,59 @@
+# Test Imports
+import numpy as np
+import pytest
+import cv2
+
+import scoring_worker
+import ssim_engine
+
+
+# Pattern Crop And Captures Of It With Increasing Noise, Scores Spread Over The Threshold
+def Crop_Pairs(Count=24, Shape=(160, 160, 3)):
+    Pairs = list()
+    for Seed in range(Count):
+        Generator = np.random.default_rng(Seed)
+        Pattern = cv2.GaussianBlur(Generator.integers(0, 256, Shape, dtype=np.uint8), (9, 9), 3)
+        Noisy = Pattern.astype(np.float64) + Generator.normal(0, 2 + 2 * Seed, Shape)
+        Pairs.append((np.clip(Noisy, 0, 255).astype(np.uint8), Pattern))
+    return Pairs
+
+
+# Full Resolution Decision Of A Pair
+def Full_Decision(Image, Pattern, Threshold):
+    Height, Width = Image.shape[:2]
+    Score = ssim_engine.Score_Regions(Image, Pattern, [(0, 0, Width, Height, 0, 0, Width, Height)])[0]
+    return Score, ("PASS" if Score >= Threshold else "FAIL")
+
+
+def test_Calibrated_Decisions_Agree_With_Full_Resolution():
+    Pairs = Crop_Pairs()
+    Bands = ssim_engine.Calibrate_Coarse_Bands(Pairs)
+    Threshold = float(np.median([Full_Decision(Image, Pattern, 0)[0] for Image, Pattern in Pairs]))
+    assert sorted(Bands) == [1, 2]
+
+    Levels = set()
+    for Image, Pattern in Pairs:
+        Height, Width = Image.shape[:2]
+        Regions = [(0, 0, Width, Height, 0, 0, Width, Height)]
+        Region_Results, Result, Decision, Level = ssim_engine.Decide_Regions(Image, Regions, ssim_engine.Region_Stats(Pattern, [Regions[0][4:]]), Threshold, Bands)
+
+        assert Decision == Full_Decision(Image, Pattern, Threshold)[1]
+        Levels.add(Level)
+
+    # Clear Samples Are Decided Early, Borderline Ones At Full Resolution
+    assert max(Levels) > 0
+
+
+def test_Without_Bands_Decides_At_Full_Resolution():
+    Image, Pattern = Crop_Pairs(Count=3)[2]
+    Height, Width = Image.shape[:2]
+    Regions = [(0, 0, Width, Height, 0, 0, Width, Height)]
+    Region_Results, Result, Decision, Level = ssim_engine.Decide_Regions(Image, Regions, ssim_engine.Region_Stats(Pattern, [Regions[0][4:]]), 0.5, dict())
+
+    assert Level == 0
+    assert Result == pytest.approx(Full_Decision(Image, Pattern, 0.5)[0])
+
+
+def test_Coarse_Scores_Stay_Out_Of_The_Full_Resolution_Column():
+    assert scoring_worker.Annotation_Scores(0.91, 2) == ("", 0.91, False)
+    assert scoring_worker.Annotation_Scores(0.91, 0) == (0.91, "", True)
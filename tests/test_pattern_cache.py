@@ -0,0 +1,109 @@
+# Test Imports
+import numpy as np
+import pytest
+import time
+import cv2
+import os
+
+import camera_service
+import pattern_cache
+
+
+# Writes A Random Pattern Image And Returns Its Path
+def Write_Pattern(Folder, Name, Seed, Shape=(120, 160, 3)):
+    File_Path = os.path.join(Folder, Name)
+    cv2.imwrite(File_Path, np.random.default_rng(Seed).integers(0, 256, Shape, dtype=np.uint8))
+    return File_Path
+
+
+def test_Hits_Return_The_Same_Read_Only_Image(tmp_path):
+    Cache = pattern_cache.Pattern_Cache()
+    File_Path = Write_Pattern(str(tmp_path), "01_Pattern.png", 0)
+
+    Image = Cache.Load(File_Path)
+    assert Cache.Load(File_Path) is Image
+    assert Cache.Stats()["Hits"] == 1
+    assert not Image.flags.writeable
+    with pytest.raises(ValueError):
+        Image[0, 0] = 0
+
+    # Display Renditions Are Made From The Cached Full Image
+    Small = Cache.Load(File_Path, (80, 60))
+    assert Small.shape == (60, 80, 3)
+    assert not Small.flags.writeable
+
+
+def test_Least_Recently_Used_Is_Evicted(tmp_path):
+    Paths = [Write_Pattern(str(tmp_path), f"{Index}_Pattern.png", Index) for Index in range(3)]
+    Image_Bytes = 120 * 160 * 3
+    Cache = pattern_cache.Pattern_Cache(Budget_Bytes=2 * Image_Bytes)
+
+    First = Cache.Load(Paths[0])
+    Cache.Load(Paths[1])
+    assert Cache.Load(Paths[0]) is First
+    Cache.Load(Paths[2])
+
+    # The Second Pattern Was Used Least Recently
+    Stats = Cache.Stats()
+    assert (Stats["Entries"], Stats["Bytes"]) == (2, 2 * Image_Bytes)
+    assert Cache.Load(Paths[0]) is First
+    Misses = Cache.Stats()["Misses"]
+    Cache.Load(Paths[1])
+    assert Cache.Stats()["Misses"] == Misses + 1
+
+
+def test_Oversized_Image_Is_Not_Kept(tmp_path):
+    Cache = pattern_cache.Pattern_Cache(Budget_Bytes=1024)
+    assert Cache.Load(Write_Pattern(str(tmp_path), "01_Pattern.png", 0)) is not None
+    assert Cache.Stats()["Entries"] == 0
+
+
+def test_Replaced_Pattern_Is_Reloaded(tmp_path):
+    Cache = pattern_cache.Pattern_Cache()
+    File_Path = Write_Pattern(str(tmp_path), "01_Pattern.png", 0)
+    Old = Cache.Load(File_Path)
+
+    Write_Pattern(str(tmp_path), "01_Pattern.png", 1)
+    os.utime(File_Path, ns=(time.time_ns(), os.stat(File_Path).st_mtime_ns + 1000))
+    New = Cache.Load(File_Path)
+    assert New is not Old
+    assert np.array_equal(New, cv2.imread(File_Path))
+
+
+def test_Missing_File_Returns_None(tmp_path):
+    assert pattern_cache.Pattern_Cache().Load(os.path.join(str(tmp_path), "Missing.png")) is None
+
+
+def test_Crop_And_Display_Bytes_Are_Cached(tmp_path):
+    Cache = pattern_cache.Pattern_Cache()
+    File_Path = Write_Pattern(str(tmp_path), "01_Pattern.png", 0)
+
+    Crop = Cache.Load_Crop(File_Path, (10, 20, 50, 60))
+    assert np.array_equal(Crop, cv2.imread(File_Path)[20:60, 10:50])
+    assert not Crop.flags.writeable
+    assert Cache.Load_Crop(File_Path, (10, 20, 50, 60)) is Crop
+
+    Data = Cache.Load_Display_Bytes(File_Path, (80, 60))
+    assert Data == camera_service.Display_Bytes(Cache.Load(File_Path, (80, 60)))
+    assert Cache.Load_Display_Bytes(File_Path, (80, 60)) is Data
+
+
+def test_Prefetch_Warms_The_Cache(tmp_path):
+    Cache = pattern_cache.Pattern_Cache()
+    Prefetcher = pattern_cache.Pattern_Prefetcher(Cache)
+    Paths = [Write_Pattern(str(tmp_path), f"{Index}_Pattern.png", Index) for Index in range(2)]
+
+    Prefetcher.Prefetch([(Paths[0], None, (10, 20, 50, 60)), (Paths[1], (80, 60))])
+    Deadline = time.monotonic() + 5
+    while (Cache.Stats()["Entries"] < 5) and (time.monotonic() < Deadline):
+        time.sleep(0.01)
+
+    # First Pattern And Its Crop, Second Pattern With Its Display Rendition And Display Bytes
+    assert Cache.Stats()["Entries"] == 5
+
+    # The Pattern Switch Only Hits Prefetched Entries
+    Hits, Misses = Cache.Stats()["Hits"], Cache.Stats()["Misses"]
+    Cache.Load_Crop(Paths[0], (10, 20, 50, 60))
+    Cache.Load(Paths[1], (80, 60))
+    Cache.Load_Display_Bytes(Paths[1], (80, 60))
+    assert (Cache.Stats()["Hits"], Cache.Stats()["Misses"]) == (Hits + 3, Misses)
@@ -0,0 +1,101 @@
+# Test Imports
+import numpy as np
+import pytest
+import json
+import os
+
+import run_statistics
+
+
+# Scores Spread Like A Run Of SSIM Values
+def Scores(Count=500, Seed=0):
+    return np.clip(np.random.default_rng(Seed).normal(0.8, 0.08, Count), -1, 1)
+
+
+def test_Welford_Matches_Numpy():
+    Values = Scores()
+    Statistics = run_statistics.Run_Statistics()
+    for Value in Values:
+        Statistics.Update(Value)
+
+    assert Statistics.Count == len(Values)
+    assert Statistics.Mean == pytest.approx(Values.mean(), abs=1e-12)
+    assert Statistics.Variance() == pytest.approx(Values.var(ddof=1), rel=1e-9)
+    assert (Statistics.Min, Statistics.Max) == (Values.min(), Values.max())
+
+
+@pytest.mark.parametrize("Percent", [5, 50, 95])
+def test_Percentiles_Within_One_Bin(Percent):
+    Values = Scores()
+    Statistics = run_statistics.Run_Statistics()
+    for Value in Values:
+        Statistics.Update(Value)
+
+    Bin_Width = (run_statistics.Histogram_High - run_statistics.Histogram_Low) / run_statistics.Histogram_Bins
+    assert abs(Statistics.Percentile(Percent) - np.percentile(Values, Percent)) <= Bin_Width
+
+
+def test_Empty_And_Single_Sample():
+    Statistics = run_statistics.Run_Statistics()
+    assert Statistics.Percentile(50) is None
+    assert Statistics.Variance() == 0.0
+
+    Statistics.Update(0.5)
+    assert Statistics.Summary()["P50"] == pytest.approx(0.5)
+
+
+def test_Saved_State_Continues_Aggregating():
+    Values = Scores()
+    First = run_statistics.Run_Statistics()
+    for Value in Values[:200]:
+        First.Update(Value)
+
+    Resumed = run_statistics.Run_Statistics.From_Dict(json.loads(json.dumps(First.To_Dict())))
+    for Value in Values[200:]:
+        Resumed.Update(Value)
+
+    assert Resumed.Mean == pytest.approx(Values.mean(), abs=1e-12)
+    assert Resumed.Variance() == pytest.approx(Values.var(ddof=1), rel=1e-9)
+
+
+def test_Pattern_Statistics_Flush(tmp_path):
+    File_Path = os.path.join(tmp_path, run_statistics.Pattern_Statistics_File_Name)
+    Patterns = run_statistics.Pattern_Statistics(str(tmp_path))
+
+    # Updates Only Mark Patterns Dirty Until A Flush Is Due
+    for Index in range(run_statistics.Pattern_Flush_Updates - 1):
+        Patterns.Update(f"{Index % 5}_Pattern.png", 0.9)
+    assert not os.path.exists(File_Path)
+
+    Patterns.Update("0_Pattern.png", 0.7)
+    with open(File_Path) as File:
+        assert len(json.load(File)) == 5
+
+    # Run End Flush, Then Loaded By The Next Session
+    Patterns.Update("5_Pattern.png", 0.6)
+    Patterns.Flush()
+    Reloaded = run_statistics.Pattern_Statistics(str(tmp_path))
+    assert Reloaded.Summary("5_Pattern.png")["Count"] == 1
+    assert Reloaded.Summary("0_Pattern.png")["Count"] == Patterns.Summary("0_Pattern.png")["Count"]
+
+
+def test_Flush_Keeps_Patterns_Written_By_Another_Instance(tmp_path):
+    Old = run_statistics.Pattern_Statistics(str(tmp_path))
+    New = run_statistics.Pattern_Statistics(str(tmp_path))
+
+    New.Update("1_Pattern.png", 0.8)
+    New.Flush()
+
+    # The Older Instance Only Replaces Its Own Dirty Pattern
+    Old.Update("2_Pattern.png", 0.5)
+    Old.Flush()
+    Reloaded = run_statistics.Pattern_Statistics(str(tmp_path))
+    assert Reloaded.Summary("1_Pattern.png")["Count"] == 1
+    assert Reloaded.Summary("2_Pattern.png")["Count"] == 1
+    assert Old.Summary("1_Pattern.png")["Count"] == 1
+
+
+def test_Sessions_Share_One_Instance_Per_Results_Folder(tmp_path):
+    First = run_statistics.Shared_Pattern_Statistics(str(tmp_path))
+    assert run_statistics.Shared_Pattern_Statistics(f"{tmp_path}/.") is First
+    assert run_statistics.Shared_Pattern_Statistics(str(tmp_path / "Other")) is not First
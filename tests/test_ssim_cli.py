@@ -0,0 +1,72 @@
+# Test Imports
+import numpy as np
+import pytest
+import json
+import csv
+import cv2
+
+import scoring_worker
+import ssim_cli
+
+
+# Writes A Smooth Random Image And Returns Its Path
+def Write_Image(File_Path, Seed, Shape=(90, 120, 3)):
+    Generator = np.random.default_rng(Seed)
+    cv2.imwrite(str(File_Path), cv2.GaussianBlur(Generator.integers(0, 256, Shape, dtype=np.uint8), (9, 9), 3))
+    return str(File_Path)
+
+
+# Job Scoring One Image Against One Pattern
+def Pair_Job(Image_Path, Pattern_Path, Id="1", **Settings):
+    Job = {"Id": Id, "Image_Path": Image_Path, "Pattern_Path": Pattern_Path, "Regions": None, "Metric": "bgr", "Registration": False, "Threshold": 0, "Bands": dict()}
+    Job.update(Settings)
+    return Job
+
+
+############################
+# Scoring Jobs
+############################
+
+def test_Score_Job_Of_Identical_Images(tmp_path):
+    Image_Path = Write_Image(tmp_path / "Image.png", 1)
+    Job, Outcome = ssim_cli.Score_Job(Pair_Job(Image_Path, Image_Path, Regions=[(10, 10, 60, 60, 10, 10, 60, 60)]))
+
+    assert Job["Id"] == "1"
+    assert Outcome == {"Result": pytest.approx(1.0), "Shift": (0.0, 0.0), "Decision": "", "Decision_Level": 0}
+
+
+def test_Score_Job_Decides_Against_The_Threshold(tmp_path):
+    Image_Path = Write_Image(tmp_path / "Image.png", 2)
+    Pattern_Path = Write_Image(tmp_path / "Pattern.png", 3)
+    _, Outcome = ssim_cli.Score_Job(Pair_Job(Image_Path, Pattern_Path, Threshold=0.9))
+
+    assert Outcome["Result"] < 0.9
+    assert (Outcome["Decision"], Outcome["Decision_Level"]) == ("FAIL", 0)
+
+
+def test_Score_Job_Reports_Errors(tmp_path):
+    _, Outcome = ssim_cli.Score_Job(Pair_Job(str(tmp_path / "Missing.png"), str(tmp_path / "Missing.png")))
+    assert list(Outcome) == ["Error"]
+
+
+def test_Write_Annotation_Rows(tmp_path):
+    Scored = [
+        (Pair_Job("a/10_Image.png", "p/10_Pattern.png", Id="10"), {"Result": 0.5, "Shift": (0.12345, -1.0), "Decision": "FAIL", "Decision_Level": 0}),
+        (Pair_Job("a/2_Image.png", "p/2_Pattern.png", Id="2"), {"Result": 0.9, "Shift": (0.0, 0.0), "Decision": "PASS", "Decision_Level": 2}),
+        (Pair_Job("a/1_Image.png", "p/1_Pattern.png", Id="1"), {"Result": 0.7, "Shift": (0.0, 0.0), "Decision": "", "Decision_Level": 0}),
+        (Pair_Job("a/3_Image.png", "p/3_Pattern.png", Id="3"), {"Error": "Unable To Read Image Or Pattern"})
+        ]
+    assert ssim_cli.Write_Annotation(str(tmp_path), Scored) == 1
+
+    with open(tmp_path / "Annotation.csv", newline='') as File:
+        Rows = list(csv.reader(File))
+
+    # SN Order, The Coarse Decision Only Fills Its Own Column And Stays Out Of The Average
+    assert Rows[0] == scoring_worker.Annotation_Header
+    assert Rows[1] == ["1", "1_Image.png", "1_Pattern.png", "0.7", "0.7", "0.0", "0.0", "", "0", "", "", ""]
+    assert Rows[2] == ["2", "2_Image.png", "2_Pattern.png", "", "0.7", "0.0", "0.0", "PASS", "2", "", "", "0.9"]
+    assert Rows[3][:7] == ["10", "10_Image.png", "10_Pattern.png", "0.5", str(0.6), "0.123", "-1.0"]
+    assert len(Rows) == 4
+
+    with open(tmp_path / "Summary.json") as File:
+        assert json.load(File)["Summary"]["Count"] == 2
@@ -0,0 +1,168 @@
+# Test Imports
+from skimage.metrics import structural_similarity
+import numpy as np
+import pytest
+import cv2
+
+import ssim_engine
+
+
+# Smooth Random Image, Textured Like A Pattern Photo
+def Smooth_Image(Seed, Shape=(240, 320, 3)):
+    Generator = np.random.default_rng(Seed)
+    return cv2.GaussianBlur(Generator.integers(0, 256, Shape, dtype=np.uint8), (9, 9), 3)
+
+
+# Pattern With Noise And A Brightness Change, Like A Camera Capture Of It
+def Captured(Pattern, Seed):
+    Generator = np.random.default_rng(Seed)
+    Noisy = Pattern.astype(np.float64) * 0.9 + 12 + Generator.normal(0, 8, Pattern.shape)
+    return np.clip(Noisy, 0, 255).astype(np.uint8)
+
+
+# SSIM Of A Crop Pair As Computed By skimage
+def Skimage_Score(X, Y):
+    return structural_similarity(X, Y, win_size=ssim_engine.SSIM_Win_Size, data_range=ssim_engine.SSIM_Data_Range, channel_axis=2 if X.ndim == 3 else None)
+
+
+Regions = [
+    (10, 12, 110, 92, 10, 12, 110, 92),
+    (60, 40, 200, 180, 60, 40, 200, 180),
+    (150, 100, 310, 230, 140, 95, 300, 225)
+    ]
+
+
+############################
+# Score_Regions Parity
+############################
+
+@pytest.mark.parametrize("Gray", [False, True])
+def test_Score_Regions_Matches_Skimage(Gray):
+    Pattern = Smooth_Image(1)
+    Frame = Captured(Pattern, 2)
+    if Gray:
+        Pattern, Frame = cv2.cvtColor(Pattern, cv2.COLOR_BGR2GRAY), cv2.cvtColor(Frame, cv2.COLOR_BGR2GRAY)
+
+    Scores = ssim_engine.Score_Regions(Frame, Pattern, Regions)
+    for Score, (CB_X, CB_Y, CE_X, CE_Y, SB_X, SB_Y, SE_X, SE_Y) in zip(Scores, Regions):
+        assert Score == pytest.approx(Skimage_Score(Frame[CB_Y:CE_Y, CB_X:CE_X], Pattern[SB_Y:SE_Y, SB_X:SE_X]), abs=1e-9)
+
+
+def test_Score_Regions_With_Cached_Pattern_Stats():
+    Pattern = Smooth_Image(3)
+    Frame = Captured(Pattern, 4)
+    Pattern_Stats = ssim_engine.Region_Stats(Pattern, [Region[4:] for Region in Regions])
+
+    assert ssim_engine.Score_Regions(Frame, None, Regions, Pattern_Stats=Pattern_Stats) == pytest.approx(ssim_engine.Score_Regions(Frame, Pattern, Regions), abs=1e-12)
+
+
+def test_Tiled_Scoring_Matches_Skimage():
+    Pattern = Smooth_Image(5)
+    Frame = Captured(Pattern, 6)
+
+    # A Budget Below One Region Forces The Strip Path
+    Scores = ssim_engine.Score_Regions(Frame, Pattern, Regions, Memory_Budget=64 * 1024)
+    for Score, (CB_X, CB_Y, CE_X, CE_Y, SB_X, SB_Y, SE_X, SE_Y) in zip(Scores, Regions):
+        assert Score == pytest.approx(Skimage_Score(Frame[CB_Y:CE_Y, CB_X:CE_X], Pattern[SB_Y:SE_Y, SB_X:SE_X]), abs=ssim_engine.Tiled_Tolerance)
+
+
+def test_Mismatched_And_Tiny_Regions_Get_None():
+    Pattern = Smooth_Image(7)
+    Scores = ssim_engine.Score_Regions(Pattern, Pattern, [(0, 0, 50, 50, 0, 0, 40, 50), (0, 0, 5, 5, 0, 0, 5, 5), (0, 0, 50, 50, 0, 0, 50, 50)])
+
+    assert Scores[0] is None
+    assert Scores[1] is None
+    assert Scores[2] == pytest.approx(1.0)
+
+
+############################
+# Registration Shifts
+############################
+
+def test_Near_Whole_Pixel_Shifts_Stay_In_The_Batched_Pass():
+    Pattern = Smooth_Image(8)
+    Frame = np.roll(Pattern, (2, 1), axis=(0, 1))
+    Region = [(60, 60, 160, 160, 60, 60, 160, 160)]
+
+    Shifts = ssim_engine.Register_Regions(Frame, Region, ssim_engine.Region_Stats(Pattern, [Region[0][4:]]))
+    assert Shifts[0] == pytest.approx((1, 2), abs=ssim_engine.Shift_Tolerance)
+
+    # Snapped Shifts Are Sliced, So An Aligned Crop Scores Exactly 1
+    assert ssim_engine.Score_Regions(Frame, Pattern, Region, Shifts=Shifts) == [pytest.approx(1.0, abs=1e-12)]
+    assert np.shares_memory(ssim_engine.Shifted_Crop(Frame, Region[0][:4], Shifts[0]), Frame)
+
+
+def test_Fractional_Shift_Is_Resampled():
+    Pattern = Smooth_Image(9)
+    Crop = ssim_engine.Shifted_Crop(Pattern, (20, 20, 80, 80), (0.5, 0.0))
+
+    assert Crop.shape == (60, 60, 3)
+    assert not np.shares_memory(Crop, Pattern)
+    assert ssim_engine.Snap_Shift((0.03, -1.96)) == (0.0, -2.0)
+
+
+############################
+# Pattern Statistics Cache
+############################
+
+Cache_Boxes = [Region[4:] for Region in Regions]
+
+
+# Pattern File Inside A Temporary Pattern Folder
+def Pattern_File(tmp_path, Seed):
+    Pattern_File_Path = str(tmp_path / "Pattern.png")
+    cv2.imwrite(Pattern_File_Path, Smooth_Image(Seed))
+    return Pattern_File_Path
+
+
+# Cache Files Written For The Pattern
+def Cache_Files(tmp_path):
+    return sorted((tmp_path / ssim_engine.Pattern_Cache_Folder_Name).glob("*.npz"))
+
+
+def test_Cached_Pattern_Stats_Are_Read_Back_Without_The_Pattern(tmp_path, monkeypatch):
+    Pattern_File_Path = Pattern_File(tmp_path, 10)
+    Computed = ssim_engine.Load_Pattern_Stats(Pattern_File_Path, Cache_Boxes)
+    assert len(Cache_Files(tmp_path)) == len(Cache_Boxes)
+
+    # A Fresh Session Reads The Disk Cache And Never Decodes The Pattern
+    ssim_engine._Pattern_Stats_Memo.clear()
+    monkeypatch.setattr(ssim_engine.cv2, "imread", lambda *Arguments: pytest.fail("Pattern Decoded On A Cache Hit"))
+    Loaded = ssim_engine.Load_Pattern_Stats(Pattern_File_Path, Cache_Boxes)
+
+    for Old, New in zip(Computed, Loaded):
+        assert Old["Box"] == New["Box"]
+        assert np.array_equal(Old["Crop"], New["Crop"])
+        assert np.array_equal(Old["Mean"], New["Mean"])
+
+
+def test_Changed_Pattern_Gets_New_Stats(tmp_path):
+    Pattern_File_Path = Pattern_File(tmp_path, 11)
+    Old = ssim_engine.Load_Pattern_Stats(Pattern_File_Path, Cache_Boxes)
+
+    # Replacing The Pattern Drops Its Entries
+    cv2.imwrite(Pattern_File_Path, Smooth_Image(12))
+    ssim_engine.Invalidate_Pattern_Stats(Pattern_File_Path)
+    assert Cache_Files(tmp_path) == []
+
+    New = ssim_engine.Load_Pattern_Stats(Pattern_File_Path, Cache_Boxes)
+    assert not np.array_equal(Old[0]["Crop"], New[0]["Crop"])
+    assert np.array_equal(New[0]["Crop"], cv2.imread(Pattern_File_Path)[Cache_Boxes[0][1]:Cache_Boxes[0][3], Cache_Boxes[0][0]:Cache_Boxes[0][2]])
+
+
+def test_Corrupt_Cache_File_Is_Rebuilt(tmp_path):
+    Pattern_File_Path = Pattern_File(tmp_path, 13)
+    Computed = ssim_engine.Load_Pattern_Stats(Pattern_File_Path, Cache_Boxes)
+
+    # Truncate Every Entry, Like A Crash Mid Write
+    for Cache_File in Cache_Files(tmp_path):
+        Cache_File.write_bytes(Cache_File.read_bytes()[:100])
+
+    ssim_engine._Pattern_Stats_Memo.clear()
+    Rebuilt = ssim_engine.Load_Pattern_Stats(Pattern_File_Path, Cache_Boxes)
+    assert all(np.array_equal(Old["Crop"], New["Crop"]) for Old, New in zip(Computed, Rebuilt))
+
+    # The Rebuilt Files Load Again And No Temporary File Is Left Behind
+    ssim_engine._Pattern_Stats_Memo.clear()
+    assert ssim_engine.Load_Pattern_Stats(Pattern_File_Path, Cache_Boxes)[0]["Box"] == Computed[0]["Box"]
+    assert list((tmp_path / ssim_engine.Pattern_Cache_Folder_Name).glob("*.tmp")) == []